@@ -6,6 +6,7 @@ Generated by 'django-admin startproject' using Django 5.1.2.
 from pathlib import Path
 from datetime import timedelta
 from decouple import config  # To fetch environment variables securely
+from django.core.exceptions import ImproperlyConfigured
 
 # BASE DIRECTORY
 # -------------------------------------------------------------
@@ -77,6 +78,9 @@ SIMPLE_JWT = {
     'TOKEN_OBTAIN_SERIALIZER': 'api.auth.serializers.CustomTokenObtainPairSerializer',
 }
 
+# Embed the user's permission codenames (and the permissions version) in the issued tokens
+JWT_EMBED_PERMISSIONS = config('JWT_EMBED_PERMISSIONS', default=False, cast=bool)
+
 # CORS SETTINGS
 # -------------------------------------------------------------
 CORS_ALLOWED_ORIGINS = [
@@ -111,6 +115,39 @@ WSGI_APPLICATION = 'HrManagement.wsgi.application'
 
 # DATABASE SETTINGS
 # -------------------------------------------------------------
+# DATABASE_POOL_MODE:
+#   none         - one connection per request
+#   persistent   - connections reused between requests for DATABASE_CONN_MAX_AGE seconds (default)
+#   pgbouncer    - persistent connections to a PgBouncer in transaction mode (no server-side
+#                  cursors and no server-side prepared statements, which do not survive it)
+#   psycopg_pool - psycopg 3 connection pool inside each process (requires psycopg[pool])
+DATABASE_POOL_MODE = config('DATABASE_POOL_MODE', default='persistent')
+
+try:
+    import psycopg  # noqa: F401 - Django uses psycopg 3 when it is installed
+    PSYCOPG3 = True
+except ImportError:
+    PSYCOPG3 = False
+
+DATABASE_OPTIONS = {
+    # Identifies the connections of the application in pg_stat_activity (pool metrics)
+    'application_name': config('DATABASE_APPLICATION_NAME', default='hr-management'),
+}
+if DATABASE_POOL_MODE == 'psycopg_pool':
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured(
+            "DATABASE_POOL_MODE=psycopg_pool requires psycopg 3 with its pool: pip install 'psycopg[binary,pool]'"
+        )
+    DATABASE_OPTIONS['pool'] = {
+        'min_size': config('DATABASE_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DATABASE_POOL_MAX_SIZE', default=20, cast=int),
+        'timeout': config('DATABASE_POOL_TIMEOUT', default=10, cast=int),
+    }
+if DATABASE_POOL_MODE == 'pgbouncer' and PSYCOPG3:
+    DATABASE_OPTIONS['prepare_threshold'] = None
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -119,9 +156,55 @@ DATABASES = {
         'PASSWORD': config('DATABASE_PASSWORD'),
         'HOST': config('DATABASE_HOST', default='localhost'),
         'PORT': config('DATABASE_PORT', default=5432),
+        # The psycopg pool manages the connections itself, so Django must not keep them
+        'CONN_MAX_AGE': (
+            0 if DATABASE_POOL_MODE in ('none', 'psycopg_pool')
+            else config('DATABASE_CONN_MAX_AGE', default=60, cast=int)
+        ),
+        'CONN_HEALTH_CHECKS': DATABASE_POOL_MODE in ('persistent', 'pgbouncer'),
+        'DISABLE_SERVER_SIDE_CURSORS': DATABASE_POOL_MODE == 'pgbouncer',
+        'OPTIONS': DATABASE_OPTIONS,
+    }
+}
+
+# Hot queries declared with api.utils.prepared_statements.register_query run as server-side
+# prepared statements. Only worth it when connections are reused, and impossible behind PgBouncer.
+PREPARED_STATEMENTS = (
+    config('PREPARED_STATEMENTS', default=DATABASE_POOL_MODE in ('persistent', 'psycopg_pool'), cast=bool)
+    and DATABASE_POOL_MODE != 'pgbouncer'
+)
+
+# CACHE SETTINGS
+# -------------------------------------------------------------
+# Use a shared backend (e.g. django.core.cache.backends.redis.RedisCache)
+# in production so every worker sees the same entries. Invalidation does not depend on it:
+# the permissions and analytics version stamps are read from the database.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='hr-management'),
     }
 }
 
+# Seconds a resolved permission set is kept in cache
+PERMISSIONS_CACHE_TIMEOUT = config('PERMISSIONS_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds a listing total count (?count=cached) is reused
+COUNT_CACHE_TIMEOUT = config('COUNT_CACHE_TIMEOUT', default=60, cast=int)
+
+# Seconds an analytics result is kept in cache (writes to its source tables invalidate it sooner)
+ANALYTICS_CACHE_TIMEOUT = config('ANALYTICS_CACHE_TIMEOUT', default=600, cast=int)
+
+# Independent queries run concurrently (dashboard analytics): pool size and per query timeout
+PARALLEL_QUERIES_MAX_WORKERS = config('PARALLEL_QUERIES_MAX_WORKERS', default=4, cast=int)
+PARALLEL_QUERIES_TIMEOUT_MS = config('PARALLEL_QUERIES_TIMEOUT_MS', default=5000, cast=int)
+
+# Rows fetched per round trip by streaming list responses (?stream=json|ndjson)
+STREAM_CHUNK_SIZE = config('STREAM_CHUNK_SIZE', default=2000, cast=int)
+
+# Minutes of lateness / early leave tolerated by the schedule compliance engine
+SCHEDULE_COMPLIANCE_GRACE_MINUTES = config('SCHEDULE_COMPLIANCE_GRACE_MINUTES', default=5, cast=int)
+
 # PASSWORD VALIDATION
 # -------------------------------------------------------------
 AUTH_PASSWORD_VALIDATORS = [
@@ -8,7 +8,8 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from api.utils.dotenv import is_debug_mode 
-from api.utils.permissions import check_permission_decorator
+from django.conf import settings
+from api.utils.permissions import check_permission_decorator, add_permissions_to_token
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
@@ -30,6 +31,11 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 print(f"\033[31mToken: {token['sub']}\033[m")
                 print(f"\033[32mToken: {token}\033[m")
 
+        # Opt-in: the permissions travel in the token, so a check reads only the permissions version stamp
+        # (one single-row query per request, see get_permissions_version) instead of the user's groups and permissions
+        if settings.JWT_EMBED_PERMISSIONS:
+            add_permissions_to_token(token, user.id)
+
         return token
     
 class RegisterView(APIView):
@@ -0,0 +1,124 @@
+#
+#! benchmark.py
+#? python manage.py benchmark
+#? python manage.py benchmark --iterations 200 --function get_all_employees --function get_contracts
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from pathlib import Path
+import statistics
+import time
+
+# Previous (dynamic SQL) versions of the listing functions, loaded into LEGACY_SCHEMA only for the benchmark
+LEGACY_DIRECTORY = Path(__file__).resolve().parent / 'benchmark' / 'legacy'
+LEGACY_SCHEMA = 'listing_legacy'
+
+SOME_EMPLOYEE = "(SELECT id_employee FROM employees ORDER BY id_employee LIMIT 1)"
+
+# (label, function, arguments): each case runs against public.<function> and LEGACY_SCHEMA.<function>
+CASES = [
+    ('employees', 'get_all_employees',
+     "NULL::varchar, NULL::uuid, NULL::uuid, NULL::uuid, NULL::uuid, ARRAY['employee_name']::text[], ARRAY['ASC']::text[], NULL::varchar"),
+    ('employees by id', 'get_all_employees',
+     f"NULL::varchar, {SOME_EMPLOYEE}, NULL::uuid, NULL::uuid, NULL::uuid, ARRAY['first_name']::text[], ARRAY['ASC']::text[], NULL::varchar"),
+    ('employees search', 'get_all_employees',
+     "NULL::varchar, NULL::uuid, NULL::uuid, NULL::uuid, NULL::uuid, ARRAY['relevance']::text[], ARRAY['ASC']::text[], 'ana'::varchar"),
+    ('employees two keys', 'get_all_employees',
+     "NULL::varchar, NULL::uuid, NULL::uuid, NULL::uuid, NULL::uuid, ARRAY['department_name', 'employee_name']::text[], ARRAY['ASC', 'DESC']::text[], NULL::varchar"),
+    ('employees keyset', 'get_all_employees_keyset',
+     "NULL::varchar, NULL::uuid, NULL::uuid, NULL::uuid, NULL::uuid, 'role_name', 'DESC', NULL::varchar, NULL::text, NULL::uuid, 20"),
+    ('contracts of employee', 'get_contracts',
+     f"{SOME_EMPLOYEE}, NULL::varchar, NULL::uuid, NULL::varchar, NULL::varchar, NULL::varchar, NULL::varchar, ARRAY['created_at']::text[], ARRAY['DESC']::text[]"),
+    ('contracts two keys', 'get_contracts',
+     "NULL::uuid, NULL::varchar, NULL::uuid, NULL::varchar, NULL::varchar, NULL::varchar, NULL::varchar, ARRAY['role_name', 'base_salary']::text[], ARRAY['ASC', 'DESC']::text[]"),
+    ('roles', 'get_all_roles', "NULL::varchar, ARRAY['role_name']::text[], ARRAY['ASC']::text[], 10, 0"),
+    ('roles search', 'get_all_roles', "'a'::varchar, ARRAY['department_name']::text[], ARRAY['DESC']::text[], 10, 0"),
+    ('departments', 'get_all_departments', "NULL::varchar, ARRAY['name']::text[], ARRAY['ASC']::text[], 10, 0"),
+    ('permissions', 'get_all_permissions', "NULL::varchar, ARRAY['codename']::text[], ARRAY['ASC']::text[], 20, 0"),
+    ('permissions search', 'get_all_permissions', "'view'::varchar, ARRAY['name']::text[], ARRAY['ASC']::text[], 20, 0"),
+    ('auth groups', 'get_all_auth_groups', "NULL::varchar, ARRAY['name']::text[], ARRAY['ASC']::text[], 10, 0"),
+    ('groups permissions', 'get_all_employees_groups_permissions', "NULL::varchar, ARRAY['name']::text[], ARRAY['ASC']::text[], 10, 0"),
+    ('certificate types', 'get_all_certificate_types', "NULL::varchar, ARRAY['name']::text[], ARRAY['ASC']::text[], 10, 0"),
+    ('contract leave types', 'get_all_contract_leave_types', "NULL::varchar, ARRAY['leave_type']::text[], ARRAY['ASC']::text[], 10, 0"),
+    ('contract states', 'get_all_contract_states', "NULL::varchar, ARRAY['state']::text[], ARRAY['ASC']::text[], 10, 0"),
+    ('contract types', 'get_all_contract_types', "NULL::varchar, ARRAY['contract_type_name']::text[], ARRAY['ASC']::text[], 10, 0"),
+    ('payment methods', 'get_all_payment_methods', "NULL::varchar, ARRAY['name']::text[], ARRAY['ASC']::text[], 10, 0"),
+    ('training types', 'get_all_training_types', "NULL::varchar, ARRAY['hours']::text[], ARRAY['DESC']::text[], 10, 0"),
+    ('type benefits', 'get_all_type_benefits', "NULL::varchar, ARRAY['name']::text[], ARRAY['ASC']::text[], 10, 0"),
+]
+
+# Functions whose result changed shape since the legacy version (one row per parent, children as JSON):
+# only the timings are compared, the legacy rows are the exploded parent x child join
+RESHAPED = {'get_all_roles', 'get_all_departments'}
+
+
+class Command(BaseCommand):
+    help = 'Compares the static (plan-cacheable) listing functions with their previous dynamic SQL versions, on the same connection and data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Timed calls per function version (default 50)')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed calls first, so PL/pgSQL can settle on its cached plans (default 10)')
+        parser.add_argument('--function', type=str, action='append', help='Only benchmark this function (can be repeated)')
+
+    def handle(self, *args, **kwargs):
+        cases = [case for case in CASES if not kwargs['function'] or case[1] in kwargs['function']]
+        if not cases:
+            raise CommandError(f"No benchmark for {', '.join(kwargs['function'])}.")
+
+        with connection.cursor() as cursor:
+            self.load_legacy_functions(cursor)
+            try:
+                self.stdout.write(
+                    f"{'case':<24} {'rows':>6} {'legacy avg':>11} {'legacy p95':>11} {'static avg':>11} {'static p95':>11} {'speedup':>8}  same rows"
+                )
+                for label, function, arguments in cases:
+                    self.run_case(cursor, label, function, arguments, kwargs['iterations'], kwargs['warmup'])
+            finally:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {LEGACY_SCHEMA} CASCADE;")
+
+    def load_legacy_functions(self, cursor):
+        cursor.execute(f"DROP SCHEMA IF EXISTS {LEGACY_SCHEMA} CASCADE; CREATE SCHEMA {LEGACY_SCHEMA};")
+        # Unqualified CREATE FUNCTION goes to the first schema of the search_path
+        cursor.execute(f"SET search_path TO {LEGACY_SCHEMA}, public;")
+        try:
+            for sql_file in sorted(LEGACY_DIRECTORY.glob("*.sql")):
+                cursor.execute(sql_file.read_text())
+        finally:
+            cursor.execute("RESET search_path;")
+
+    def run_case(self, cursor, label, function, arguments, iterations, warmup):
+        queries = {
+            'legacy': f"SELECT * FROM {LEGACY_SCHEMA}.{function}({arguments});",
+            'static': f"SELECT * FROM public.{function}({arguments});",
+        }
+        timings = {version: [] for version in queries}
+        rows = {}
+
+        for iteration in range(warmup + iterations):
+            # Alternating the versions spreads any drift (cache, autovacuum...) over both
+            for version, query in queries.items():
+                start = time.perf_counter()
+                cursor.execute(query)
+                rows[version] = cursor.fetchall()
+                if iteration >= warmup:
+                    timings[version].append((time.perf_counter() - start) * 1000)
+
+        legacy_avg, legacy_p95 = self.summary(timings['legacy'])
+        static_avg, static_p95 = self.summary(timings['static'])
+        # Ties may come back in another order, so the rows are compared as multisets
+        if function in RESHAPED:
+            same_rows = 'n/a'
+        else:
+            same_rows = 'yes' if sorted(map(repr, rows['legacy'])) == sorted(map(repr, rows['static'])) else 'no'
+        speedup = legacy_avg / static_avg if static_avg else 0
+
+        line = (
+            f"{label:<24} {len(rows['static']):>6} {legacy_avg:>9.2f}ms {legacy_p95:>9.2f}ms "
+            f"{static_avg:>9.2f}ms {static_p95:>9.2f}ms {speedup:>7.2f}x  {same_rows}"
+        )
+        self.stdout.write(self.style.SUCCESS(line) if speedup >= 1 else self.style.WARNING(line))
+
+    def summary(self, timings):
+        if len(timings) < 2:
+            return (timings[0], timings[0]) if timings else (0, 0)
+        return statistics.mean(timings), statistics.quantiles(timings, n=20)[-1]
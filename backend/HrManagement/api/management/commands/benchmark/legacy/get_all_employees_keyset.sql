@@ -0,0 +1,93 @@
+-- Paginação por cursor (keyset): em vez de OFFSET, continua a partir da
+-- última linha da página anterior (chave de ordenação + id_employee).
+CREATE OR REPLACE FUNCTION get_all_employees_keyset(
+    name_param varchar DEFAULT NULL,
+    id_param UUID DEFAULT NULL,
+    department_id_param UUID DEFAULT NULL,
+    role_param UUID DEFAULT NULL,
+    status_param UUID DEFAULT NULL,
+    order_by_param text DEFAULT 'first_name',
+    order_direction_param text DEFAULT 'ASC',  -- (ASC ou DESC)
+    global_search_param varchar DEFAULT NULL,
+    cursor_key_param text DEFAULT NULL,        -- chave de ordenação da última linha já devolvida
+    cursor_id_param UUID DEFAULT NULL,         -- id_employee da última linha já devolvida
+    limit_param integer DEFAULT 5
+)
+RETURNS TABLE(
+    id character varying,
+    employee_name character varying,
+    role_name character varying,
+    role_hex_color character varying,
+    department_name character varying,
+    status_name character varying,
+    icon character varying,
+    state_hex_color character varying,
+    sort_key text
+) AS $$
+DECLARE
+    sort_expression text;
+    comparison text;
+    direction text;
+    sql_query text;
+BEGIN
+    -- Chaves de ordenação permitidas (NULLs viram '' para a comparação por tuplo ser total)
+    sort_expression := CASE order_by_param
+        WHEN 'employee_name' THEN '(auth_user.first_name || '' '' || auth_user.last_name)'
+        WHEN 'id' THEN 'employees.id_employee::text'
+        WHEN 'role_name' THEN 'COALESCE(roles.role_name, '''')'
+        WHEN 'department_name' THEN 'COALESCE(departments.name, '''')'
+        WHEN 'state_name' THEN 'COALESCE(contract_state.state, '''')'
+        ELSE 'auth_user.first_name'
+    END;
+
+    IF upper(order_direction_param) = 'DESC' THEN
+        direction := 'DESC';
+        comparison := '<';
+    ELSE
+        direction := 'ASC';
+        comparison := '>';
+    END IF;
+
+    sql_query := '
+        SELECT
+            CAST(employees.id_employee AS character varying) AS id_employee,
+            CAST(auth_user.first_name || '' '' || auth_user.last_name AS character varying) AS employee_name,
+            roles.role_name,
+            roles.hex_color AS role_hex_color,
+            departments.name AS department_name,
+            contract_state.state,
+            contract_state.icon,
+            contract_state.hex_color AS state_hex_color,
+            CAST(' || sort_expression || ' AS text) AS sort_key
+        FROM employees
+        INNER JOIN auth_user ON employees.id_auth_user = auth_user.id
+        LEFT JOIN latest_contract_materialized_view ON employees.id_employee = latest_contract_materialized_view.id_employee
+        LEFT JOIN roles ON latest_contract_materialized_view.id_role = roles.id_role
+        LEFT JOIN departments ON roles.id_department = departments.id_department
+        LEFT JOIN latest_contract_state_materialized_view ON latest_contract_materialized_view.id_contract = latest_contract_state_materialized_view.id_contract
+        LEFT JOIN contract_state ON latest_contract_state_materialized_view.id_contract_state = contract_state.id_contract_state
+        LEFT JOIN employee_search ON employees.id_employee = employee_search.id_employee
+        WHERE
+            ($1 IS NULL OR (auth_user.first_name || '' '' || auth_user.last_name) ILIKE $1)
+            AND ($2 IS NULL OR employees.id_employee = $2)
+            AND ($3 IS NULL OR departments.id_department = $3)
+            AND ($4 IS NULL OR roles.id_role = $4)
+            AND ($5 IS NULL OR contract_state.id_contract_state = $5)
+            AND ($6 IS NULL OR employee_search.search_document ILIKE ''%'' || $6 || ''%'')
+            AND ($8 IS NULL OR (' || sort_expression || ', employees.id_employee) ' || comparison || ' ($7, $8))
+        GROUP BY
+            auth_user.first_name,
+            auth_user.last_name,
+            employees.id_employee,
+            roles.role_name,
+            roles.hex_color,
+            departments.name,
+            contract_state.state,
+            contract_state.icon,
+            contract_state.hex_color
+        ORDER BY ' || sort_expression || ' ' || direction || ', employees.id_employee ' || direction || '
+        LIMIT $9;';
+
+    RETURN QUERY EXECUTE sql_query USING name_param, id_param, department_id_param, role_param, status_param, global_search_param, cursor_key_param, cursor_id_param, limit_param;
+END;
+$$ LANGUAGE plpgsql;
@@ -8,12 +8,17 @@ import os
 from pathlib import Path
 from django.apps import apps
 import io
-from pymongo import MongoClient
 from api.utils.mongo_client import get_mongo_db
+from api.utils.mongo_indexes import reconcile_indexes, index_sizes
+from api.utils.bulk import restore_derived_data_triggers
 
 collections = [
     {
         "name": "attendance",
+        "indexes": [
+            {"name": "id_employee_date_unique", "keys": [("id_employee", 1), ("date", 1)], "unique": True},
+            {"name": "date", "keys": [("date", 1)]},
+        ],
         "validator": {
             "$jsonSchema": {
                 "bsonType": "object",
@@ -53,6 +58,10 @@ collections = [
     },
     {
         "name": "extrahours",
+        "indexes": [
+            {"name": "id_employee_date_unique", "keys": [("id_employee", 1), ("date", 1)], "unique": True},
+            {"name": "date", "keys": [("date", 1)]},
+        ],
         "validator": {
             "$jsonSchema": {
                 "bsonType": "object",
@@ -83,6 +92,9 @@ collections = [
     },
      {
         "name": "schedule",
+        "indexes": [
+            {"name": "id_employee_unique", "keys": [("id_employee", 1)], "unique": True},
+        ],
         "validator": {
             "$jsonSchema": {
                 "bsonType": "object",
@@ -222,14 +234,20 @@ class Command(BaseCommand):
         parser.add_argument('--file', type=str, help='Arquivo SQL específico para executar (ex: /functions/get_employees.sql)')
         parser.add_argument('--create', action='store_true', help='Criar somente os dados da base de dados postgres SQL (os procedimentos, funções e etc.. não serão criados. Caso queira execute \033[32mpython manage.py database\033[m`). (ex: --create)')
         parser.add_argument('--drop', action='store_true', help='Deletar somente os dados da base de dados postgres SQL (os procedimentos, funções e etc.. não serão influenciados). (ex: --drop)')
+        parser.add_argument('--indexes', action='store_true', help='Criar/acertar somente os índices das coleções MongoDB. (ex: --indexes)')
 
     def handle(self, *args, **kwargs):
         sql_file = kwargs['file']
         create_db = kwargs['create']
         drop_db = kwargs['drop']
+        mongo_indexes = kwargs['indexes']
     
-        if sum([bool(sql_file), create_db, drop_db]) > 1:
-            self.stdout.write(self.style.ERROR("Use apenas uma das opções: --file, --create ou --drop."))
+        if sum([bool(sql_file), create_db, drop_db, mongo_indexes]) > 1:
+            self.stdout.write(self.style.ERROR("Use apenas uma das opções: --file, --create, --drop ou --indexes."))
+            return
+
+        if mongo_indexes:
+            self.sync_mongo_indexes(get_mongo_db())
             return
     
         base_dir = Path(__file__).resolve().parent / 'database'
@@ -260,7 +278,7 @@ class Command(BaseCommand):
                     self.stdout.write(self.style.SUCCESS("Base de dados PostgreSQL deletada com sucesso."))
 
                     db = get_mongo_db()
-                    for collection_name in collections['name']:
+                    for collection_name in [collection["name"] for collection in collections]:
                         if collection_name in db.list_collection_names():
                             db[collection_name].drop()
                             self.stdout.write(self.style.SUCCESS(f"Coleção '{collection_name}' deletada do MongoDB."))
@@ -315,6 +333,13 @@ class Command(BaseCommand):
                         self.execute_sql_file(cursor, sql_file)
                         self.stdout.write(self.style.SUCCESS(f"Executado o arquivo: {sql_file}"))
 
+                    # Triggers desativados por um seed --bulk interrompido
+                    restored = restore_derived_data_triggers(cursor)
+                    if restored:
+                        self.stdout.write(self.style.WARNING(
+                            f"Triggers reativados e dados derivados reconstruídos: {', '.join(trigger for _, trigger in restored)}"
+                        ))
+
                     db = get_mongo_db()
 
                     for collection in collections:
@@ -332,6 +357,7 @@ class Command(BaseCommand):
                         else:
                             self.stdout.write(f"Coleção '{collection_name}' já existe.")
 
+                    self.sync_mongo_indexes(db)
                     
 
                 connection.commit()
@@ -347,6 +373,26 @@ class Command(BaseCommand):
             sql = file.read()
         cursor.execute(sql)
 
+    def sync_mongo_indexes(self, db):
+        """Cria/acerta os índices declarados de cada coleção MongoDB e mostra os tamanhos"""
+        for collection in collections:
+            collection_name = collection["name"]
+            if collection_name not in db.list_collection_names():
+                continue
+            self.stdout.write(f"Índices da coleção '{collection_name}':")
+            result = reconcile_indexes(db[collection_name], collection.get("indexes", []), log=self.stdout.write)
+
+            for index_name, error in result['failed']:
+                self.stdout.write(self.style.ERROR(f"  {index_name}: {error}"))
+            self.stdout.write(self.style.SUCCESS(
+                f"  {len(result['created'])} criados, {len(result['dropped'])} removidos, {len(result['kept'])} sem alterações."
+            ))
+
+            sizes = index_sizes(db[collection_name])
+            self.stdout.write(f"  {sizes['count']} documentos, índices: {sizes['total_index_size'] / 1024 / 1024:.2f} MB")
+            for index_name, size in sizes['index_sizes'].items():
+                self.stdout.write(f"    {index_name}: {size / 1024 / 1024:.2f} MB")
+
     def drop_migrations(self):
         """Deleta todas as migrações"""
         for app in apps.get_app_configs():
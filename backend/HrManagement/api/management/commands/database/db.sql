@@ -1,4 +1,5 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 CREATE TABLE IF NOT EXISTS departments (
     id_department UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -253,14 +254,37 @@ CREATE TABLE IF NOT EXISTS payment_methods (
     deleted_at TIMESTAMP DEFAULT NULL
 );
 
+-- Processamentos salariais mensais (ver functions/run_payroll.sql)
+CREATE TABLE IF NOT EXISTS payroll_runs (
+    id_payroll_run UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    month DATE NOT NULL,
+    payment_date DATE NOT NULL,
+    id_payment_method UUID NOT NULL,
+    id_employee_supervisor UUID NOT NULL,
+    FOREIGN KEY (id_payment_method) REFERENCES payment_methods(id_payment_method),
+    FOREIGN KEY (id_employee_supervisor) REFERENCES employees(id_employee),
+    payments_created INTEGER NOT NULL DEFAULT 0,
+    bonuses_linked INTEGER NOT NULL DEFAULT 0,
+    deductions_linked INTEGER NOT NULL DEFAULT 0,
+    total_amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    duration_ms NUMERIC(12, 3),
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    deleted_at TIMESTAMP DEFAULT NULL
+);
+
 CREATE TABLE IF NOT EXISTS payments (
     id_payment UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     id_employee UUID NOT NULL,
     id_employee_supervisor UUID NOT NULL,
     id_payment_method UUID NOT NULL,
+    id_payroll_run UUID,
     FOREIGN KEY (id_employee) REFERENCES employees(id_employee),
     FOREIGN KEY (id_employee_supervisor) REFERENCES employees(id_employee),
     FOREIGN KEY (id_payment_method) REFERENCES payment_methods(id_payment_method),
+    FOREIGN KEY (id_payroll_run) REFERENCES payroll_runs(id_payroll_run),
     amount DECIMAL(10,2) NOT NULL,
     payment_date DATE NOT NULL,
     extra_amount DECIMAL(10,2),
@@ -300,3 +324,194 @@ CREATE TABLE IF NOT EXISTS bonuses (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     deleted_at TIMESTAMP DEFAULT NULL
 );
+
+-- Documento de pesquisa desnormalizado por funcionário (mantido pelos triggers de triggers/employee_search.sql)
+-- Também guarda as colunas da listagem de funcionários (contrato, role, departamento e estado atuais),
+-- para que a listagem filtre e ordene por índices de uma só tabela (functions/get_all_employees*.sql).
+CREATE TABLE IF NOT EXISTS employee_search (
+    id_employee UUID PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    search_document TEXT NOT NULL,   -- nome, id, role, departamento e estado do contrato
+    groups_document TEXT NOT NULL,   -- grupos e tipos de formação
+    first_name VARCHAR(150),
+    id_role UUID,
+    role_name VARCHAR(100),
+    role_hex_color VARCHAR(7),
+    id_department UUID,
+    department_name VARCHAR(100),
+    id_contract_state UUID,
+    state VARCHAR(100),
+    state_icon VARCHAR(100),
+    state_hex_color VARCHAR(7),
+    FOREIGN KEY (id_employee) REFERENCES employees(id_employee) ON DELETE CASCADE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Bases criadas antes das colunas da listagem
+ALTER TABLE employee_search
+    ADD COLUMN IF NOT EXISTS first_name VARCHAR(150),
+    ADD COLUMN IF NOT EXISTS id_role UUID,
+    ADD COLUMN IF NOT EXISTS role_name VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS role_hex_color VARCHAR(7),
+    ADD COLUMN IF NOT EXISTS id_department UUID,
+    ADD COLUMN IF NOT EXISTS department_name VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS id_contract_state UUID,
+    ADD COLUMN IF NOT EXISTS state VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS state_icon VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS state_hex_color VARCHAR(7);
+
+CREATE INDEX IF NOT EXISTS employee_search_full_name_trgm_idx ON employee_search USING GIN (full_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS employee_search_search_document_trgm_idx ON employee_search USING GIN (search_document gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS employee_search_groups_document_trgm_idx ON employee_search USING GIN (groups_document gin_trgm_ops);
+
+-- Filtros da listagem de funcionários
+CREATE INDEX IF NOT EXISTS employee_search_id_role_idx ON employee_search (id_role);
+CREATE INDEX IF NOT EXISTS employee_search_id_department_idx ON employee_search (id_department);
+CREATE INDEX IF NOT EXISTS employee_search_id_contract_state_idx ON employee_search (id_contract_state);
+
+-- Chaves de ordenação da listagem: (chave é NULL, chave, id_employee), a ordem total usada pelo cursor.
+-- As linhas sem valor ficam no fim em ASC e no início em DESC (como ORDER BY chave ASC/DESC).
+CREATE INDEX IF NOT EXISTS employee_search_first_name_sort_idx ON employee_search ((first_name IS NULL), COALESCE(first_name, ''), id_employee);
+CREATE INDEX IF NOT EXISTS employee_search_full_name_sort_idx ON employee_search ((full_name IS NULL), COALESCE(full_name, ''), id_employee);
+CREATE INDEX IF NOT EXISTS employee_search_role_name_sort_idx ON employee_search ((role_name IS NULL), COALESCE(role_name, ''), id_employee);
+CREATE INDEX IF NOT EXISTS employee_search_department_name_sort_idx ON employee_search ((department_name IS NULL), COALESCE(department_name, ''), id_employee);
+CREATE INDEX IF NOT EXISTS employee_search_state_sort_idx ON employee_search ((state IS NULL), COALESCE(state, ''), id_employee);
+
+-- Índices usados na manutenção incremental das tabelas latest_* (triggers/refrash_latest_*.sql)
+CREATE INDEX IF NOT EXISTS contract_id_employee_created_at_idx ON contract (id_employee, created_at DESC);
+CREATE INDEX IF NOT EXISTS salary_history_id_contract_created_at_idx ON salary_history (id_contract, created_at DESC);
+CREATE INDEX IF NOT EXISTS contract_state_contract_id_contract_created_at_idx ON contract_state_contract (id_contract, created_at DESC);
+
+-- Versão dos dados de cada tabela usada pelas analytics (ver triggers/analytics_source_version.sql).
+-- Incrementada por statement, na mesma transação que a escrita; faz parte da chave do cache das analytics.
+CREATE TABLE IF NOT EXISTS analytics_source_version (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Versão das permissões (ver triggers/permissions_version.sql): faz parte da chave das permissões em cache
+-- (api/utils/permissions.py). Uma só linha, alterada na mesma transação que as permissões.
+CREATE TABLE IF NOT EXISTS permissions_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO permissions_version DEFAULT VALUES ON CONFLICT (id) DO NOTHING;
+
+-- Resumo mensal dos pagamentos por departamento (ver functions/refresh_payroll_monthly_summary.sql).
+-- Mantido pelos triggers de triggers/payroll_monthly_summary.sql: cada escrita soma/subtrai só o contributo
+-- dos pagamentos afetados. id_department é NULL para pagamentos de funcionários sem contrato.
+CREATE TABLE IF NOT EXISTS payroll_monthly_summary (
+    month DATE NOT NULL,
+    id_department UUID,
+    department_key UUID GENERATED ALWAYS AS (COALESCE(id_department, '00000000-0000-0000-0000-000000000000')) STORED,
+    department_name VARCHAR(100),
+    total_payments BIGINT NOT NULL,
+    total_employees_paid BIGINT NOT NULL,
+    total_base_salary NUMERIC(14, 2) NOT NULL,
+    total_bonus_amount NUMERIC(14, 2) NOT NULL,
+    total_deduction_amount NUMERIC(14, 2) NOT NULL,
+    net_payment_amount NUMERIC(14, 2) NOT NULL,
+    min_payment NUMERIC(14, 2),
+    max_payment NUMERIC(14, 2),
+    employees_with_bonus BIGINT NOT NULL,
+    employees_with_deduction BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+ALTER TABLE payroll_monthly_summary
+    ADD COLUMN IF NOT EXISTS department_key UUID GENERATED ALWAYS AS (COALESCE(id_department, '00000000-0000-0000-0000-000000000000')) STORED;
+CREATE INDEX IF NOT EXISTS payroll_monthly_summary_month_idx ON payroll_monthly_summary (month, id_department);
+-- Uma linha por mês e departamento (department_key: id_department, ou zeros para os pagamentos sem departamento)
+CREATE UNIQUE INDEX IF NOT EXISTS payroll_monthly_summary_month_department_key_idx ON payroll_monthly_summary (month, department_key);
+
+-- Funcionários distintos pagos em cada mês, em todos os departamentos (um funcionário pago em dois
+-- departamentos no mesmo mês conta uma vez; a soma das linhas de payroll_monthly_summary contaria duas)
+CREATE TABLE IF NOT EXISTS payroll_monthly_employees (
+    month DATE PRIMARY KEY,
+    total_employees_paid BIGINT NOT NULL
+);
+
+-- Contributo de cada pagamento ativo para payroll_monthly_summary (mês, departamento e valores).
+-- Guarda o que foi somado ao resumo, para ser subtraído quando o pagamento, os seus bónus/descontos
+-- ou o contrato do funcionário mudam.
+-- amount é payments.amount, que já é o líquido (base + extra + bónus - deduções, ver functions/run_payroll.sql
+-- e triggers/update_payment_details.sql); base é o valor antes dos bónus e deduções associados.
+CREATE TABLE IF NOT EXISTS payroll_summary_payment (
+    id_payment UUID PRIMARY KEY,
+    id_employee UUID NOT NULL,
+    month DATE NOT NULL,
+    id_department UUID,
+    department_key UUID GENERATED ALWAYS AS (COALESCE(id_department, '00000000-0000-0000-0000-000000000000')) STORED,
+    amount NUMERIC(14, 2) NOT NULL,
+    bonus NUMERIC(14, 2) NOT NULL,
+    deduction NUMERIC(14, 2) NOT NULL,
+    base NUMERIC(14, 2) GENERATED ALWAYS AS (amount - bonus + deduction) STORED
+);
+-- Bases criadas com net = amount + bonus - deduction, que contava os bónus e deduções duas vezes
+-- (o resumo é reconstruído em triggers/payroll_monthly_summary.sql)
+ALTER TABLE payroll_summary_payment DROP COLUMN IF EXISTS net;
+ALTER TABLE payroll_summary_payment
+    ADD COLUMN IF NOT EXISTS base NUMERIC(14, 2) GENERATED ALWAYS AS (amount - bonus + deduction) STORED;
+-- Mínimo/máximo de um mês e departamento (lidos nas extremidades do índice)
+CREATE INDEX IF NOT EXISTS payroll_summary_payment_month_department_amount_idx ON payroll_summary_payment (month, department_key, amount);
+-- Pagamentos de um funcionário num mês (contagem de funcionários distintos, mudanças de contrato)
+CREATE INDEX IF NOT EXISTS payroll_summary_payment_id_employee_month_idx ON payroll_summary_payment (id_employee, month, department_key);
+
+-- Índices usados no recálculo de um mês
+CREATE INDEX IF NOT EXISTS payments_payment_date_idx ON payments (payment_date);
+CREATE INDEX IF NOT EXISTS bonuses_id_payment_idx ON bonuses (id_payment);
+CREATE INDEX IF NOT EXISTS deductions_id_payment_idx ON deductions (id_payment);
+
+-- Processamento salarial: bases criadas antes de payments.id_payroll_run existir
+ALTER TABLE payments ADD COLUMN IF NOT EXISTS id_payroll_run UUID REFERENCES payroll_runs(id_payroll_run);
+CREATE INDEX IF NOT EXISTS payroll_runs_month_idx ON payroll_runs (month);
+CREATE INDEX IF NOT EXISTS payments_id_payroll_run_idx ON payments (id_payroll_run);
+CREATE INDEX IF NOT EXISTS payments_id_employee_payment_date_idx ON payments (id_employee, payment_date);
+CREATE INDEX IF NOT EXISTS bonuses_id_employee_bonus_date_idx ON bonuses (id_employee, bonus_date);
+CREATE INDEX IF NOT EXISTS deductions_deduction_date_idx ON deductions (deduction_date);
+
+-- Cumprimento do horário (workSchedule vs. attendance, no MongoDB) por funcionário e período.
+-- Calculado pelo comando schedule_compliance (api/utils/schedule_compliance.py); cada cálculo substitui o período.
+CREATE TABLE IF NOT EXISTS schedule_compliance (
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    id_employee UUID NOT NULL,
+    id_department UUID,
+    scheduled_days INTEGER NOT NULL,
+    worked_days INTEGER NOT NULL,
+    absent_days INTEGER NOT NULL,
+    late_days INTEGER NOT NULL,
+    late_minutes BIGINT NOT NULL,
+    early_leave_days INTEGER NOT NULL,
+    early_leave_minutes BIGINT NOT NULL,
+    undertime_minutes BIGINT NOT NULL,
+    missing_punches INTEGER NOT NULL,
+    scheduled_minutes BIGINT NOT NULL,
+    worked_minutes BIGINT NOT NULL,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (period_start, period_end, id_employee),
+    FOREIGN KEY (id_employee) REFERENCES employees(id_employee) ON DELETE CASCADE
+);
+
+-- Os mesmos totais por departamento (id_department NULL: funcionários sem contrato)
+CREATE TABLE IF NOT EXISTS schedule_compliance_department (
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    id_department UUID,
+    department_name VARCHAR(100),
+    employees INTEGER NOT NULL,
+    scheduled_days BIGINT NOT NULL,
+    worked_days BIGINT NOT NULL,
+    absent_days BIGINT NOT NULL,
+    late_days BIGINT NOT NULL,
+    late_minutes BIGINT NOT NULL,
+    early_leave_days BIGINT NOT NULL,
+    early_leave_minutes BIGINT NOT NULL,
+    undertime_minutes BIGINT NOT NULL,
+    missing_punches BIGINT NOT NULL,
+    scheduled_minutes BIGINT NOT NULL,
+    worked_minutes BIGINT NOT NULL,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS schedule_compliance_department_period_idx ON schedule_compliance_department (period_start, period_end);
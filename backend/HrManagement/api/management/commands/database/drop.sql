@@ -1,6 +1,15 @@
+DROP TABLE IF EXISTS employee_search cascade;
+DROP TABLE IF EXISTS analytics_source_version cascade;
+DROP TABLE IF EXISTS permissions_version cascade;
+DROP TABLE IF EXISTS payroll_monthly_summary cascade;
+DROP TABLE IF EXISTS payroll_summary_payment cascade;
+DROP TABLE IF EXISTS payroll_monthly_employees cascade;
+DROP TABLE IF EXISTS schedule_compliance cascade;
+DROP TABLE IF EXISTS schedule_compliance_department cascade;
 DROP TABLE IF EXISTS bonuses cascade;
 DROP TABLE IF EXISTS deductions cascade;
 DROP TABLE IF EXISTS payments cascade;
+DROP TABLE IF EXISTS payroll_runs cascade;
 DROP TABLE IF EXISTS payment_methods cascade;
 DROP TABLE IF EXISTS absence_reason cascade;
 DROP TABLE IF EXISTS trainings cascade;
@@ -27,6 +36,9 @@ DROP TABLE IF EXISTS departments cascade;
 -- Drop funções e triggers
 DROP FUNCTION IF EXISTS update_payment_totals() CASCADE;
 DROP TRIGGER IF EXISTS trg_update_payment_totals ON payments;
+DROP FUNCTION IF EXISTS link_payment_details() CASCADE;
+DROP TRIGGER IF EXISTS trg_link_payment_details ON payments;
+DROP FUNCTION IF EXISTS run_payroll(DATE, UUID, UUID, JSONB, DATE, TEXT[]) CASCADE;
 
 DROP FUNCTION IF EXISTS refresh_latest_salary() CASCADE;
 DROP TRIGGER IF EXISTS trigger_refresh_latest_salary ON contract;
@@ -37,7 +49,22 @@ DROP TRIGGER IF EXISTS trigger_refresh_latest_contract ON contract;
 DROP FUNCTION IF EXISTS refresh_latest_contract_state() CASCADE;
 DROP TRIGGER IF EXISTS trigger_refresh_latest_contract_state ON contract_state_contract;
 
--- Drop views materializadas
-DROP MATERIALIZED VIEW IF EXISTS latest_salary_materialized_view CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS latest_contract_materialized_view CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS latest_contract_state_materialized_view CASCADE;
\ No newline at end of file
+DROP FUNCTION IF EXISTS bump_analytics_source_version() CASCADE;
+
+DROP FUNCTION IF EXISTS sync_payroll_monthly_summary() CASCADE;
+DROP FUNCTION IF EXISTS refresh_payroll_monthly_summary(DATE[]) CASCADE;
+DROP FUNCTION IF EXISTS apply_payroll_summary_payments(UUID[]) CASCADE;
+DROP FUNCTION IF EXISTS rebuild_payroll_monthly_summary() CASCADE;
+
+DROP FUNCTION IF EXISTS sync_employee_search() CASCADE;
+DROP FUNCTION IF EXISTS refresh_employee_search(UUID[]) CASCADE;
+
+DROP FUNCTION IF EXISTS rebuild_latest_tables() CASCADE;
+DROP FUNCTION IF EXISTS refresh_latest_salary_of(UUID) CASCADE;
+DROP FUNCTION IF EXISTS refresh_latest_contract_of(UUID) CASCADE;
+DROP FUNCTION IF EXISTS refresh_latest_contract_state_of(UUID) CASCADE;
+
+-- Drop tabelas "latest" (antigas views materializadas)
+DROP TABLE IF EXISTS latest_salary_materialized_view CASCADE;
+DROP TABLE IF EXISTS latest_contract_materialized_view CASCADE;
+DROP TABLE IF EXISTS latest_contract_state_materialized_view CASCADE;
\ No newline at end of file
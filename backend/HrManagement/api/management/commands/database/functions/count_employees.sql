@@ -0,0 +1,28 @@
+DROP FUNCTION IF EXISTS count_employees(
+    name_param varchar,
+    id_param UUID,
+    department_id_param UUID,
+    role_param UUID,
+    status_param UUID,
+    global_search_param varchar
+);
+
+-- Total de funcionários com os mesmos filtros de get_all_employees,
+-- sem ordenação nem GROUP BY (usado pela paginação da listagem).
+CREATE OR REPLACE FUNCTION count_employees(
+    name_param varchar DEFAULT NULL,
+    id_param UUID DEFAULT NULL,
+    department_id_param UUID DEFAULT NULL,
+    role_param UUID DEFAULT NULL,
+    status_param UUID DEFAULT NULL,
+    global_search_param varchar DEFAULT NULL
+)
+RETURNS BIGINT AS $$
+DECLARE
+    total BIGINT;
+BEGIN
+    SELECT COUNT(*) INTO total
+    FROM employee_listing(name_param, id_param, department_id_param, role_param, status_param, global_search_param);
+    RETURN total;
+END;
+$$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
@@ -0,0 +1,44 @@
+-- Substituídas por employee_listing: employee_listing_ids devolvia os ids num array (sem limite de tamanho),
+-- e a employee_listing antiga (linhas de employee_listing_view) tem outro tipo de retorno
+DROP FUNCTION IF EXISTS employee_listing_ids(
+    name_param varchar,
+    id_param UUID,
+    department_id_param UUID,
+    role_param UUID,
+    status_param UUID,
+    global_search_param varchar
+);
+DROP FUNCTION IF EXISTS employee_listing(
+    name_param varchar,
+    id_param UUID,
+    department_id_param UUID,
+    role_param UUID,
+    status_param UUID,
+    global_search_param varchar
+);
+DROP FUNCTION IF EXISTS employee_listing_candidates(id_param UUID, global_search_param varchar);
+DROP VIEW IF EXISTS employee_listing_view;
+
+-- Linhas de employee_search que satisfazem os filtros das listagens de funcionários (get_all_employees,
+-- get_all_employees_keyset e count_employees). Função SQL de uma só consulta: é expandida dentro da
+-- consulta de quem a usa, e essas listagens são planeadas a cada chamada com os valores pedidos
+-- (plan_cache_mode = force_custom_plan). Os filtros NULL desaparecem do plano e os restantes usam
+-- o seu índice (chave primária, trigram ou id de role/departamento/estado).
+CREATE OR REPLACE FUNCTION employee_listing(
+    name_param varchar,
+    id_param UUID,
+    department_id_param UUID,
+    role_param UUID,
+    status_param UUID,
+    global_search_param varchar
+)
+RETURNS SETOF employee_search AS $$
+    SELECT es.*
+    FROM employee_search es
+    WHERE (id_param IS NULL OR es.id_employee = id_param)
+      AND (global_search_param IS NULL OR es.search_document ILIKE '%' || global_search_param || '%')
+      AND (name_param IS NULL OR es.full_name ILIKE name_param)
+      AND (role_param IS NULL OR es.id_role = role_param)
+      AND (department_id_param IS NULL OR es.id_department = department_id_param)
+      AND (status_param IS NULL OR es.id_contract_state = status_param);
+$$ LANGUAGE sql STABLE;
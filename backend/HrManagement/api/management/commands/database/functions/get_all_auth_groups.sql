@@ -1,3 +1,10 @@
+-- Uma página de grupos, com as permissões e o total de resultados da pesquisa em cada linha.
+-- Uma só consulta, planeada a cada chamada com a pesquisa e a ordenação pedidas (sem pesquisa, o filtro
+-- desaparece do plano). O ORDER BY (cada chave em cada posição, desempatado pelo id) é gerado por
+-- listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_auth_groups(
     global_search_param VARCHAR DEFAULT NULL,
     order_by_param TEXT[] DEFAULT ARRAY['name'],
@@ -10,76 +17,64 @@ RETURNS TABLE (
     name VARCHAR,
     permissions JSONB,
     total_count BIGINT
-) AS $$
+) AS $body$
 DECLARE
-    base_query TEXT;
-    count_query TEXT;
-    final_query TEXT;
-    total BIGINT;
+    order_keys TEXT[] := listing_order_keys(order_by_param, ARRAY['name', 'id'], 'name');
+    order_descs BOOLEAN[] := listing_order_descs(order_by_param, order_direction_param, ARRAY['name', 'id']);
+    search_pattern TEXT := listing_search_pattern(global_search_param);
+    search_number INTEGER := listing_search_integer(global_search_param);
+    -- Só pagina com limit e offset (LIMIT NULL = sem limite)
+    page_limit INTEGER := CASE WHEN offset_param IS NOT NULL THEN limit_param END;
+    page_offset INTEGER := CASE WHEN limit_param IS NOT NULL THEN offset_param END;
 BEGIN
-    -- Base query with group permissions as JSONB array
-    base_query := '
-    WITH group_permissions AS (
-        SELECT
-            ag.id,
-            ag.name,
-            COALESCE(
-                jsonb_agg(
+    -- As permissões só são agregadas para a página devolvida
+    RETURN QUERY
+    SELECT
+        ag.id,
+        ag.name,
+        COALESCE(
+            (
+                SELECT jsonb_agg(
                     jsonb_build_object(
-                        ''id'', ap.id,
-                        ''name'', ap.name,
-                        ''codename'', ap.codename
+                        'id', ap.id,
+                        'name', ap.name,
+                        'codename', ap.codename
                     )
-                ) FILTER (WHERE ap.id IS NOT NULL),
-                ''[]''::jsonb
-            ) as permissions
-        FROM auth_group ag
-        LEFT JOIN auth_group_permissions agp ON ag.id = agp.group_id
-        LEFT JOIN auth_permission ap ON agp.permission_id = ap.id
-        WHERE (
-            $1 IS NULL OR
-            ag.id::text = $1 OR
-            LOWER(ag.name) LIKE LOWER(''%'' || $1 || ''%'') OR
-            LOWER(ap.name) LIKE LOWER (''%'' || $1 || ''%'') OR
-            LOWER(ap.codename) LIKE LOWER (''%'' || $1 || ''%'')
-        )
-        GROUP BY ag.id, ag.name
-        ORDER BY
-            CASE WHEN $2[1] = ''name'' AND $3[1] = ''ASC'' THEN ag.name END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''name'' AND $3[1] = ''DESC'' THEN ag.name END DESC NULLS LAST,
-            CASE WHEN $2[1] = ''id'' AND $3[1] = ''ASC'' THEN ag.id END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''id'' AND $3[1] = ''DESC'' THEN ag.id END DESC NULLS LAST
-    ';
-
-    IF limit_param IS NOT NULL AND offset_param IS NOT NULL THEN
-        base_query := base_query || '
-        LIMIT $4 OFFSET $5';
-    END IF;
-
-    base_query := base_query || '
-    )
-    SELECT *
-    FROM group_permissions';
-
-    -- Count query
-    count_query := '
-    SELECT COUNT(*)
+                )
+                FROM auth_group_permissions agp
+                INNER JOIN auth_permission ap ON agp.permission_id = ap.id
+                WHERE agp.group_id = ag.id
+                  -- Um grupo encontrado só pelas permissões mostra apenas as permissões que coincidem
+                  AND (
+                      global_search_param IS NULL OR
+                      ag.id = search_number OR
+                      ag.name ILIKE search_pattern OR
+                      ap.name ILIKE search_pattern OR
+                      ap.codename ILIKE search_pattern
+                  )
+            ),
+            '[]'::jsonb
+        ),
+        COUNT(*) OVER ()
     FROM auth_group ag
-    WHERE (
-        $1 IS NULL OR
-        ag.id::text = $1 OR
-        LOWER(ag.name) LIKE LOWER(''%'' || $1 || ''%'')
-    )';
-
-    -- Execute count
-    EXECUTE count_query
-    USING global_search_param
-    INTO total;
-
-    -- Combine count with paginated results
-    final_query := 'SELECT sub.*, ' || total || '::BIGINT as total_count FROM (' || base_query || ') sub';
-
-    RETURN QUERY EXECUTE final_query
-    USING global_search_param, order_by_param, order_direction_param, limit_param, offset_param;
+    WHERE global_search_param IS NULL
+       OR ag.id = search_number
+       OR ag.name ILIKE search_pattern
+       OR EXISTS (
+            SELECT 1
+            FROM auth_group_permissions agp
+            INNER JOIN auth_permission ap ON agp.permission_id = ap.id
+            WHERE agp.group_id = ag.id
+              AND (ap.name ILIKE search_pattern OR ap.codename ILIKE search_pattern)
+       )
+    ORDER BY
+        %s
+    LIMIT page_limit OFFSET page_offset;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(ARRAY['name', 'id'], ARRAY['ag.name', 'ag.id'], ARRAY['ag.id'])
+    );
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$listing$;
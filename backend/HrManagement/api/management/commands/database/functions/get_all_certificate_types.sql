@@ -1,3 +1,10 @@
+-- Uma página de tipos de certificado, com o total de resultados da pesquisa em cada linha.
+-- Uma só consulta, planeada a cada chamada com a pesquisa e a ordenação pedidas (sem pesquisa, o filtro
+-- desaparece do plano). O ORDER BY (cada chave em cada posição, desempatado pelo id) é gerado por
+-- listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_certificate_types(
     global_search_param VARCHAR DEFAULT NULL,
     order_by_param TEXT[] DEFAULT ARRAY['name'],
@@ -12,66 +19,37 @@ RETURNS TABLE (
     icon VARCHAR,
     hex_color VARCHAR,
     total_count BIGINT
-) AS $$
+) AS $body$
 DECLARE
-    base_query TEXT;
-    count_query TEXT;
-    final_query TEXT;
-    total BIGINT;
+    order_keys TEXT[] := listing_order_keys(order_by_param, ARRAY['name', 'description'], 'name');
+    order_descs BOOLEAN[] := listing_order_descs(order_by_param, order_direction_param, ARRAY['name', 'description']);
+    search_pattern TEXT := listing_search_pattern(global_search_param);
+    search_id UUID := listing_search_uuid(global_search_param);
+    -- Só pagina com limit e offset (LIMIT NULL = sem limite)
+    page_limit INTEGER := CASE WHEN offset_param IS NOT NULL THEN limit_param END;
+    page_offset INTEGER := CASE WHEN limit_param IS NOT NULL THEN offset_param END;
 BEGIN
-    -- Base query to select certificate types with filters
-    base_query := '
-    WITH limited_certificate_types AS (
-        SELECT
-            id_certificate_type,
-            name,
-            description,
-            icon,
-            hex_color
-        FROM certificate_types
-        WHERE (
-            $1 IS NULL OR
-            id_certificate_type::text = $1 OR
-            LOWER(name) LIKE LOWER(''%'' || $1 || ''%'') OR
-            LOWER(description) LIKE LOWER(''%'' || $1 || ''%'')
-        )
-        ORDER BY
-            CASE WHEN $2[1] = ''name'' AND $3[1] = ''ASC'' THEN name END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''name'' AND $3[1] = ''DESC'' THEN name END DESC NULLS LAST,
-            CASE WHEN $2[1] = ''description'' AND $3[1] = ''ASC'' THEN description END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''description'' AND $3[1] = ''DESC'' THEN description END DESC NULLS LAST
-    ';
-
-    IF limit_param IS NOT NULL AND offset_param IS NOT NULL THEN
-        base_query := base_query || '
-        LIMIT $4 OFFSET $5';
-    END IF;
-
-    base_query := base_query || '
-    )
-    SELECT *
-    FROM limited_certificate_types';
-
-    -- Query to count total certificate types
-    count_query := '
-    SELECT COUNT(*)
-    FROM certificate_types
-    WHERE (
-        $1 IS NULL OR
-        id_certificate_type::text = $1 OR
-        LOWER(name) LIKE LOWER(''%'' || $1 || ''%'') OR
-        LOWER(description) LIKE LOWER(''%'' || $1 || ''%'')
-    )';
-
-    -- Execute count
-    EXECUTE count_query
-    USING global_search_param
-    INTO total;
-
-    -- Combine count with paginated results
-    final_query := 'SELECT sub.*, ' || total || '::BIGINT as total_count FROM (' || base_query || ') sub';
-
-    RETURN QUERY EXECUTE final_query
-    USING global_search_param, order_by_param, order_direction_param, limit_param, offset_param;
+    RETURN QUERY
+    SELECT
+        ct.id_certificate_type,
+        ct.name,
+        ct.description,
+        ct.icon,
+        ct.hex_color,
+        COUNT(*) OVER ()
+    FROM certificate_types ct
+    WHERE global_search_param IS NULL
+       OR ct.id_certificate_type = search_id
+       OR ct.name ILIKE search_pattern
+       OR ct.description ILIKE search_pattern
+    ORDER BY
+        %s
+    LIMIT page_limit OFFSET page_offset;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(ARRAY['name', 'description'], ARRAY['ct.name', 'ct.description'], ARRAY['ct.id_certificate_type'])
+    );
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$listing$;
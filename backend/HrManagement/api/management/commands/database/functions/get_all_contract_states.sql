@@ -1,3 +1,10 @@
+-- Uma página de estados de contrato, com o total de resultados da pesquisa em cada linha.
+-- Uma só consulta, planeada a cada chamada com a pesquisa e a ordenação pedidas (sem pesquisa, o filtro
+-- desaparece do plano). O ORDER BY (cada chave em cada posição, desempatado pelo id) é gerado por
+-- listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_contract_states(
     global_search_param VARCHAR DEFAULT NULL,
     order_by_param TEXT[] DEFAULT ARRAY['state'],
@@ -12,66 +19,37 @@ RETURNS TABLE (
     state VARCHAR,
     description TEXT,
     total_count BIGINT
-) AS $$
+) AS $body$
 DECLARE
-    base_query TEXT;
-    count_query TEXT;
-    final_query TEXT;
-    total BIGINT;
+    order_keys TEXT[] := listing_order_keys(order_by_param, ARRAY['state', 'description'], 'state');
+    order_descs BOOLEAN[] := listing_order_descs(order_by_param, order_direction_param, ARRAY['state', 'description']);
+    search_pattern TEXT := listing_search_pattern(global_search_param);
+    search_id UUID := listing_search_uuid(global_search_param);
+    -- Só pagina com limit e offset (LIMIT NULL = sem limite)
+    page_limit INTEGER := CASE WHEN offset_param IS NOT NULL THEN limit_param END;
+    page_offset INTEGER := CASE WHEN limit_param IS NOT NULL THEN offset_param END;
 BEGIN
-    -- Base query to select contract states with filters
-    base_query := '
-    WITH limited_contract_states AS (
-        SELECT
-            id_contract_state,
-            icon,
-            hex_color,
-            state,
-            description
-        FROM contract_state
-        WHERE (
-            $1 IS NULL OR
-            id_contract_state::text = $1 OR
-            LOWER(state) LIKE LOWER(''%'' || $1 || ''%'') OR
-            LOWER(description) LIKE LOWER(''%'' || $1 || ''%'')
-        )
-        ORDER BY
-            CASE WHEN $2[1] = ''state'' AND $3[1] = ''ASC'' THEN state END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''state'' AND $3[1] = ''DESC'' THEN state END DESC NULLS LAST,
-            CASE WHEN $2[1] = ''description'' AND $3[1] = ''ASC'' THEN description END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''description'' AND $3[1] = ''DESC'' THEN description END DESC NULLS LAST
-    ';
-
-    IF limit_param IS NOT NULL AND offset_param IS NOT NULL THEN
-        base_query := base_query || '
-        LIMIT $4 OFFSET $5';
-    END IF;
-
-    base_query := base_query || '
-    )
-    SELECT *
-    FROM limited_contract_states';
-
-    -- Query to count total contract states
-    count_query := '
-    SELECT COUNT(*)
-    FROM contract_state
-    WHERE (
-        $1 IS NULL OR
-        id_contract_state::text = $1 OR
-        LOWER(state) LIKE LOWER(''%'' || $1 || ''%'') OR
-        LOWER(description) LIKE LOWER(''%'' || $1 || ''%'')
-    )';
-
-    -- Execute count
-    EXECUTE count_query
-    USING global_search_param
-    INTO total;
-
-    -- Combine count with paginated results
-    final_query := 'SELECT sub.*, ' || total || '::BIGINT as total_count FROM (' || base_query || ') sub';
-
-    RETURN QUERY EXECUTE final_query
-    USING global_search_param, order_by_param, order_direction_param, limit_param, offset_param;
+    RETURN QUERY
+    SELECT
+        cs.id_contract_state,
+        cs.icon,
+        cs.hex_color,
+        cs.state,
+        cs.description,
+        COUNT(*) OVER ()
+    FROM contract_state cs
+    WHERE global_search_param IS NULL
+       OR cs.id_contract_state = search_id
+       OR cs.state ILIKE search_pattern
+       OR cs.description ILIKE search_pattern
+    ORDER BY
+        %s
+    LIMIT page_limit OFFSET page_offset;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(ARRAY['state', 'description'], ARRAY['cs.state', 'cs.description'], ARRAY['cs.id_contract_state'])
+    );
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$listing$;
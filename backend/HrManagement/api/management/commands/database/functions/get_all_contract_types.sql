@@ -1,87 +1,72 @@
+-- Uma página de tipos de contrato, com o total de resultados da pesquisa em cada linha.
+-- Uma só consulta, planeada a cada chamada com a pesquisa e a ordenação pedidas (sem pesquisa, o filtro
+-- desaparece do plano). O ORDER BY (cada chave em cada posição, desempatado pelo id) é gerado por
+-- listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_contract_types(
-   global_search_param VARCHAR DEFAULT NULL,
-   order_by_param TEXT[] DEFAULT ARRAY['contract_type_name'],
-   order_direction_param TEXT[] DEFAULT ARRAY['ASC'],
-   limit_param INTEGER DEFAULT NULL,
-   offset_param INTEGER DEFAULT NULL
+    global_search_param VARCHAR DEFAULT NULL,
+    order_by_param TEXT[] DEFAULT ARRAY['contract_type_name'],
+    order_direction_param TEXT[] DEFAULT ARRAY['ASC'],
+    limit_param INTEGER DEFAULT NULL,
+    offset_param INTEGER DEFAULT NULL
 )
 RETURNS TABLE (
-   id_contract_type UUID,
-   contract_type_name VARCHAR,
-   description TEXT,
-   termination_notice_period NUMERIC(10,2),
-   overtime_eligible BOOLEAN,
-   benefits_eligible BOOLEAN,
-   total_count BIGINT
-) AS $$
+    id_contract_type UUID,
+    contract_type_name VARCHAR,
+    description TEXT,
+    termination_notice_period NUMERIC(10,2),
+    overtime_eligible BOOLEAN,
+    benefits_eligible BOOLEAN,
+    total_count BIGINT
+) AS $body$
 DECLARE
-   base_query TEXT;
-   count_query TEXT;
-   final_query TEXT;
-   total BIGINT;
+    order_keys TEXT[] := listing_order_keys(
+        order_by_param,
+        ARRAY['contract_type_name', 'description', 'termination_notice_period', 'overtime_eligible', 'benefits_eligible'],
+        'contract_type_name'
+    );
+    order_descs BOOLEAN[] := listing_order_descs(
+        order_by_param,
+        order_direction_param,
+        ARRAY['contract_type_name', 'description', 'termination_notice_period', 'overtime_eligible', 'benefits_eligible']
+    );
+    search_pattern TEXT := listing_search_pattern(global_search_param);
+    search_id UUID := listing_search_uuid(global_search_param);
+    -- Só pagina com limit e offset (LIMIT NULL = sem limite)
+    page_limit INTEGER := CASE WHEN offset_param IS NOT NULL THEN limit_param END;
+    page_offset INTEGER := CASE WHEN limit_param IS NOT NULL THEN offset_param END;
 BEGIN
-   -- Base query para selecionar os contract types com filtros
-   base_query := '
-   WITH limited_contract_types AS (
-       SELECT
-           id_contract_type,
-           contract_type_name,
-           description,
-           termination_notice_period,
-           overtime_eligible,
-           benefits_eligible
-       FROM contract_type
-       WHERE deleted_at IS NULL
-       AND (
-           $1 IS NULL OR
-           id_contract_type::text = $1 OR
-           LOWER(contract_type_name) LIKE LOWER(''%'' || $1 || ''%'') OR
-           LOWER(description) LIKE LOWER(''%'' || $1 || ''%'')
-       )
-       ORDER BY
-           CASE WHEN $2[1] = ''contract_type_name'' AND $3[1] = ''ASC'' THEN contract_type_name END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''contract_type_name'' AND $3[1] = ''DESC'' THEN contract_type_name END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''description'' AND $3[1] = ''ASC'' THEN description END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''description'' AND $3[1] = ''DESC'' THEN description END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''termination_notice_period'' AND $3[1] = ''ASC'' THEN termination_notice_period END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''termination_notice_period'' AND $3[1] = ''DESC'' THEN termination_notice_period END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''overtime_eligible'' AND $3[1] = ''ASC'' THEN overtime_eligible END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''overtime_eligible'' AND $3[1] = ''DESC'' THEN overtime_eligible END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''benefits_eligible'' AND $3[1] = ''ASC'' THEN benefits_eligible END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''benefits_eligible'' AND $3[1] = ''DESC'' THEN benefits_eligible END DESC NULLS LAST
-   ';
-
-   IF limit_param IS NOT NULL AND offset_param IS NOT NULL THEN
-       base_query := base_query || '
-       LIMIT $4 OFFSET $5';
-   END IF;
-
-   base_query := base_query || '
-   )
-   SELECT *
-   FROM limited_contract_types';
-
-   -- Query para contar o total de contract types
-   count_query := '
-   SELECT COUNT(*)
-   FROM contract_type
-   WHERE deleted_at IS NULL
-   AND (
-       $1 IS NULL OR
-       id_contract_type::text = $1 OR
-       LOWER(contract_type_name) LIKE LOWER(''%'' || $1 || ''%'') OR
-       LOWER(description) LIKE LOWER(''%'' || $1 || ''%'')
-   )';
-
-   -- Executar a contagem
-   EXECUTE count_query
-   USING global_search_param
-   INTO total;
-
-   -- Combinar a contagem com os resultados paginados
-   final_query := 'SELECT sub.*, ' || total || '::BIGINT as total_count FROM (' || base_query || ') sub';
-
-   RETURN QUERY EXECUTE final_query
-   USING global_search_param, order_by_param, order_direction_param, limit_param, offset_param;
+    RETURN QUERY
+    SELECT
+        ct.id_contract_type,
+        ct.contract_type_name,
+        ct.description,
+        ct.termination_notice_period,
+        ct.overtime_eligible,
+        ct.benefits_eligible,
+        COUNT(*) OVER ()
+    FROM contract_type ct
+    WHERE ct.deleted_at IS NULL
+      AND (
+          global_search_param IS NULL
+          OR ct.id_contract_type = search_id
+          OR ct.contract_type_name ILIKE search_pattern
+          OR ct.description ILIKE search_pattern
+      )
+    ORDER BY
+        %s
+    LIMIT page_limit OFFSET page_offset;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(
+            ARRAY['contract_type_name', 'description', 'termination_notice_period', 'overtime_eligible', 'benefits_eligible'],
+            ARRAY['ct.contract_type_name', 'ct.description', 'ct.termination_notice_period', 'ct.overtime_eligible', 'ct.benefits_eligible'],
+            ARRAY['ct.id_contract_type']
+        )
+    );
 END;
-$$ LANGUAGE plpgsql;
+$listing$;
@@ -1,90 +1,94 @@
+-- O tipo de retorno mudou (roles agregadas em JSON): CREATE OR REPLACE não o pode alterar
+DROP FUNCTION IF EXISTS get_all_departments(VARCHAR, TEXT[], TEXT[], INTEGER, INTEGER);
+
+-- Uma linha por departamento, com as roles (e os tipos de formação de cada uma) já agregadas num array JSON
+-- e o total de resultados da pesquisa. Uma só consulta, planeada a cada chamada com a pesquisa e a ordenação
+-- pedidas (sem pesquisa, o filtro desaparece do plano). O ORDER BY (cada chave em cada posição, desempatado
+-- pelo id) é gerado por listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_departments(
-   global_search_param VARCHAR DEFAULT NULL,
-   order_by_param TEXT[] DEFAULT ARRAY['name'],
-   order_direction_param TEXT[] DEFAULT ARRAY['ASC'],
-   limit_param INTEGER DEFAULT NULL,
-   offset_param INTEGER DEFAULT NULL
+    global_search_param VARCHAR DEFAULT NULL,
+    order_by_param TEXT[] DEFAULT ARRAY['name'],
+    order_direction_param TEXT[] DEFAULT ARRAY['ASC'],
+    limit_param INTEGER DEFAULT NULL,
+    offset_param INTEGER DEFAULT NULL
 )
 RETURNS TABLE (
-   id_department UUID,
-   department_name VARCHAR,
-   department_description TEXT,
-   id_role UUID,
-   role_name VARCHAR,
-   hex_color VARCHAR,
-   role_description TEXT,
-   id_training_type UUID,
-   training_type_name VARCHAR,
-   training_type_description TEXT,
-   training_type_hours INT,
-   total_count BIGINT
-) AS $$
+    id_department UUID,
+    department_name VARCHAR,
+    department_description TEXT,
+    roles JSON,
+    total_count BIGINT
+) AS $body$
 DECLARE
-   base_query TEXT;
-   count_query TEXT;
-   final_query TEXT;
-   total BIGINT;
+    order_keys TEXT[] := listing_order_keys(order_by_param, ARRAY['name'], 'name');
+    order_descs BOOLEAN[] := listing_order_descs(order_by_param, order_direction_param, ARRAY['name']);
+    search_pattern TEXT := listing_search_pattern(global_search_param);
+    search_id UUID := listing_search_uuid(global_search_param);
+    -- Só pagina com limit e offset (LIMIT NULL = sem limite)
+    page_limit INTEGER := CASE WHEN offset_param IS NOT NULL THEN limit_param END;
+    page_offset INTEGER := CASE WHEN limit_param IS NOT NULL THEN offset_param END;
 BEGIN
-   -- First get the limited departments
-   base_query := '
-   WITH limited_departments AS (
-       SELECT d.id_department, d.name, d.description
-       FROM departments d
-       WHERE d.deleted_at IS NULL
-       AND (
-           $1 IS NULL OR
-           d.id_department::text = $1 OR
-           LOWER(d.name) LIKE LOWER(''%'' || $1 || ''%'') OR
-           LOWER(d.description) LIKE LOWER(''%'' || $1 || ''%'')
-       )
-       ORDER BY
-           CASE WHEN $2[1] = ''name'' AND $3[1] = ''ASC'' THEN d.name END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''name'' AND $3[1] = ''DESC'' THEN d.name END DESC NULLS LAST';
-
-   IF limit_param IS NOT NULL AND offset_param IS NOT NULL THEN
-       base_query := base_query || '
-       LIMIT $4 OFFSET $5';
-   END IF;
-
-   base_query := base_query || '
-   )
-   SELECT
-       d.id_department,
-       d.name,
-       d.description,
-       r.id_role,
-       r.role_name,
-       r.hex_color,
-       r.description,
-       ttr.id_training_type,
-       tt.name,
-       tt.description,
-       tt.hours
-   FROM limited_departments d
-   LEFT JOIN roles r ON d.id_department = r.id_department AND r.deleted_at IS NULL
-   LEFT JOIN training_type_role ttr ON r.id_role = ttr.id_role AND ttr.deleted_at IS NULL
-   LEFT JOIN training_types tt ON ttr.id_training_type = tt.id_training_type AND tt.deleted_at IS NULL';
-
-   -- Get total count of departments
-   count_query := '
-   SELECT COUNT(DISTINCT d.id_department)
-   FROM departments d
-   WHERE d.deleted_at IS NULL
-   AND (
-       $1 IS NULL OR
-       d.id_department::text = $1 OR
-       LOWER(d.name) LIKE LOWER(''%'' || $1 || ''%'') OR
-       LOWER(d.description) LIKE LOWER(''%'' || $1 || ''%'')
-   )';
-
-   EXECUTE count_query
-   USING global_search_param
-   INTO total;
-
-   final_query := 'SELECT sub.*, ' || total || '::BIGINT as total_count FROM (' || base_query || ') sub';
-
-   RETURN QUERY EXECUTE final_query
-   USING global_search_param, order_by_param, order_direction_param, limit_param, offset_param;
-
+    -- As roles só são agregadas para a página devolvida
+    RETURN QUERY
+    SELECT
+        d.id_department,
+        d.name,
+        d.description,
+        COALESCE(
+            (
+                SELECT json_agg(
+                    json_build_object(
+                        'id_role', r.id_role,
+                        'role_name', r.role_name,
+                        'hex_color', r.hex_color,
+                        'description', r.description,
+                        'training_types', COALESCE(
+                            (
+                                SELECT json_agg(
+                                    json_build_object(
+                                        'id_training_type', tt.id_training_type,
+                                        'name', tt.name,
+                                        'description', tt.description,
+                                        'hours', tt.hours
+                                    )
+                                    ORDER BY tt.name, tt.id_training_type
+                                )
+                                FROM training_type_role ttr
+                                INNER JOIN training_types tt ON ttr.id_training_type = tt.id_training_type AND tt.deleted_at IS NULL
+                                WHERE ttr.id_role = r.id_role
+                                  AND ttr.deleted_at IS NULL
+                            ),
+                            '[]'::json
+                        )
+                    )
+                    ORDER BY r.role_name, r.id_role
+                )
+                FROM roles r
+                WHERE r.id_department = d.id_department
+                  AND r.deleted_at IS NULL
+            ),
+            '[]'::json
+        ),
+        COUNT(*) OVER ()
+    FROM departments d
+    WHERE d.deleted_at IS NULL
+      AND (
+          global_search_param IS NULL
+          OR d.id_department = search_id
+          OR d.name ILIKE search_pattern
+          OR d.description ILIKE search_pattern
+      )
+    ORDER BY
+        %s
+    LIMIT page_limit OFFSET page_offset;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(ARRAY['name'], ARRAY['d.name'], ARRAY['d.id_department'])
+    );
 END;
-$$ LANGUAGE plpgsql;
+$listing$;
@@ -9,6 +9,15 @@ DROP FUNCTION IF EXISTS get_all_employees(
     global_search_param varchar
 );
 
+-- Uma página da listagem de funcionários, lida de employee_search (filtrada por employee_listing).
+-- Uma só consulta, planeada a cada chamada com a ordenação e os filtros pedidos: por uma chave e sem
+-- filtros, a página é lida do índice (chave é NULL, chave, id_employee) da chave ou da chave primária;
+-- com filtros, só os funcionários filtrados são ordenados. O ORDER BY (cada chave em cada posição)
+-- é gerado por listing_order_by a partir da lista de chaves no fim do bloco.
+-- id_employee desempata sempre a ordem, para que as páginas (LIMIT/OFFSET) sejam estáveis.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_employees(
     name_param varchar DEFAULT NULL,
     id_param UUID DEFAULT NULL,
@@ -17,7 +26,9 @@ CREATE OR REPLACE FUNCTION get_all_employees(
     status_param UUID DEFAULT NULL,
     order_by_param text[] DEFAULT NULL,           -- array para ordenação
     order_direction_param text[] DEFAULT NULL,   -- (ASC ou DESC)
-    global_search_param varchar DEFAULT NULL
+    global_search_param varchar DEFAULT NULL,
+    limit_param integer DEFAULT NULL,            -- NULL: todas as linhas
+    offset_param integer DEFAULT NULL
 )
 RETURNS TABLE(
     employee_name character varying,
@@ -28,88 +39,61 @@ RETURNS TABLE(
     status_name character varying,
     icon character varying,
     state_hex_color character varying
-) AS $$
+) AS $body$
 DECLARE
-    order_by_clause text;
-    sql_query text;
+    order_keys TEXT[] := listing_order_keys(
+        order_by_param,
+        ARRAY['employee_name', 'id', 'role_name', 'department_name', 'state_name', 'relevance', 'first_name'],
+        'first_name'
+    );
+    order_descs BOOLEAN[] := listing_order_descs(
+        order_by_param,
+        order_direction_param,
+        ARRAY['employee_name', 'id', 'role_name', 'department_name', 'state_name', 'relevance', 'first_name']
+    );
 BEGIN
-    order_by_clause := '';
-
-    FOR i IN 1..array_length(order_by_param, 1)
-    LOOP
-        IF order_by_clause <> '' THEN
-            order_by_clause := order_by_clause || ', ';
+    -- Sem pesquisa não há relevância; com pesquisa, os mais relevantes primeiro (a direção não se aplica)
+    IF 'relevance' = ANY(order_keys) THEN
+        IF global_search_param IS NULL THEN
+            order_keys := array_replace(order_keys, 'relevance', 'first_name');
+        ELSE
+            order_descs[array_position(order_keys, 'relevance')] := TRUE;
         END IF;
-
-        order_by_clause := concat(order_by_clause,
-            CASE
-                WHEN order_by_param[i] = 'employee_name' THEN 'employee_name'
-                WHEN order_by_param[i] = 'id' THEN 'employees.id_employee'
-                WHEN order_by_param[i] = 'role_name' THEN 'roles.role_name'
-                WHEN order_by_param[i] = 'department_name' THEN 'departments.name'
-                WHEN order_by_param[i] = 'state_name' THEN 'contract_state.state'
-                ELSE 'auth_user.first_name'
-            END
-        );
-
-        order_by_clause := concat(order_by_clause,
-            CASE
-                WHEN order_direction_param[i] = 'ASC' THEN ' ASC'
-                WHEN order_direction_param[i] = 'DESC' THEN ' DESC'
-                ELSE ' ASC' -- ASC DEFAULT
-            END
-        );
-    END LOOP;
-
-    IF order_by_clause = '' THEN
-        order_by_clause := 'auth_user.first_name ASC';
     END IF;
 
-    sql_query := '
-        SELECT
-            CAST(employees.id_employee AS character varying) AS id_employee,
-            CAST(auth_user.first_name || '' '' || auth_user.last_name AS character varying) AS employee_name,
-            roles.role_name,
-            roles.hex_color AS role_hex_color,
-            departments.name AS department_name,
-            contract_state.state,
-            contract_state.icon,
-            contract_state.hex_color AS state_hex_color
-        FROM employees
-        INNER JOIN auth_user ON employees.id_auth_user = auth_user.id
-        LEFT JOIN latest_contract_materialized_view ON employees.id_employee = latest_contract_materialized_view.id_employee
-        LEFT JOIN roles ON latest_contract_materialized_view.id_role = roles.id_role
-        LEFT JOIN departments ON roles.id_department = departments.id_department
-        LEFT JOIN latest_contract_state_materialized_view ON latest_contract_materialized_view.id_contract = latest_contract_state_materialized_view.id_contract
-        LEFT JOIN contract_state ON latest_contract_state_materialized_view.id_contract_state = contract_state.id_contract_state
-        WHERE
-            ($1 IS NULL OR (auth_user.first_name || '' '' || auth_user.last_name) ILIKE $1)
-            AND ($2 IS NULL OR employees.id_employee = $2)
-            AND ($3 IS NULL OR departments.id_department = $3)
-            AND ($4 IS NULL OR roles.id_role = $4)
-            AND ($5 IS NULL OR contract_state.id_contract_state = $5)
-            AND ($6 IS NULL OR (
-                (auth_user.first_name || '' '' || auth_user.last_name) ILIKE ''%'' || $6 || ''%'' OR
-                employees.id_employee::text ILIKE ''%'' || $6 || ''%'' OR
-                roles.role_name ILIKE ''%'' || $6 || ''%'' OR
-                departments.name ILIKE ''%'' || $6 || ''%'' OR
-                contract_state.state ILIKE ''%'' || $6 || ''%''
-            ))
-        GROUP BY
-            auth_user.first_name,
-            auth_user.last_name,
-            employees.id_employee,
-            roles.role_name,
-            roles.hex_color,
-            departments.name,
-            contract_state.state,
-            contract_state.icon,
-            contract_state.hex_color
-        ORDER BY ' || order_by_clause || ';';
-
-    RETURN QUERY EXECUTE sql_query USING name_param, id_param, department_id_param, role_param, status_param, global_search_param;
+    RETURN QUERY
+    SELECT
+        CAST(es.id_employee AS character varying),
+        CAST(es.full_name AS character varying),
+        es.role_name,
+        es.role_hex_color,
+        es.department_name,
+        es.state,
+        es.state_icon,
+        es.state_hex_color
+    FROM employee_listing(name_param, id_param, department_id_param, role_param, status_param, global_search_param) es
+    ORDER BY
+        %s
+    LIMIT limit_param OFFSET offset_param;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões (as dos índices de ordenação de employee_search)
+        listing_order_by(
+            ARRAY['employee_name', 'employee_name', 'id', 'role_name', 'role_name', 'department_name', 'department_name',
+                  'state_name', 'state_name', 'relevance', 'first_name', 'first_name'],
+            ARRAY['(es.full_name IS NULL)', 'COALESCE(es.full_name, '''')', 'es.id_employee',
+                  '(es.role_name IS NULL)', 'COALESCE(es.role_name, '''')',
+                  '(es.department_name IS NULL)', 'COALESCE(es.department_name, '''')',
+                  '(es.state IS NULL)', 'COALESCE(es.state, '''')',
+                  'word_similarity(global_search_param, es.search_document)',
+                  '(es.first_name IS NULL)', 'COALESCE(es.first_name, '''')'],
+            ARRAY['es.id_employee'],
+            TRUE
+        )
+    );
 END;
-$$ LANGUAGE plpgsql;
+$listing$;
 
 
 /* -- TESTE
@@ -122,6 +106,8 @@ FROM get_all_employees(
         NULL::uuid,       -- status_param
         ARRAY['first_name']::text[],   -- order_by_param
         ARRAY['ASC']::text[],  -- order_direction_param
-        NULL::varchar
+        NULL::varchar,    -- global_search_param
+        10,               -- limit_param
+        0                 -- offset_param
      );
- */
\ No newline at end of file
+ */
@@ -1,3 +1,12 @@
+-- Uma página de funcionários com os seus grupos (e as permissões de cada grupo), com o total de
+-- resultados da pesquisa em cada linha. Uma só consulta, planeada a cada chamada com a pesquisa e a
+-- ordenação pedidas: sem pesquisa, o filtro desaparece do plano; com pesquisa, os funcionários são
+-- encontrados pelos índices trigram de employee_search (nome, grupos) ou pelo id exato do funcionário
+-- ou de uma formação. O ORDER BY (cada chave em cada posição, desempatado pelo id) é gerado por
+-- listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_employees_groups_permissions(
     global_search_param VARCHAR DEFAULT NULL,
     order_by_param TEXT[] DEFAULT ARRAY['name'],
@@ -11,104 +20,85 @@ RETURNS TABLE (
     full_name TEXT,
     groups TEXT,
     total_count BIGINT
-) AS $$
+) AS $body$
 DECLARE
-    base_query TEXT;
-    count_query TEXT;
-    final_query TEXT;
-    total BIGINT;
+    order_keys TEXT[] := listing_order_keys(order_by_param, ARRAY['relevance', 'name', 'groups'], 'name');
+    order_descs BOOLEAN[] := listing_order_descs(order_by_param, order_direction_param, ARRAY['relevance', 'name', 'groups']);
+    search_pattern TEXT := listing_search_pattern(global_search_param);
+    search_id UUID := listing_search_uuid(global_search_param);
+    -- Só pagina com limit e offset (LIMIT NULL = sem limite)
+    page_limit INTEGER := CASE WHEN offset_param IS NOT NULL THEN limit_param END;
+    page_offset INTEGER := CASE WHEN limit_param IS NOT NULL THEN offset_param END;
 BEGIN
-    base_query := '
-    WITH employee_data AS (
-        SELECT
-            e.id_employee,
-            e.src,
-            concat(au.first_name, '' '', au.last_name) as full_name,
-            (
-                SELECT json_agg(
-                    json_build_object(
-                        ''group_id'', ag.id,
-                        ''group_name'', ag.name,
-                        ''permissions'', (
-                            SELECT json_agg(
-                                json_build_object(
-                                    ''id'', ap.id,
-                                    ''name'', ap.name,
-                                    ''codename'', ap.codename
-                                )
+    -- Sem pesquisa não há relevância; com pesquisa, os mais relevantes primeiro (a direção não se aplica)
+    IF 'relevance' = ANY(order_keys) THEN
+        IF global_search_param IS NULL THEN
+            order_keys := array_replace(order_keys, 'relevance', 'name');
+        ELSE
+            order_descs[array_position(order_keys, 'relevance')] := TRUE;
+        END IF;
+    END IF;
+
+    -- Os grupos (com as permissões) só são montados para a página devolvida
+    RETURN QUERY
+    SELECT
+        e.id_employee,
+        e.src,
+        concat(au.first_name, ' ', au.last_name),
+        (
+            SELECT json_agg(
+                json_build_object(
+                    'group_id', ag.id,
+                    'group_name', ag.name,
+                    'permissions', (
+                        SELECT json_agg(
+                            json_build_object(
+                                'id', ap.id,
+                                'name', ap.name,
+                                'codename', ap.codename
                             )
-                            FROM auth_group_permissions agp
-                            JOIN auth_permission ap ON ap.id = agp.permission_id
-                            WHERE agp.group_id = ag.id
                         )
+                        FROM auth_group_permissions agp
+                        JOIN auth_permission ap ON ap.id = agp.permission_id
+                        WHERE agp.group_id = ag.id
                     )
                 )
-                FROM auth_user_groups aug2
-                JOIN auth_group ag ON aug2.group_id = ag.id
-                WHERE aug2.user_id = au.id
-            )::text as groups
-        FROM employees e
-        JOIN auth_user au ON e.id_auth_user = au.id
-        LEFT JOIN auth_user_groups aug ON au.id = aug.user_id
-        LEFT JOIN auth_group ag ON aug.group_id = ag.id
-        LEFT JOIN trainings t ON t.id_employee = e.id_employee
-        LEFT JOIN training_types tt ON t.id_training_type = tt.id_training_type
-        WHERE (
-            $1 IS NULL OR
-            e.id_employee::text = $1 OR
-            LOWER(au.first_name) LIKE LOWER(''%'' || $1 || ''%'') OR
-            LOWER(au.last_name) LIKE LOWER(''%'' || $1 || ''%'') OR
-            LOWER(ag.name) LIKE LOWER(''%'' || $1 || ''%'') OR
-            t.id_training::text = $1 OR
-            LOWER(tt.name) LIKE LOWER(''%'' || $1 || ''%'')
-        )
-        GROUP BY e.id_employee, e.src, au.first_name, au.last_name, au.id, ag.name
-        ORDER BY
-            CASE WHEN $2[1] = ''name'' AND $3[1] = ''ASC''
-                THEN concat(au.first_name, '' '', au.last_name) END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''name'' AND $3[1] = ''DESC''
-                THEN concat(au.first_name, '' '', au.last_name) END DESC NULLS LAST,
-            CASE WHEN $2[1] = ''groups'' AND $3[1] = ''ASC''
-                THEN ag.name END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''groups'' AND $3[1] = ''DESC''
-                THEN ag.name END DESC NULLS LAST
-    ';
-
-    IF limit_param IS NOT NULL AND offset_param IS NOT NULL THEN
-        base_query := base_query || '
-        LIMIT $4 OFFSET $5';
-    END IF;
-
-    base_query := base_query || '
-    )
-    SELECT *
-    FROM employee_data';
-
-    count_query := '
-    SELECT COUNT(DISTINCT e.id_employee)
+            )
+            FROM auth_user_groups aug
+            JOIN auth_group ag ON aug.group_id = ag.id
+            WHERE aug.user_id = au.id
+        )::text,
+        COUNT(*) OVER ()
     FROM employees e
     JOIN auth_user au ON e.id_auth_user = au.id
-    LEFT JOIN auth_user_groups aug ON au.id = aug.user_id
-    LEFT JOIN auth_group ag ON aug.group_id = ag.id
-    LEFT JOIN trainings t ON t.id_employee = e.id_employee
-    LEFT JOIN training_types tt ON t.id_training_type = tt.id_training_type
-    WHERE (
-        $1 IS NULL OR
-        e.id_employee::text = $1 OR
-        LOWER(au.first_name) LIKE LOWER(''%'' || $1 || ''%'') OR
-        LOWER(au.last_name) LIKE LOWER(''%'' || $1 || ''%'') OR
-        LOWER(ag.name) LIKE LOWER(''%'' || $1 || ''%'') OR
-        t.id_training::text = $1 OR
-        LOWER(tt.name) LIKE LOWER(''%'' || $1 || ''%'')
-    )';
-
-    EXECUTE count_query
-    USING global_search_param
-    INTO total;
-
-    final_query := 'SELECT sub.*, ' || total || '::BIGINT as total_count FROM (' || base_query || ') sub';
-
-    RETURN QUERY EXECUTE final_query
-    USING global_search_param, order_by_param, order_direction_param, limit_param, offset_param;
+    LEFT JOIN employee_search es ON es.id_employee = e.id_employee
+    WHERE global_search_param IS NULL
+       OR e.id_employee IN (
+            SELECT e_match.id_employee FROM employees e_match WHERE e_match.id_employee = search_id
+            UNION
+            SELECT es_match.id_employee
+            FROM employee_search es_match
+            WHERE es_match.full_name ILIKE search_pattern
+               OR es_match.groups_document ILIKE search_pattern
+            UNION
+            SELECT t.id_employee
+            FROM trainings t
+            WHERE t.id_training = search_id
+       )
+    ORDER BY
+        %s
+    LIMIT page_limit OFFSET page_offset;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(
+            ARRAY['relevance', 'name', 'groups'],
+            ARRAY['word_similarity(global_search_param, es.full_name || '' '' || es.groups_document)',
+                  'concat(au.first_name, '' '', au.last_name)',
+                  '(SELECT MIN(ag.name) FROM auth_user_groups aug JOIN auth_group ag ON aug.group_id = ag.id WHERE aug.user_id = au.id)'],
+            ARRAY['e.id_employee']
+        )
+    );
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$listing$;
@@ -0,0 +1,150 @@
+DROP FUNCTION IF EXISTS get_all_employees_keyset(
+    name_param varchar,
+    id_param UUID,
+    department_id_param UUID,
+    role_param UUID,
+    status_param UUID,
+    order_by_param text,
+    order_direction_param text,
+    global_search_param varchar,
+    cursor_key_param text,
+    cursor_id_param UUID,
+    limit_param integer
+);
+
+-- Paginação por cursor (keyset): em vez de OFFSET, continua a partir da
+-- última linha da página anterior (chave de ordenação + id_employee).
+-- Uma só consulta sobre employee_listing, planeada a cada chamada com a chave e os filtros pedidos:
+-- sem filtros, a página é lida diretamente do índice (chave é NULL, chave, id_employee) da chave
+-- (ou da chave primária), a partir da posição do cursor; com filtros, só os funcionários filtrados
+-- são ordenados. A condição do cursor e o ORDER BY são gerados da lista de chaves do bloco abaixo.
+DO $listing$
+DECLARE
+    -- Chaves de ordenação e as suas expressões (as dos índices de ordenação de employee_search)
+    sort_keys TEXT[] := ARRAY['employee_name', 'employee_name', 'role_name', 'role_name', 'department_name', 'department_name',
+                              'state_name', 'state_name', 'first_name', 'first_name'];
+    sort_expressions TEXT[] := ARRAY['(es.full_name IS NULL)', 'COALESCE(es.full_name, '''')',
+                                     '(es.role_name IS NULL)', 'COALESCE(es.role_name, '''')',
+                                     '(es.department_name IS NULL)', 'COALESCE(es.department_name, '''')',
+                                     '(es.state IS NULL)', 'COALESCE(es.state, '''')',
+                                     '(es.first_name IS NULL)', 'COALESCE(es.first_name, '''')'];
+    -- Linhas depois do cursor, por chave e direção (a chave 'id' só compara o id_employee)
+    cursor_conditions TEXT;
+BEGIN
+    SELECT string_agg(
+        format(
+            E'WHEN order_keys[1] = %1$L AND order_descs[1] THEN (%2$s, es.id_employee) < (after_null, after_key, after_id)\n'
+            '        WHEN order_keys[1] = %1$L THEN (%2$s, es.id_employee) > (after_null, after_key, after_id)',
+            sort_key.key,
+            sort_key.columns
+        ),
+        E'\n        ' ORDER BY sort_key.key_ordinal
+    )
+    INTO cursor_conditions
+    FROM (
+        SELECT key, string_agg(expression, ', ' ORDER BY ordinal) AS columns, MIN(ordinal) AS key_ordinal
+        FROM unnest(sort_keys, sort_expressions) WITH ORDINALITY AS sort_key(key, expression, ordinal)
+        GROUP BY key
+    ) AS sort_key;
+
+    EXECUTE format($function$
+CREATE OR REPLACE FUNCTION get_all_employees_keyset(
+    name_param varchar DEFAULT NULL,
+    id_param UUID DEFAULT NULL,
+    department_id_param UUID DEFAULT NULL,
+    role_param UUID DEFAULT NULL,
+    status_param UUID DEFAULT NULL,
+    order_by_param text DEFAULT 'first_name',
+    order_direction_param text DEFAULT 'ASC',  -- (ASC ou DESC)
+    global_search_param varchar DEFAULT NULL,
+    cursor_key_param text DEFAULT NULL,        -- chave de ordenação da última linha já devolvida
+    cursor_id_param UUID DEFAULT NULL,         -- id_employee da última linha já devolvida
+    limit_param integer DEFAULT 5
+)
+RETURNS TABLE(
+    id character varying,
+    employee_name character varying,
+    role_name character varying,
+    role_hex_color character varying,
+    department_name character varying,
+    status_name character varying,
+    icon character varying,
+    state_hex_color character varying,
+    sort_key text
+) AS $body$
+DECLARE
+    order_keys TEXT[] := listing_order_keys(
+        ARRAY[order_by_param],
+        ARRAY['employee_name', 'id', 'role_name', 'department_name', 'state_name', 'first_name'],
+        'first_name'
+    );
+    order_descs BOOLEAN[] := listing_order_descs(
+        ARRAY[order_by_param],
+        ARRAY[order_direction_param],
+        ARRAY['employee_name', 'id', 'role_name', 'department_name', 'state_name', 'first_name']
+    );
+    -- Posição do cursor na ordem (chave é NULL, chave, id_employee). Na primeira página,
+    -- uma posição antes (ASC) ou depois (DESC) de todas as linhas.
+    after_null BOOLEAN := CASE WHEN cursor_id_param IS NULL THEN order_descs[1] ELSE cursor_key_param IS NULL END;
+    after_key TEXT := COALESCE(cursor_key_param, '');
+    after_id UUID := COALESCE(
+        cursor_id_param,
+        CASE WHEN order_descs[1] THEN 'ffffffff-ffff-ffff-ffff-ffffffffffff' ELSE '00000000-0000-0000-0000-000000000000' END::uuid
+    );
+BEGIN
+    -- sort_key é o valor da chave (NULL sem valor)
+    RETURN QUERY
+    SELECT
+        CAST(es.id_employee AS character varying),
+        CAST(es.full_name AS character varying),
+        es.role_name,
+        es.role_hex_color,
+        es.department_name,
+        es.state,
+        es.state_icon,
+        es.state_hex_color,
+        CAST(
+            CASE order_keys[1]
+                WHEN 'id' THEN es.id_employee::text
+                WHEN 'employee_name' THEN es.full_name
+                WHEN 'role_name' THEN es.role_name
+                WHEN 'department_name' THEN es.department_name
+                WHEN 'state_name' THEN es.state
+                ELSE es.first_name
+            END AS text
+        )
+    FROM employee_listing(name_param, id_param, department_id_param, role_param, status_param, global_search_param) es
+    WHERE CASE
+        WHEN order_keys[1] = 'id' AND order_descs[1] THEN es.id_employee < after_id
+        WHEN order_keys[1] = 'id' THEN es.id_employee > after_id
+        %s
+    END
+    ORDER BY
+        %s
+    LIMIT limit_param;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        cursor_conditions,
+        listing_order_by(sort_keys || 'id'::text, sort_expressions || 'es.id_employee'::text, ARRAY['es.id_employee'], TRUE, 1)
+    );
+END;
+$listing$;
+
+
+/* -- TESTE
+SELECT *
+FROM get_all_employees_keyset(
+        NULL::varchar,    -- name_param
+        NULL::UUID,       -- id_param
+        NULL::uuid,       -- department_id_param
+        NULL::uuid,       -- role_param
+        NULL::uuid,       -- status_param
+        'employee_name',  -- order_by_param
+        'ASC',            -- order_direction_param
+        NULL::varchar,    -- global_search_param
+        NULL::text,       -- cursor_key_param
+        NULL::uuid,       -- cursor_id_param
+        5                 -- limit_param
+     );
+ */
@@ -1,3 +1,10 @@
+-- Uma página de permissões, com o total de resultados da pesquisa em cada linha.
+-- Uma só consulta, planeada a cada chamada com a pesquisa e a ordenação pedidas (sem pesquisa, o filtro
+-- desaparece do plano). O ORDER BY (cada chave em cada posição, desempatado pelo id) é gerado por
+-- listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_permissions(
     global_search_param VARCHAR DEFAULT NULL,
     order_by_param TEXT[] DEFAULT ARRAY['name'],
@@ -10,60 +17,35 @@ RETURNS TABLE (
     name VARCHAR,
     codename VARCHAR,
     total_count BIGINT
-) AS $$
+) AS $body$
 DECLARE
-    base_query TEXT;
-    count_query TEXT;
-    final_query TEXT;
-    total BIGINT;
+    order_keys TEXT[] := listing_order_keys(order_by_param, ARRAY['name', 'codename'], 'name');
+    order_descs BOOLEAN[] := listing_order_descs(order_by_param, order_direction_param, ARRAY['name', 'codename']);
+    search_pattern TEXT := listing_search_pattern(global_search_param);
+    search_number INTEGER := listing_search_integer(global_search_param);
+    -- Só pagina com limit e offset (LIMIT NULL = sem limite)
+    page_limit INTEGER := CASE WHEN offset_param IS NOT NULL THEN limit_param END;
+    page_offset INTEGER := CASE WHEN limit_param IS NOT NULL THEN offset_param END;
 BEGIN
-    base_query := '
-    WITH permissions_data AS (
-        SELECT
-            p.id,
-            p.name,
-            p.codename
-        FROM auth_permission p
-        WHERE (
-            $1 IS NULL OR
-            p.id::text = $1 OR
-            LOWER(p.name) LIKE LOWER(''%'' || $1 || ''%'') OR
-            LOWER(p.codename) LIKE LOWER(''%'' || $1 || ''%'')
-        )
-        ORDER BY
-            CASE WHEN $2[1] = ''name'' AND $3[1] = ''ASC'' THEN p.name END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''name'' AND $3[1] = ''DESC'' THEN p.name END DESC NULLS LAST,
-            CASE WHEN $2[1] = ''codename'' AND $3[1] = ''ASC'' THEN p.codename END ASC NULLS LAST,
-            CASE WHEN $2[1] = ''codename'' AND $3[1] = ''DESC'' THEN p.codename END DESC NULLS LAST
-    ';
-
-    IF limit_param IS NOT NULL AND offset_param IS NOT NULL THEN
-        base_query := base_query || '
-        LIMIT $4 OFFSET $5';
-    END IF;
-
-    base_query := base_query || '
-    )
-    SELECT *
-    FROM permissions_data';
-
-    count_query := '
-    SELECT COUNT(*)
-    FROM auth_permission p
-    WHERE (
-        $1 IS NULL OR
-        p.id::text = $1 OR
-        LOWER(p.name) LIKE LOWER(''%'' || $1 || ''%'') OR
-        LOWER(p.codename) LIKE LOWER(''%'' || $1 || ''%'')
-    )';
-
-    EXECUTE count_query
-    USING global_search_param
-    INTO total;
-
-    final_query := 'SELECT sub.*, ' || total || '::BIGINT as total_count FROM (' || base_query || ') sub';
-
-    RETURN QUERY EXECUTE final_query
-    USING global_search_param, order_by_param, order_direction_param, limit_param, offset_param;
+    RETURN QUERY
+    SELECT
+        ap.id,
+        ap.name,
+        ap.codename,
+        COUNT(*) OVER ()
+    FROM auth_permission ap
+    WHERE global_search_param IS NULL
+       OR ap.id = search_number
+       OR ap.name ILIKE search_pattern
+       OR ap.codename ILIKE search_pattern
+    ORDER BY
+        %s
+    LIMIT page_limit OFFSET page_offset;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(ARRAY['name', 'codename'], ARRAY['ap.name', 'ap.codename'], ARRAY['ap.id'])
+    );
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$listing$;
@@ -1,120 +1,100 @@
+-- O tipo de retorno mudou (training_types agregados em JSON): CREATE OR REPLACE não o pode alterar
+DROP FUNCTION IF EXISTS get_all_roles(VARCHAR, TEXT[], TEXT[], INTEGER, INTEGER);
+
+-- Uma linha por role, com os tipos de formação associados já agregados num array JSON e o total de
+-- resultados da pesquisa. Uma só consulta, planeada a cada chamada com a pesquisa e a ordenação pedidas
+-- (sem pesquisa, o filtro desaparece do plano). O ORDER BY (cada chave em cada posição, desempatado
+-- pelo id) é gerado por listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_roles(
-   global_search_param VARCHAR DEFAULT NULL,
-   order_by_param TEXT[] DEFAULT ARRAY['role_name'],
-   order_direction_param TEXT[] DEFAULT ARRAY['ASC'],
-   limit_param INTEGER DEFAULT NULL,
-   offset_param INTEGER DEFAULT NULL
+    global_search_param VARCHAR DEFAULT NULL,
+    order_by_param TEXT[] DEFAULT ARRAY['role_name'],
+    order_direction_param TEXT[] DEFAULT ARRAY['ASC'],
+    limit_param INTEGER DEFAULT NULL,
+    offset_param INTEGER DEFAULT NULL
 )
 RETURNS TABLE (
-   id_role UUID,
-   id_department UUID,
-   id_auth_group INTEGER,
-   role_name VARCHAR,
-   hex_color VARCHAR,
-   role_description TEXT,
-   department_name VARCHAR,
-   id_training_type UUID,
-   training_type_name VARCHAR,
-   training_type_description TEXT,
-   training_type_hours INT,
-   total_count BIGINT
-) AS $$
+    id_role UUID,
+    id_department UUID,
+    id_auth_group INTEGER,
+    role_name VARCHAR,
+    hex_color VARCHAR,
+    role_description TEXT,
+    department_name VARCHAR,
+    training_types JSON,
+    total_count BIGINT
+) AS $body$
 DECLARE
-   base_query TEXT;
-   count_query TEXT;
-   final_query TEXT;
-   total BIGINT;
+    order_keys TEXT[] := listing_order_keys(order_by_param, ARRAY['role_name', 'department_name', 'description'], 'role_name');
+    order_descs BOOLEAN[] := listing_order_descs(order_by_param, order_direction_param, ARRAY['role_name', 'department_name', 'description']);
+    search_pattern TEXT := listing_search_pattern(global_search_param);
+    search_id UUID := listing_search_uuid(global_search_param);
+    -- Só pagina com limit e offset (LIMIT NULL = sem limite)
+    page_limit INTEGER := CASE WHEN offset_param IS NOT NULL THEN limit_param END;
+    page_offset INTEGER := CASE WHEN limit_param IS NOT NULL THEN offset_param END;
 BEGIN
-   -- First, get the limited roles
-   base_query := '
-   WITH limited_roles AS (
-       SELECT
-           r.id_role,
-           r.id_department,
-           r.id_auth_group,
-           r.role_name,
-           r.hex_color,
-           r.description,
-           d.name as department_name
-       FROM roles r
-       LEFT JOIN departments d ON r.id_department = d.id_department AND d.deleted_at IS NULL
-       LEFT JOIN training_type_role ttr ON r.id_role = ttr.id_role AND ttr.deleted_at IS NULL
-       LEFT JOIN training_types tt ON ttr.id_training_type = tt.id_training_type AND tt.deleted_at IS NULL
-       WHERE r.deleted_at IS NULL
-       AND (
-           $1 IS NULL OR
-           r.id_role::text = $1 OR
-           d.id_department::text = $1 OR
-           LOWER(r.role_name) LIKE LOWER(''%'' || $1 || ''%'') OR
-           LOWER(d.name) LIKE LOWER(''%'' || $1 || ''%'') OR
-           LOWER(r.description) LIKE LOWER(''%'' || $1 || ''%'') OR
-           LOWER(tt.name) LIKE LOWER(''%'' || $1 || ''%'')
-       )
-       GROUP BY r.id_role, r.id_department, r.id_auth_group, r.role_name, r.hex_color, r.description, d.name
-       ORDER BY
-           CASE WHEN $2[1] = ''role_name'' AND $3[1] = ''ASC'' THEN r.role_name END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''role_name'' AND $3[1] = ''DESC'' THEN r.role_name END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''department_name'' AND $3[1] = ''ASC'' THEN d.name END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''department_name'' AND $3[1] = ''DESC'' THEN d.name END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''description'' AND $3[1] = ''ASC'' THEN r.description END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''description'' AND $3[1] = ''DESC'' THEN r.description END DESC NULLS LAST';
-
-   IF limit_param IS NOT NULL AND offset_param IS NOT NULL THEN
-       base_query := base_query || '
-       LIMIT $4 OFFSET $5';
-   END IF;
-
-   base_query := base_query || '
-   )
-   SELECT
-       r.id_role,
-       r.id_department,
-       r.id_auth_group,
-       r.role_name,
-       r.hex_color,
-       r.description as role_description,
-       r.department_name,
-       ttr.id_training_type,
-       tt.name as training_type_name,
-       tt.description as training_type_description,
-       tt.hours as training_type_hours
-   FROM limited_roles r
-   LEFT JOIN training_type_role ttr ON r.id_role = ttr.id_role AND ttr.deleted_at IS NULL
-   LEFT JOIN training_types tt ON ttr.id_training_type = tt.id_training_type AND tt.deleted_at IS NULL
-   ORDER BY
-           CASE WHEN $2[1] = ''role_name'' AND $3[1] = ''ASC'' THEN r.role_name END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''role_name'' AND $3[1] = ''DESC'' THEN r.role_name END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''department_name'' AND $3[1] = ''ASC'' THEN r.department_name END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''department_name'' AND $3[1] = ''DESC'' THEN r.department_name END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''description'' AND $3[1] = ''ASC'' THEN r.description END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''description'' AND $3[1] = ''DESC'' THEN r.description END DESC NULLS LAST';
-
-   -- Get total count of roles
-   count_query := '
-   SELECT COUNT(DISTINCT r.id_role)
-   FROM roles r
-       LEFT JOIN departments d ON r.id_department = d.id_department AND d.deleted_at IS NULL
-       LEFT JOIN training_type_role ttr ON r.id_role = ttr.id_role AND ttr.deleted_at IS NULL
-       LEFT JOIN training_types tt ON ttr.id_training_type = tt.id_training_type AND tt.deleted_at IS NULL
-   WHERE r.deleted_at IS NULL
-   AND (
-           $1 IS NULL OR
-           r.id_role::text = $1 OR
-           d.id_department::text = $1 OR
-           LOWER(r.role_name) LIKE LOWER(''%'' || $1 || ''%'') OR
-           LOWER(d.name) LIKE LOWER(''%'' || $1 || ''%'') OR
-           LOWER(r.description) LIKE LOWER(''%'' || $1 || ''%'') OR
-           LOWER(tt.name) LIKE LOWER(''%'' || $1 || ''%'')
-   )';
-
-   EXECUTE count_query
-   USING global_search_param
-   INTO total;
-
-   final_query := 'SELECT sub.*, ' || total || '::BIGINT as total_count FROM (' || base_query || ') sub';
-
-   RETURN QUERY EXECUTE final_query
-   USING global_search_param, order_by_param, order_direction_param, limit_param, offset_param;
-
+    -- Os tipos de formação só são agregados para a página devolvida
+    RETURN QUERY
+    SELECT
+        r.id_role,
+        r.id_department,
+        r.id_auth_group,
+        r.role_name,
+        r.hex_color,
+        r.description,
+        d.name,
+        COALESCE(
+            (
+                SELECT json_agg(
+                    json_build_object(
+                        'id_training_type', tt.id_training_type,
+                        'name', tt.name,
+                        'description', tt.description,
+                        'hours', tt.hours
+                    )
+                    ORDER BY tt.name, tt.id_training_type
+                )
+                FROM training_type_role ttr
+                INNER JOIN training_types tt ON ttr.id_training_type = tt.id_training_type AND tt.deleted_at IS NULL
+                WHERE ttr.id_role = r.id_role
+                  AND ttr.deleted_at IS NULL
+            ),
+            '[]'::json
+        ),
+        COUNT(*) OVER ()
+    FROM roles r
+    LEFT JOIN departments d ON r.id_department = d.id_department AND d.deleted_at IS NULL
+    WHERE r.deleted_at IS NULL
+      AND (
+          global_search_param IS NULL
+          OR r.id_role = search_id
+          OR d.id_department = search_id
+          OR r.role_name ILIKE search_pattern
+          OR d.name ILIKE search_pattern
+          OR r.description ILIKE search_pattern
+          OR EXISTS (
+              SELECT 1
+              FROM training_type_role ttr
+              INNER JOIN training_types tt ON ttr.id_training_type = tt.id_training_type AND tt.deleted_at IS NULL
+              WHERE ttr.id_role = r.id_role
+                AND ttr.deleted_at IS NULL
+                AND tt.name ILIKE search_pattern
+          )
+      )
+    ORDER BY
+        %s
+    LIMIT page_limit OFFSET page_offset;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(
+            ARRAY['role_name', 'department_name', 'description'],
+            ARRAY['r.role_name', 'd.name', 'r.description'],
+            ARRAY['r.id_role']
+        )
+    );
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$listing$;
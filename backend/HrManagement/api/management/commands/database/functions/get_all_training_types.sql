@@ -1,80 +1,58 @@
+-- Uma página de tipos de formação, com o total de resultados da pesquisa em cada linha.
+-- Uma só consulta, planeada a cada chamada com a pesquisa e a ordenação pedidas (sem pesquisa, o filtro
+-- desaparece do plano). O ORDER BY (cada chave em cada posição, desempatado pelo id) é gerado por
+-- listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_all_training_types(
-   global_search_param VARCHAR DEFAULT NULL,
-   order_by_param TEXT[] DEFAULT ARRAY['name'],
-   order_direction_param TEXT[] DEFAULT ARRAY['ASC'],
-   limit_param INTEGER DEFAULT NULL,
-   offset_param INTEGER DEFAULT NULL
+    global_search_param VARCHAR DEFAULT NULL,
+    order_by_param TEXT[] DEFAULT ARRAY['name'],
+    order_direction_param TEXT[] DEFAULT ARRAY['ASC'],
+    limit_param INTEGER DEFAULT NULL,
+    offset_param INTEGER DEFAULT NULL
 )
 RETURNS TABLE (
-   id_training_type UUID,
-   name VARCHAR,
-   description TEXT,
-   hours INT,
-   total_count BIGINT
-) AS $$
+    id_training_type UUID,
+    name VARCHAR,
+    description TEXT,
+    hours INT,
+    total_count BIGINT
+) AS $body$
 DECLARE
-   base_query TEXT;
-   count_query TEXT;
-   final_query TEXT;
-   total BIGINT;
+    order_keys TEXT[] := listing_order_keys(order_by_param, ARRAY['name', 'description', 'hours'], 'name');
+    order_descs BOOLEAN[] := listing_order_descs(order_by_param, order_direction_param, ARRAY['name', 'description', 'hours']);
+    search_pattern TEXT := listing_search_pattern(global_search_param);
+    search_id UUID := listing_search_uuid(global_search_param);
+    search_number INTEGER := listing_search_integer(global_search_param);
+    -- Só pagina com limit e offset (LIMIT NULL = sem limite)
+    page_limit INTEGER := CASE WHEN offset_param IS NOT NULL THEN limit_param END;
+    page_offset INTEGER := CASE WHEN limit_param IS NOT NULL THEN offset_param END;
 BEGIN
-   -- Base query para selecionar os training types com filtros
-   base_query := '
-   WITH limited_training_types AS (
-       SELECT
-           id_training_type,
-           name,
-           description,
-           hours
-       FROM training_types
-       WHERE deleted_at IS NULL
-       AND (
-           $1 IS NULL OR
-           id_training_type::text = $1 OR
-           LOWER(name) LIKE LOWER(''%'' || $1 || ''%'') OR
-           LOWER(description) LIKE LOWER(''%'' || $1 || ''%'') OR
-           hours::text = $1
-       )
-       ORDER BY
-           CASE WHEN $2[1] = ''name'' AND $3[1] = ''ASC'' THEN name END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''name'' AND $3[1] = ''DESC'' THEN name END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''description'' AND $3[1] = ''ASC'' THEN description END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''description'' AND $3[1] = ''DESC'' THEN description END DESC NULLS LAST,
-           CASE WHEN $2[1] = ''hours'' AND $3[1] = ''ASC'' THEN hours END ASC NULLS LAST,
-           CASE WHEN $2[1] = ''hours'' AND $3[1] = ''DESC'' THEN hours END DESC NULLS LAST';
-
-   IF limit_param IS NOT NULL AND offset_param IS NOT NULL THEN
-       base_query := base_query || '
-       LIMIT $4 OFFSET $5';
-   END IF;
-
-   base_query := base_query || '
-   )
-   SELECT *
-   FROM limited_training_types';
-
-   -- Query para contar o total de training types
-   count_query := '
-   SELECT COUNT(*)
-   FROM training_types
-   WHERE deleted_at IS NULL
-   AND (
-       $1 IS NULL OR
-       id_training_type::text = $1 OR
-       LOWER(name) LIKE LOWER(''%'' || $1 || ''%'') OR
-       LOWER(description) LIKE LOWER(''%'' || $1 || ''%'') OR
-       hours::text = $1
-   )';
-
-   -- Executar a contagem
-   EXECUTE count_query
-   USING global_search_param
-   INTO total;
-
-   -- Combinar a contagem com os resultados paginados
-   final_query := 'SELECT sub.*, ' || total || '::BIGINT as total_count FROM (' || base_query || ') sub';
-
-   RETURN QUERY EXECUTE final_query
-   USING global_search_param, order_by_param, order_direction_param, limit_param, offset_param;
+    RETURN QUERY
+    SELECT
+        tt.id_training_type,
+        tt.name,
+        tt.description,
+        tt.hours,
+        COUNT(*) OVER ()
+    FROM training_types tt
+    WHERE tt.deleted_at IS NULL
+      AND (
+          global_search_param IS NULL
+          OR tt.id_training_type = search_id
+          OR tt.hours = search_number
+          OR tt.name ILIKE search_pattern
+          OR tt.description ILIKE search_pattern
+      )
+    ORDER BY
+        %s
+    LIMIT page_limit OFFSET page_offset;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(ARRAY['name', 'description', 'hours'], ARRAY['tt.name', 'tt.description', 'tt.hours'], ARRAY['tt.id_training_type'])
+    );
 END;
-$$ LANGUAGE plpgsql;
+$listing$;
@@ -1,4 +1,3 @@
-
 DROP FUNCTION IF EXISTS get_contracts(
     employee_id_param UUID,
     global_search_param VARCHAR,
@@ -10,7 +9,19 @@ DROP FUNCTION IF EXISTS get_contracts(
     order_by_param TEXT[],
     order_direction_param TEXT[]
 );
+-- Substituídas pela consulta de get_contracts (os contratos filtrados eram passados num array)
+DROP FUNCTION IF EXISTS contract_listing(employee_id_param UUID);
+DROP FUNCTION IF EXISTS contract_listing(employee_id_param UUID, contract_ids UUID[]);
+DROP FUNCTION IF EXISTS contract_listing_ids(UUID, VARCHAR, UUID, VARCHAR, VARCHAR, VARCHAR, VARCHAR);
 
+-- Contratos (com o histórico salarial e o estado atual) de um funcionário, ou de todos.
+-- Uma só consulta, planeada a cada chamada com os valores pedidos: os filtros NULL desaparecem do plano,
+-- e os contratos de um funcionário ou o contrato pedido são lidos pelo índice contract (id_employee, created_at)
+-- ou pela chave primária. O ORDER BY (cada chave em cada posição, desempatado por id_contract e
+-- id_salary_history para páginas estáveis) é gerado por listing_order_by a partir da lista de chaves no fim do bloco.
+DO $listing$
+BEGIN
+    EXECUTE format($function$
 CREATE OR REPLACE FUNCTION get_contracts(
     employee_id_param UUID,
     global_search_param VARCHAR DEFAULT NULL,
@@ -37,67 +48,39 @@ RETURNS TABLE(
     contract_state_name VARCHAR,
     contract_state_icon VARCHAR,
     contract_state_color VARCHAR
-) AS $$
+) AS $body$
 DECLARE
-    order_by_clause TEXT;
-    sql_query TEXT;
+    order_keys TEXT[] := listing_order_keys(
+        order_by_param,
+        ARRAY['id_contract', 'base_salary', 'extra_hour_rate', 'role_name', 'department_name', 'created_at',
+              'contract_type_name', 'description', 'benefits_eligible', 'overtime_eligible', 'termination_notice_period', 'contract_state_name'],
+        'created_at'
+    );
+    order_descs BOOLEAN[] := listing_order_descs(
+        order_by_param,
+        order_direction_param,
+        ARRAY['id_contract', 'base_salary', 'extra_hour_rate', 'role_name', 'department_name', 'created_at',
+              'contract_type_name', 'description', 'benefits_eligible', 'overtime_eligible', 'termination_notice_period', 'contract_state_name'],
+        TRUE
+    );
+    search_pattern TEXT := listing_search_pattern(global_search_param);
 BEGIN
-    -- Construir a cláusula ORDER BY dinamicamente
-    order_by_clause := '';
-    FOR i IN 1..array_length(order_by_param, 1)
-    LOOP
-        IF order_by_clause <> '' THEN
-            order_by_clause := order_by_clause || ', ';
-        END IF;
-
-        order_by_clause := concat(order_by_clause,
-            CASE
-                WHEN order_by_param[i] = 'id_contract' THEN 'contract.id_contract'
-                WHEN order_by_param[i] = 'base_salary' THEN 'salary_history.base_salary'
-                WHEN order_by_param[i] = 'extra_hour_rate' THEN 'salary_history.extra_hour_rate'
-                WHEN order_by_param[i] = 'role_name' THEN 'roles.role_name'
-                WHEN order_by_param[i] = 'department_name' THEN 'departments.name'
-                WHEN order_by_param[i] = 'created_at' THEN 'contract.created_at'
-                WHEN order_by_param[i] = 'contract_type_name' THEN 'contract_type.contract_type_name'
-                WHEN order_by_param[i] = 'description' THEN 'contract_type.description'
-                WHEN order_by_param[i] = 'benefits_eligible' THEN 'contract_type.benefits_eligible'
-                WHEN order_by_param[i] = 'overtime_eligible' THEN 'contract_type.overtime_eligible'
-                WHEN order_by_param[i] = 'termination_notice_period' THEN 'contract_type.termination_notice_period'
-                WHEN order_by_param[i] = 'contract_state_name' THEN 'contract_state.state'
-                ELSE 'contract.created_at' -- Padrão
-            END
-        );
-
-        order_by_clause := concat(order_by_clause,
-            CASE
-                WHEN order_direction_param[i] = 'ASC' THEN ' ASC'
-                WHEN order_direction_param[i] = 'DESC' THEN ' DESC'
-                ELSE ' DESC' -- DESC DEFAULT
-            END
-        );
-    END LOOP;
-
-    IF order_by_clause = '' THEN
-        order_by_clause := 'contract.created_at DESC'; -- Padrão se nada for fornecido
-    END IF;
-
-    -- Construir a consulta SQL
-    sql_query := '
+    RETURN QUERY
     SELECT
         contract.id_contract,
         salary_history.base_salary,
         salary_history.extra_hour_rate,
         roles.role_name,
-        departments.name AS department_name,
+        departments.name,
         contract.created_at,
         contract_type.contract_type_name,
         contract_type.description,
         contract_type.benefits_eligible,
         contract_type.overtime_eligible,
         contract_type.termination_notice_period,
-        contract_state.state AS contract_state_name,
-        contract_state.icon AS contract_state_icon,
-        contract_state.hex_color AS contract_state_color
+        contract_state.state,
+        contract_state.icon,
+        contract_state.hex_color
     FROM contract
     INNER JOIN contract_type ON contract.id_contract_type = contract_type.id_contract_type
     INNER JOIN roles ON contract.id_role = roles.id_role
@@ -105,24 +88,39 @@ BEGIN
     LEFT JOIN latest_contract_state_materialized_view ON contract.id_contract = latest_contract_state_materialized_view.id_contract
     INNER JOIN contract_state ON latest_contract_state_materialized_view.id_contract_state = contract_state.id_contract_state
     LEFT JOIN salary_history ON contract.id_contract = salary_history.id_contract
-    WHERE $1 IS NULL OR contract.id_employee = $1
-        AND ($2 IS NULL OR (
-            contract.id_contract::text ILIKE ''%'' || $2 || ''%'' OR
-            contract_type.contract_type_name ILIKE ''%'' || $2 || ''%'' OR
-            roles.role_name ILIKE ''%'' || $2 || ''%'' OR
-            departments.name ILIKE ''%'' || $2 || ''%'' OR
-            contract_state.state ILIKE ''%'' || $2 || ''%''
-        ))
-        AND ($3 IS NULL OR contract.id_contract = $3)
-        AND ($4 IS NULL OR roles.role_name ILIKE ''%'' || $4 || ''%'' )
-        AND ($5 IS NULL OR departments.name ILIKE ''%'' || $5 || ''%'' )
-        AND ($6 IS NULL OR contract_type.contract_type_name ILIKE ''%'' || $6 || ''%'' )
-        AND ($7 IS NULL OR contract_state.state ILIKE ''%'' || $7 || ''%'' )
-    ORDER BY ' || order_by_clause;
-
-    RETURN QUERY EXECUTE sql_query USING employee_id_param, global_search_param, id_contract_param, role_name_param, department_name_param, contract_type_name_param, contract_state_name_param;
+    WHERE (employee_id_param IS NULL OR contract.id_employee = employee_id_param)
+      AND (id_contract_param IS NULL OR contract.id_contract = id_contract_param)
+      AND (
+          global_search_param IS NULL OR
+          contract.id_contract::text ILIKE search_pattern OR
+          contract_type.contract_type_name ILIKE search_pattern OR
+          roles.role_name ILIKE search_pattern OR
+          departments.name ILIKE search_pattern OR
+          contract_state.state ILIKE search_pattern
+      )
+      AND (role_name_param IS NULL OR roles.role_name ILIKE listing_search_pattern(role_name_param))
+      AND (department_name_param IS NULL OR departments.name ILIKE listing_search_pattern(department_name_param))
+      AND (contract_type_name_param IS NULL OR contract_type.contract_type_name ILIKE listing_search_pattern(contract_type_name_param))
+      AND (contract_state_name_param IS NULL OR contract_state.state ILIKE listing_search_pattern(contract_state_name_param))
+    ORDER BY
+        %s;
+END;
+$body$ LANGUAGE plpgsql SET plan_cache_mode = force_custom_plan;
+$function$,
+        -- Chaves de ordenação e as suas expressões
+        listing_order_by(
+            ARRAY['id_contract', 'base_salary', 'extra_hour_rate', 'role_name', 'department_name', 'created_at',
+                  'contract_type_name', 'description', 'benefits_eligible', 'overtime_eligible', 'termination_notice_period', 'contract_state_name'],
+            ARRAY['contract.id_contract', 'salary_history.base_salary', 'salary_history.extra_hour_rate', 'roles.role_name',
+                  'departments.name', 'contract.created_at', 'contract_type.contract_type_name', 'contract_type.description',
+                  'contract_type.benefits_eligible', 'contract_type.overtime_eligible', 'contract_type.termination_notice_period',
+                  'contract_state.state'],
+            ARRAY['contract.id_contract', 'salary_history.id_salary_history'],
+            TRUE
+        )
+    );
 END;
-$$ LANGUAGE plpgsql;
+$listing$;
 
 
 
@@ -138,4 +136,4 @@ $$ LANGUAGE plpgsql;
     NULL,                                  -- contract_state_name_param
     ARRAY['base_salary'],                  -- order_by_param
     ARRAY['ASC']                           -- order_direction_param
-); */
\ No newline at end of file
+); */
@@ -0,0 +1,137 @@
+DROP FUNCTION IF EXISTS get_employee_details(param_employee_id UUID);
+
+-- Documento completo do perfil de um funcionário (dados pessoais, localização,
+-- contrato mais recente com salário, tipo, estado, role e departamento,
+-- formações e certificações) numa única consulta.
+-- Devolve NULL se o funcionário não existir.
+-- Os valores NUMERIC são devolvidos como texto, tal como o DRF serializa Decimal.
+CREATE OR REPLACE FUNCTION get_employee_details(param_employee_id UUID)
+RETURNS json AS $$
+BEGIN
+    RETURN (
+    SELECT json_build_object(
+        'id_employee', CAST(e.id_employee AS character varying),
+        'employee_name', au.first_name || ' ' || au.last_name,
+        'phone', e.phone,
+        'photo', e.src,
+        'email', au.email,
+        'birth_date', e.birth_date,
+        'date_joined', au.date_joined,
+        'location', json_build_object(
+            'city', el.city,
+            'country', el.country,
+            'district', el.district,
+            'address', el.address,
+            'zip_code', el.zip_code
+        ),
+        'contract', json_build_object(
+            'id_contract', lc.id_contract,
+            'created_at', lc.created_at,
+            'salary', json_build_object(
+                'id:_salary', ls.id_salary_history,
+                'id_aproved_by', ls.id_employee_aproved_by,
+                'base_salary', ls.base_salary::text,
+                'extra_hour_rate', ls.extra_hour_rate::text,
+                'start_date', ls.start_date
+            ),
+            'contract_type', json_build_object(
+                'id_contract_type', ct.id_contract_type,
+                'contract_type_name', ct.contract_type_name,
+                'description', ct.description
+            ),
+            'contract_state', json_build_object(
+                'id_contract_state_contract', lcs.id_contract_state_contract,
+                'id_contract_state', cs.id_contract_state,
+                'state_name', cs.state,
+                'description', cs.description,
+                'hex_color', cs.hex_color,
+                'icon', cs.icon
+            ),
+            'role', json_build_object(
+                'id_role', r.id_role,
+                'role_name', r.role_name,
+                'hex_color', r.hex_color,
+                'description', r.description
+            ),
+            'department', json_build_object(
+                'id_department', d.id_department,
+                'department_name', d.name,
+                'description', d.description
+            ),
+            'created_at', lc.created_at
+        ),
+        'trainings', COALESCE((
+            SELECT json_agg(json_build_object(
+                'id_training', t.id_training,
+                'start_date', t.start_date,
+                'end_date', t.end_date,
+                'training_type', json_build_object(
+                    'id_training_type', tt.id_training_type,
+                    'training_type_name', tt.name,
+                    'description', tt.description,
+                    'hours', tt.hours
+                )
+            ))
+            FROM trainings t
+            INNER JOIN training_types tt ON t.id_training_type = tt.id_training_type
+            WHERE t.id_employee = e.id_employee
+        ), '[]'::json),
+        'certifications', COALESCE((
+            SELECT json_agg(json_build_object(
+                'id_certification', c.id_certification,
+                'issue_date', c.issue_date,
+                'expiration_date', c.expiration_date,
+                'certificate_type', json_build_object(
+                    'id_certificate_type', cert_type.id_certificate_type,
+                    'certificate_type_name', cert_type.name,
+                    'description', cert_type.description,
+                    'icon', cert_type.icon,
+                    'hex_color', cert_type.hex_color
+                ),
+                'issuing_organization', c.issuing_organization
+            ))
+            FROM certifications c
+            INNER JOIN certificate_types cert_type ON c.id_certificate_type = cert_type.id_certificate_type
+            WHERE c.id_employee = e.id_employee
+        ), '[]'::json)
+    )
+    FROM employees e
+    INNER JOIN auth_user au ON e.id_auth_user = au.id
+    LEFT JOIN employee_location el ON e.id_employee = el.id_employee
+    LEFT JOIN LATERAL (
+        SELECT *
+        FROM latest_contract_materialized_view
+        WHERE latest_contract_materialized_view.id_employee = e.id_employee
+        ORDER BY latest_contract_materialized_view.created_at DESC
+        LIMIT 1
+    ) lc ON TRUE
+    LEFT JOIN contract_type ct ON lc.id_contract_type = ct.id_contract_type
+    LEFT JOIN roles r ON lc.id_role = r.id_role
+    LEFT JOIN departments d ON r.id_department = d.id_department
+    LEFT JOIN LATERAL (
+        SELECT *
+        FROM latest_salary_materialized_view
+        WHERE latest_salary_materialized_view.id_contract = lc.id_contract
+        ORDER BY latest_salary_materialized_view.created_at DESC
+        LIMIT 1
+    ) ls ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT *
+        FROM latest_contract_state_materialized_view
+        WHERE latest_contract_state_materialized_view.id_contract = lc.id_contract
+        ORDER BY latest_contract_state_materialized_view.created_at DESC
+        LIMIT 1
+    ) lcs ON TRUE
+    LEFT JOIN contract_state cs ON lcs.id_contract_state = cs.id_contract_state
+    WHERE
+        e.id_employee = param_employee_id AND
+        e.deleted_at IS NULL
+    LIMIT 1
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+/* -- TESTE
+SELECT get_employee_details('12e1f7b4-a340-4f6e-b93b-6000082f852c'::UUID);
+ */
@@ -0,0 +1,27 @@
+-- Reconstrói por completo as tabelas latest_* a partir das tabelas base.
+-- Usado depois de cargas em massa (seed --bulk), em que os triggers por linha ficam desativados.
+CREATE OR REPLACE FUNCTION rebuild_latest_tables()
+RETURNS VOID AS $$
+BEGIN
+    TRUNCATE latest_contract_materialized_view;
+    INSERT INTO latest_contract_materialized_view
+    SELECT DISTINCT ON (contract.id_employee) *
+    FROM contract
+    WHERE contract.deleted_at IS NULL
+    ORDER BY contract.id_employee, contract.created_at DESC, contract.id_contract DESC;
+
+    TRUNCATE latest_salary_materialized_view;
+    INSERT INTO latest_salary_materialized_view
+    SELECT DISTINCT ON (salary_history.id_contract) *
+    FROM salary_history
+    WHERE salary_history.deleted_at IS NULL
+    ORDER BY salary_history.id_contract, salary_history.created_at DESC, salary_history.id_salary_history DESC;
+
+    TRUNCATE latest_contract_state_materialized_view;
+    INSERT INTO latest_contract_state_materialized_view
+    SELECT DISTINCT ON (contract_state_contract.id_contract) *
+    FROM contract_state_contract
+    WHERE contract_state_contract.deleted_at IS NULL
+    ORDER BY contract_state_contract.id_contract, contract_state_contract.created_at DESC, contract_state_contract.id_contract_state_contract DESC;
+END;
+$$ LANGUAGE plpgsql;
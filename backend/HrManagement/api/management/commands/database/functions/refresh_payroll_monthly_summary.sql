@@ -0,0 +1,277 @@
+-- Manutenção de payroll_monthly_summary.
+-- payments.amount já é o líquido do pagamento (os bónus e deduções associados estão incluídos):
+-- net_payment_amount, min_payment e max_payment somam amount; total_base_salary soma amount - bónus + deduções.
+-- O departamento de um pagamento é o do contrato em vigor na data do pagamento
+-- (o mais recente criado até essa data; sem nenhum, o mais recente).
+
+-- Substituída pela aplicação incremental (apply_payroll_summary_payments)
+DROP FUNCTION IF EXISTS refresh_payroll_monthly_summary(DATE[]);
+
+
+-- Aplica ao resumo as alterações dos pagamentos indicados: o contributo guardado em
+-- payroll_summary_payment é subtraído e o atual somado, por mês e departamento.
+-- O custo depende do número de pagamentos afetados, não do número de pagamentos do mês.
+CREATE OR REPLACE FUNCTION apply_payroll_summary_payments(payment_ids UUID[])
+RETURNS VOID AS $$
+DECLARE
+    employee_id UUID;
+    group_months DATE[];
+    group_keys UUID[];
+BEGIN
+    -- Serializa só as alterações do mesmo funcionário (a contagem de funcionários distintos depende
+    -- dos outros pagamentos dele); por ordem, para não haver deadlocks
+    FOR employee_id IN
+        SELECT id_employee FROM payments WHERE id_payment = ANY(payment_ids)
+        UNION
+        SELECT id_employee FROM payroll_summary_payment WHERE id_payment = ANY(payment_ids)
+        ORDER BY 1
+    LOOP
+        PERFORM pg_advisory_xact_lock(hashtext('payroll_monthly_summary'), hashtext(employee_id::text));
+    END LOOP;
+
+    WITH old_facts AS (
+        SELECT f.id_payment, f.id_employee, f.month, f.department_key, f.amount, f.bonus, f.deduction, f.base
+        FROM payroll_summary_payment f
+        WHERE f.id_payment = ANY(payment_ids)
+    ),
+    new_facts AS (
+        SELECT
+            p.id_payment,
+            p.id_employee,
+            DATE_TRUNC('month', p.payment_date)::date AS month,
+            department.id_department,
+            COALESCE(department.id_department, '00000000-0000-0000-0000-000000000000') AS department_key,
+            p.amount,
+            COALESCE(b.amount, 0) AS bonus,
+            COALESCE(d.amount, 0) AS deduction,
+            p.amount - COALESCE(b.amount, 0) + COALESCE(d.amount, 0) AS base
+        FROM payments p
+        CROSS JOIN LATERAL (
+            SELECT SUM(amount) AS amount FROM bonuses WHERE id_payment = p.id_payment AND deleted_at IS NULL
+        ) b
+        CROSS JOIN LATERAL (
+            SELECT SUM(amount) AS amount FROM deductions WHERE id_payment = p.id_payment AND deleted_at IS NULL
+        ) d
+        LEFT JOIN LATERAL (
+            SELECT r.id_department
+            FROM contract c
+            INNER JOIN roles r ON r.id_role = c.id_role
+            WHERE c.id_employee = p.id_employee
+              AND c.deleted_at IS NULL
+            ORDER BY (c.created_at::date <= p.payment_date) DESC, c.created_at DESC, c.id_contract DESC
+            LIMIT 1
+        ) department ON TRUE
+        WHERE p.id_payment = ANY(payment_ids)
+          AND p.deleted_at IS NULL
+    ),
+    saved AS (
+        INSERT INTO payroll_summary_payment (id_payment, id_employee, month, id_department, amount, bonus, deduction)
+        SELECT id_payment, id_employee, month, id_department, amount, bonus, deduction
+        FROM new_facts
+        ON CONFLICT (id_payment) DO UPDATE SET
+            id_employee = EXCLUDED.id_employee,
+            month = EXCLUDED.month,
+            id_department = EXCLUDED.id_department,
+            amount = EXCLUDED.amount,
+            bonus = EXCLUDED.bonus,
+            deduction = EXCLUDED.deduction
+    ),
+    removed AS (
+        DELETE FROM payroll_summary_payment f
+        WHERE f.id_payment = ANY(payment_ids)
+          AND NOT EXISTS (SELECT 1 FROM new_facts n WHERE n.id_payment = f.id_payment)
+    ),
+    changes AS (
+        SELECT 1 AS sign, id_employee, month, department_key, amount, bonus, deduction, base FROM new_facts
+        UNION ALL
+        SELECT -1, id_employee, month, department_key, amount, bonus, deduction, base FROM old_facts
+    ),
+    -- Um funcionário entra na contagem quando passa de 0 para 1 pagamento no mês e departamento, e sai no inverso
+    -- (a contagem anterior lê payroll_summary_payment antes das alterações deste statement)
+    employee_changes AS (
+        SELECT c.month, c.department_key, before.payments AS before, before.payments + SUM(c.sign) AS after
+        FROM changes c
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS payments
+            FROM payroll_summary_payment f
+            WHERE f.id_employee = c.id_employee AND f.month = c.month AND f.department_key = c.department_key
+        ) before
+        GROUP BY c.month, c.department_key, c.id_employee, before.payments
+    ),
+    -- O mesmo no mês inteiro, em todos os departamentos (payroll_monthly_employees)
+    month_employee_changes AS (
+        SELECT c.month, before.payments AS before, before.payments + SUM(c.sign) AS after
+        FROM changes c
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS payments
+            FROM payroll_summary_payment f
+            WHERE f.id_employee = c.id_employee AND f.month = c.month
+        ) before
+        GROUP BY c.month, c.id_employee, before.payments
+    ),
+    month_employees AS (
+        INSERT INTO payroll_monthly_employees (month, total_employees_paid)
+        SELECT month, SUM((after > 0)::int - (before > 0)::int)
+        FROM month_employee_changes
+        GROUP BY month
+        ORDER BY month
+        ON CONFLICT (month) DO UPDATE SET
+            total_employees_paid = payroll_monthly_employees.total_employees_paid + EXCLUDED.total_employees_paid
+    ),
+    deltas AS (
+        SELECT
+            c.month,
+            c.department_key,
+            SUM(c.sign) AS total_payments,
+            SUM(c.sign * c.base) AS total_base_salary,
+            SUM(c.sign * c.bonus) AS total_bonus_amount,
+            SUM(c.sign * c.deduction) AS total_deduction_amount,
+            SUM(c.sign * c.amount) AS net_payment_amount,
+            SUM(c.sign) FILTER (WHERE c.bonus > 0) AS employees_with_bonus,
+            SUM(c.sign) FILTER (WHERE c.deduction > 0) AS employees_with_deduction
+        FROM changes c
+        GROUP BY c.month, c.department_key
+    ),
+    upserted AS (
+        INSERT INTO payroll_monthly_summary (
+            month, id_department, department_name,
+            total_payments, total_employees_paid,
+            total_base_salary, total_bonus_amount, total_deduction_amount, net_payment_amount,
+            employees_with_bonus, employees_with_deduction
+        )
+        SELECT
+            dl.month,
+            dep.id_department,
+            dep.name,
+            dl.total_payments,
+            COALESCE(ec.employees, 0),
+            dl.total_base_salary,
+            dl.total_bonus_amount,
+            dl.total_deduction_amount,
+            dl.net_payment_amount,
+            COALESCE(dl.employees_with_bonus, 0),
+            COALESCE(dl.employees_with_deduction, 0)
+        FROM deltas dl
+        LEFT JOIN departments dep ON dep.id_department = dl.department_key
+        LEFT JOIN (
+            SELECT month, department_key, SUM((after > 0)::int - (before > 0)::int) AS employees
+            FROM employee_changes
+            GROUP BY month, department_key
+        ) ec ON ec.month = dl.month AND ec.department_key = dl.department_key
+        -- Por ordem, para não haver deadlocks entre statements que atualizam os mesmos grupos
+        ORDER BY dl.month, dl.department_key
+        ON CONFLICT (month, department_key) DO UPDATE SET
+            department_name = COALESCE(EXCLUDED.department_name, payroll_monthly_summary.department_name),
+            total_payments = payroll_monthly_summary.total_payments + EXCLUDED.total_payments,
+            total_employees_paid = payroll_monthly_summary.total_employees_paid + EXCLUDED.total_employees_paid,
+            total_base_salary = payroll_monthly_summary.total_base_salary + EXCLUDED.total_base_salary,
+            total_bonus_amount = payroll_monthly_summary.total_bonus_amount + EXCLUDED.total_bonus_amount,
+            total_deduction_amount = payroll_monthly_summary.total_deduction_amount + EXCLUDED.total_deduction_amount,
+            net_payment_amount = payroll_monthly_summary.net_payment_amount + EXCLUDED.net_payment_amount,
+            employees_with_bonus = payroll_monthly_summary.employees_with_bonus + EXCLUDED.employees_with_bonus,
+            employees_with_deduction = payroll_monthly_summary.employees_with_deduction + EXCLUDED.employees_with_deduction,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING month, department_key
+    )
+    SELECT array_agg(month), array_agg(department_key)
+    INTO group_months, group_keys
+    FROM upserted;
+
+    IF group_months IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- Grupos que ficaram sem pagamentos
+    DELETE FROM payroll_monthly_summary s
+    USING unnest(group_months, group_keys) AS g(month, department_key)
+    WHERE s.month = g.month AND s.department_key = g.department_key AND s.total_payments <= 0;
+
+    DELETE FROM payroll_monthly_employees
+    WHERE month = ANY(group_months) AND total_employees_paid <= 0;
+
+    -- Mínimo e máximo não se subtraem: são lidos de novo nas extremidades do índice de cada grupo
+    UPDATE payroll_monthly_summary s
+    SET min_payment = (
+            SELECT MIN(f.amount) FROM payroll_summary_payment f
+            WHERE f.month = s.month AND f.department_key = s.department_key
+        ),
+        max_payment = (
+            SELECT MAX(f.amount) FROM payroll_summary_payment f
+            WHERE f.month = s.month AND f.department_key = s.department_key
+        )
+    FROM unnest(group_months, group_keys) AS g(month, department_key)
+    WHERE s.month = g.month AND s.department_key = g.department_key;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Reconstrói payroll_summary_payment e payroll_monthly_summary por completo (ex: depois de seed --bulk)
+CREATE OR REPLACE FUNCTION rebuild_payroll_monthly_summary()
+RETURNS VOID AS $$
+BEGIN
+    TRUNCATE payroll_summary_payment, payroll_monthly_summary, payroll_monthly_employees;
+
+    INSERT INTO payroll_summary_payment (id_payment, id_employee, month, id_department, amount, bonus, deduction)
+    SELECT
+        p.id_payment,
+        p.id_employee,
+        DATE_TRUNC('month', p.payment_date)::date,
+        department.id_department,
+        p.amount,
+        COALESCE(b.amount, 0),
+        COALESCE(d.amount, 0)
+    FROM payments p
+    LEFT JOIN (
+        SELECT id_payment, SUM(amount) AS amount
+        FROM bonuses
+        WHERE deleted_at IS NULL
+        GROUP BY id_payment
+    ) b ON b.id_payment = p.id_payment
+    LEFT JOIN (
+        SELECT id_payment, SUM(amount) AS amount
+        FROM deductions
+        WHERE deleted_at IS NULL
+        GROUP BY id_payment
+    ) d ON d.id_payment = p.id_payment
+    LEFT JOIN LATERAL (
+        SELECT r.id_department
+        FROM contract c
+        INNER JOIN roles r ON r.id_role = c.id_role
+        WHERE c.id_employee = p.id_employee
+          AND c.deleted_at IS NULL
+        ORDER BY (c.created_at::date <= p.payment_date) DESC, c.created_at DESC, c.id_contract DESC
+        LIMIT 1
+    ) department ON TRUE
+    WHERE p.deleted_at IS NULL;
+
+    INSERT INTO payroll_monthly_summary (
+        month, id_department, department_name,
+        total_payments, total_employees_paid,
+        total_base_salary, total_bonus_amount, total_deduction_amount, net_payment_amount,
+        min_payment, max_payment,
+        employees_with_bonus, employees_with_deduction
+    )
+    SELECT
+        f.month,
+        f.id_department,
+        dep.name,
+        COUNT(*),
+        COUNT(DISTINCT f.id_employee),
+        SUM(f.base),
+        SUM(f.bonus),
+        SUM(f.deduction),
+        SUM(f.amount),
+        MIN(f.amount),
+        MAX(f.amount),
+        COUNT(*) FILTER (WHERE f.bonus > 0),
+        COUNT(*) FILTER (WHERE f.deduction > 0)
+    FROM payroll_summary_payment f
+    LEFT JOIN departments dep ON dep.id_department = f.id_department
+    GROUP BY f.month, f.id_department, dep.name;
+
+    INSERT INTO payroll_monthly_employees (month, total_employees_paid)
+    SELECT month, COUNT(DISTINCT id_employee)
+    FROM payroll_summary_payment
+    GROUP BY month;
+END;
+$$ LANGUAGE plpgsql;
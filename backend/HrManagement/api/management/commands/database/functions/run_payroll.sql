@@ -0,0 +1,165 @@
+-- Processamento salarial de um mês, com instruções set-based em vez de um INSERT por pagamento
+-- (cada um com os triggers de triggers/update_payment_details.sql).
+-- Paga os funcionários cujo contrato mais recente está num dos estados de contract_states_param,
+-- com salário e ainda sem pagamento no mês: salário base + horas extra + bônus - deduções.
+-- Os bônus e deduções do mês ainda sem pagamento ficam associados ao pagamento criado.
+-- extra_amounts_param: valor das horas extra do mês por funcionário, [{"id_employee": "...", "extra_amount": 125.50}, ...],
+-- calculado a partir da coleção extrahours (MongoDB) e de extra_hour_rate (api/utils/payroll.py, iter_extra_hours_pay).
+-- Devolve a linha de payroll_runs, com as contagens e a duração.
+
+-- O parâmetro das horas extra passou de horas para valores: CREATE OR REPLACE não pode mudar o nome
+DROP FUNCTION IF EXISTS run_payroll(DATE, UUID, UUID, JSONB, DATE, TEXT[]);
+
+CREATE OR REPLACE FUNCTION run_payroll(
+    month_param DATE,
+    id_payment_method_param UUID,
+    id_employee_supervisor_param UUID,
+    extra_amounts_param JSONB DEFAULT '[]'::jsonb,
+    payment_date_param DATE DEFAULT NULL,
+    contract_states_param TEXT[] DEFAULT ARRAY['Active', 'Renewed']
+)
+RETURNS payroll_runs AS $$
+DECLARE
+    period_start DATE := DATE_TRUNC('month', month_param)::date;
+    period_end DATE := (DATE_TRUNC('month', month_param) + INTERVAL '1 month' - INTERVAL '1 day')::date;
+    started TIMESTAMP := clock_timestamp()::timestamp;
+    run payroll_runs;
+BEGIN
+    -- Os pagamentos contam no mês da sua data: fora do mês, o funcionário voltaria a ser pago
+    IF payment_date_param IS NOT NULL AND payment_date_param NOT BETWEEN period_start AND period_end THEN
+        RAISE EXCEPTION 'payment_date % is outside the month % (% to %)',
+            payment_date_param, to_char(period_start, 'YYYY-MM'), period_start, period_end
+            USING ERRCODE = 'check_violation';
+    END IF;
+
+    -- Um processamento de cada vez: dois em paralelo pagariam os mesmos funcionários
+    PERFORM pg_advisory_xact_lock(hashtext('run_payroll'));
+
+    -- Os pagamentos criados aqui já trazem os totais: os triggers por linha de payments não correm
+    PERFORM set_config('hr.payroll_run', 'on', true);
+
+    INSERT INTO payroll_runs (month, payment_date, id_payment_method, id_employee_supervisor, started_at)
+    VALUES (period_start, COALESCE(payment_date_param, period_end), id_payment_method_param, id_employee_supervisor_param, started)
+    RETURNING * INTO run;
+
+    WITH extra_amounts AS (
+        SELECT ea.id_employee, SUM(ea.extra_amount) AS amount
+        FROM jsonb_to_recordset(extra_amounts_param) AS ea(id_employee UUID, extra_amount NUMERIC)
+        GROUP BY ea.id_employee
+    ),
+    eligible AS (
+        SELECT e.id_employee, ls.base_salary
+        FROM employees e
+        INNER JOIN latest_contract_materialized_view lc ON lc.id_employee = e.id_employee
+        INNER JOIN latest_contract_state_materialized_view lcs ON lcs.id_contract = lc.id_contract
+        INNER JOIN contract_state cs ON cs.id_contract_state = lcs.id_contract_state
+        INNER JOIN latest_salary_materialized_view ls ON ls.id_contract = lc.id_contract
+        WHERE e.deleted_at IS NULL
+          AND cs.state = ANY(contract_states_param)
+          AND NOT EXISTS (
+              SELECT 1
+              FROM payments p
+              WHERE p.id_employee = e.id_employee
+                AND p.payment_date BETWEEN period_start AND period_end
+                AND p.deleted_at IS NULL
+          )
+          -- Nem pago por um processamento anterior do mesmo mês (mesmo com payment_date fora do mês)
+          AND NOT EXISTS (
+              SELECT 1
+              FROM payroll_runs pr
+              INNER JOIN payments p ON p.id_payroll_run = pr.id_payroll_run
+              WHERE pr.month = period_start
+                AND pr.deleted_at IS NULL
+                AND p.id_employee = e.id_employee
+                AND p.deleted_at IS NULL
+          )
+    ),
+    month_bonuses AS (
+        SELECT b.id_employee, SUM(b.amount) AS amount
+        FROM bonuses b
+        WHERE b.bonus_date BETWEEN period_start AND period_end
+          AND b.id_payment IS NULL
+          AND b.deleted_at IS NULL
+        GROUP BY b.id_employee
+    ),
+    month_deductions AS (
+        SELECT ar.id_employee, SUM(d.amount) AS amount
+        FROM deductions d
+        INNER JOIN absence_reason ar ON ar.id_absence_reason = d.id_absence_reason
+        WHERE d.deduction_date BETWEEN period_start AND period_end
+          AND d.id_payment IS NULL
+          AND d.deleted_at IS NULL
+        GROUP BY ar.id_employee
+    ),
+    lines AS (
+        SELECT
+            el.id_employee,
+            COALESCE(el.base_salary, 0) AS base_salary,
+            ROUND(COALESCE(ea.amount, 0), 2) AS extra_amount,
+            COALESCE(mb.amount, 0) AS bonus_amount,
+            COALESCE(md.amount, 0) AS deduction_amount
+        FROM eligible el
+        LEFT JOIN extra_amounts ea ON ea.id_employee = el.id_employee
+        LEFT JOIN month_bonuses mb ON mb.id_employee = el.id_employee
+        LEFT JOIN month_deductions md ON md.id_employee = el.id_employee
+    ),
+    inserted AS (
+        INSERT INTO payments (
+            id_employee, id_employee_supervisor, id_payment_method, id_payroll_run, amount, payment_date,
+            extra_amount, deduction_amount, bonus_amount, payment_note
+        )
+        SELECT
+            l.id_employee, id_employee_supervisor_param, id_payment_method_param, run.id_payroll_run,
+            l.base_salary + l.extra_amount + l.bonus_amount - l.deduction_amount, run.payment_date,
+            l.extra_amount, l.deduction_amount, l.bonus_amount,
+            'Processamento salarial ' || to_char(period_start, 'YYYY-MM')
+        FROM lines l
+        RETURNING payments.id_payment, payments.id_employee, payments.amount
+    ),
+    -- As atualizações veem a mesma snapshot que os somatórios: ficam associados exatamente os bônus/deduções somados
+    linked_bonuses AS (
+        UPDATE bonuses b
+        SET id_payment = i.id_payment, updated_at = CURRENT_TIMESTAMP
+        FROM inserted i
+        WHERE b.id_employee = i.id_employee
+          AND b.bonus_date BETWEEN period_start AND period_end
+          AND b.id_payment IS NULL
+          AND b.deleted_at IS NULL
+        RETURNING b.id_bonus
+    ),
+    linked_deductions AS (
+        UPDATE deductions d
+        SET id_payment = i.id_payment, updated_at = CURRENT_TIMESTAMP
+        FROM absence_reason ar, inserted i
+        WHERE ar.id_absence_reason = d.id_absence_reason
+          AND ar.id_employee = i.id_employee
+          AND d.deduction_date BETWEEN period_start AND period_end
+          AND d.id_payment IS NULL
+          AND d.deleted_at IS NULL
+        RETURNING d.id_deduction
+    )
+    SELECT
+        (SELECT COUNT(*) FROM inserted),
+        (SELECT COUNT(*) FROM linked_bonuses),
+        (SELECT COUNT(*) FROM linked_deductions),
+        (SELECT COALESCE(SUM(amount), 0) FROM inserted)
+    INTO run.payments_created, run.bonuses_linked, run.deductions_linked, run.total_amount;
+
+    PERFORM set_config('hr.payroll_run', 'off', true);
+
+    run.finished_at := clock_timestamp()::timestamp;
+    run.duration_ms := ROUND((EXTRACT(EPOCH FROM run.finished_at - started) * 1000)::numeric, 3);
+
+    UPDATE payroll_runs
+    SET payments_created = run.payments_created,
+        bonuses_linked = run.bonuses_linked,
+        deductions_linked = run.deductions_linked,
+        total_amount = run.total_amount,
+        duration_ms = run.duration_ms,
+        finished_at = run.finished_at,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE payroll_runs.id_payroll_run = run.id_payroll_run;
+
+    RETURN run;
+END;
+$$ LANGUAGE plpgsql;
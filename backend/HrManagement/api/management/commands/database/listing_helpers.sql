@@ -0,0 +1,143 @@
+-- Funções auxiliares das listagens (functions/get_all_* e get_contracts).
+-- Normalizam a ordenação e a pesquisa pedidas antes da consulta, para que cada listagem seja uma
+-- só consulta estática. As listagens correm com plan_cache_mode = force_custom_plan: cada chamada é
+-- planeada com os valores pedidos, por isso os filtros NULL e as chaves de ordenação não pedidas
+-- desaparecem do plano e o que resta usa os índices (ex: o índice da chave de ordenação com LIMIT).
+-- Fica em database/ (e não em functions/) porque é executado antes: as listagens são geradas com
+-- listing_order_by quando são criadas.
+
+-- TRUE para DESC, FALSE para ASC; outro valor (ou nenhum) usa default_desc
+CREATE OR REPLACE FUNCTION listing_sort_desc(
+    order_direction_param TEXT[],
+    default_desc BOOLEAN DEFAULT FALSE
+)
+RETURNS BOOLEAN AS $$
+    SELECT CASE upper((SELECT direction FROM unnest(order_direction_param) AS direction LIMIT 1))
+        WHEN 'DESC' THEN TRUE
+        WHEN 'ASC' THEN FALSE
+        ELSE default_desc
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Chaves de ordenação pedidas que pertencem a allowed_keys, pela ordem do pedido e sem repetições;
+-- ARRAY[default_key] se nenhuma for permitida
+CREATE OR REPLACE FUNCTION listing_order_keys(
+    order_by_param TEXT[],
+    allowed_keys TEXT[],
+    default_key TEXT
+)
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(
+        (
+            SELECT array_agg(requested.key ORDER BY requested.position)
+            FROM (
+                SELECT key, MIN(position) AS position
+                FROM unnest(order_by_param) WITH ORDINALITY AS requested(key, position)
+                WHERE key = ANY(allowed_keys)
+                GROUP BY key
+            ) AS requested
+        ),
+        ARRAY[default_key]
+    );
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Direção (TRUE para DESC) de cada chave de listing_order_keys: a pedida na mesma posição da chave,
+-- senão default_desc. Sem chaves permitidas, a primeira direção pedida (a da chave por omissão).
+CREATE OR REPLACE FUNCTION listing_order_descs(
+    order_by_param TEXT[],
+    order_direction_param TEXT[],
+    allowed_keys TEXT[],
+    default_desc BOOLEAN DEFAULT FALSE
+)
+RETURNS BOOLEAN[] AS $$
+    SELECT COALESCE(
+        (
+            SELECT array_agg(listing_sort_desc(ARRAY[direction.value], default_desc) ORDER BY requested.position)
+            FROM (
+                SELECT key, MIN(position) AS position
+                FROM unnest(order_by_param) WITH ORDINALITY AS requested(key, position)
+                WHERE key = ANY(allowed_keys)
+                GROUP BY key
+            ) AS requested
+            LEFT JOIN unnest(order_direction_param) WITH ORDINALITY AS direction(value, position)
+                ON direction.position = requested.position
+        ),
+        ARRAY[listing_sort_desc(order_direction_param, default_desc)]
+    );
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Texto do ORDER BY de uma listagem, usado ao criar a função da listagem (DO ... EXECUTE format).
+-- Para cada posição p e cada chave k, um termo por expressão de k e direção:
+--   CASE WHEN order_keys[p] = 'k' AND NOT order_descs[p] THEN expressão END ASC NULLS LAST
+-- (e o mesmo com DESC), seguidos dos desempates na direção da primeira chave. order_keys e
+-- order_descs são variáveis da listagem (listing_order_keys / listing_order_descs). Com o plano
+-- feito para os valores pedidos, só ficam os termos das chaves pedidas.
+-- Uma chave pode repetir-se em keys para ordenar por várias expressões (ex: chave é NULL, chave).
+CREATE OR REPLACE FUNCTION listing_order_by(
+    keys TEXT[],
+    expressions TEXT[],
+    tiebreakers TEXT[],
+    nulls_first_desc BOOLEAN DEFAULT FALSE,  -- DESC NULLS FIRST (a ordem por omissão do PostgreSQL)
+    positions INTEGER DEFAULT NULL           -- número de chaves aceites (NULL: todas as chaves)
+)
+RETURNS TEXT AS $$
+    WITH sort_key AS (
+        SELECT key, expression, ordinal, MIN(ordinal) OVER (PARTITION BY key) AS key_ordinal
+        FROM unnest(keys, expressions) WITH ORDINALITY AS sort_key(key, expression, ordinal)
+    )
+    SELECT string_agg(term, E',\n        ' ORDER BY part, position, key_ordinal, descending, ordinal)
+    FROM (
+        SELECT 1 AS part, position, sort_key.key_ordinal, direction.descending, sort_key.ordinal,
+               format(
+                   'CASE WHEN order_keys[%1$s] = %2$L AND %3$sorder_descs[%1$s] THEN %4$s END %5$s',
+                   position,
+                   sort_key.key,
+                   CASE WHEN direction.descending THEN '' ELSE 'NOT ' END,
+                   sort_key.expression,
+                   CASE
+                       WHEN NOT direction.descending THEN 'ASC NULLS LAST'
+                       WHEN nulls_first_desc THEN 'DESC NULLS FIRST'
+                       ELSE 'DESC NULLS LAST'
+                   END
+               ) AS term
+        FROM generate_series(1, COALESCE(positions, (SELECT COUNT(DISTINCT key) FROM sort_key)::INTEGER)) AS position
+        CROSS JOIN sort_key
+        CROSS JOIN (VALUES (FALSE), (TRUE)) AS direction(descending)
+        UNION ALL
+        SELECT 2, NULL, NULL, direction.descending, tiebreaker.ordinal,
+               format(
+                   'CASE WHEN %sorder_descs[1] THEN %s END %s',
+                   CASE WHEN direction.descending THEN '' ELSE 'NOT ' END,
+                   tiebreaker.expression,
+                   CASE WHEN direction.descending THEN 'DESC' ELSE 'ASC' END
+               )
+        FROM unnest(tiebreakers) WITH ORDINALITY AS tiebreaker(expression, ordinal)
+        CROSS JOIN (VALUES (FALSE), (TRUE)) AS direction(descending)
+    ) AS terms;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Padrão ILIKE de uma pesquisa por substring (NULL sem pesquisa)
+CREATE OR REPLACE FUNCTION listing_search_pattern(search_param TEXT)
+RETURNS TEXT AS $$
+    SELECT '%' || search_param || '%';
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Substituídas por listing_order_keys e listing_order_by (só a primeira chave era usada nas consultas
+-- estáticas; o ORDER BY de várias chaves era montado com EXECUTE)
+DROP FUNCTION IF EXISTS listing_sort_key(TEXT[], TEXT[], TEXT);
+DROP FUNCTION IF EXISTS listing_order_clause(TEXT[], TEXT[], TEXT[], TEXT[], BOOLEAN);
+
+-- A pesquisa como UUID (ou NULL se não for um UUID): compara-se com a coluna sem a converter para texto
+CREATE OR REPLACE FUNCTION listing_search_uuid(search_param TEXT)
+RETURNS UUID AS $$
+    SELECT CASE
+        WHEN search_param ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+        THEN search_param::uuid
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- A pesquisa como inteiro (ou NULL se não for um inteiro)
+CREATE OR REPLACE FUNCTION listing_search_integer(search_param TEXT)
+RETURNS INTEGER AS $$
+    SELECT CASE WHEN search_param ~ '^[0-9]{1,9}$' THEN search_param::integer END;
+$$ LANGUAGE sql IMMUTABLE;
@@ -1,13 +1,25 @@
-DROP MATERIALIZED VIEW IF EXISTS latest_contract_materialized_view;
-CREATE MATERIALIZED VIEW latest_contract_materialized_view AS (
-    SELECT *
-    FROM contract
-    WHERE (contract.id_employee, contract.created_at) IN (
-        SELECT id_employee, MAX(created_at)
-        FROM contract
-        WHERE contract.deleted_at IS NULL
-        GROUP BY contract.id_employee
-    )
+-- Tabela com o contrato mais recente (não apagado) de cada funcionário.
+-- Era uma view materializada atualizada com REFRESH completo a cada INSERT;
+-- agora é mantida linha a linha pelos triggers de triggers/ (só a chave afetada).
+-- O nome foi mantido para que as consultas existentes continuem iguais.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'latest_contract_materialized_view') THEN
+        DROP MATERIALIZED VIEW latest_contract_materialized_view CASCADE;
+    END IF;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS latest_contract_materialized_view (
+    LIKE contract,
+    PRIMARY KEY (id_contract),
+    UNIQUE (id_employee)
 );
 
-CREATE UNIQUE INDEX ON latest_contract_materialized_view (id_contract);
\ No newline at end of file
+-- (Re)constrói o conteúdo a partir de contract
+TRUNCATE latest_contract_materialized_view;
+INSERT INTO latest_contract_materialized_view
+SELECT DISTINCT ON (contract.id_employee) *
+FROM contract
+WHERE contract.deleted_at IS NULL
+ORDER BY contract.id_employee, contract.created_at DESC, contract.id_contract DESC;
@@ -1,13 +1,25 @@
-DROP MATERIALIZED VIEW IF EXISTS latest_contract_state_materialized_view;
-CREATE MATERIALIZED VIEW latest_contract_state_materialized_view AS (
-    SELECT *
-    FROM contract_state_contract
-    WHERE (contract_state_contract.id_contract, contract_state_contract.created_at) IN (
-        SELECT contract_state_contract.id_contract, MAX(created_at)
-        FROM contract_state_contract
-        WHERE contract_state_contract.deleted_at IS NULL
-        GROUP BY contract_state_contract.id_contract
-    )
+-- Tabela com o estado mais recente (não apagado) de cada contrato.
+-- Era uma view materializada atualizada com REFRESH completo a cada INSERT;
+-- agora é mantida linha a linha pelos triggers de triggers/ (só a chave afetada).
+-- O nome foi mantido para que as consultas existentes continuem iguais.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'latest_contract_state_materialized_view') THEN
+        DROP MATERIALIZED VIEW latest_contract_state_materialized_view CASCADE;
+    END IF;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS latest_contract_state_materialized_view (
+    LIKE contract_state_contract,
+    PRIMARY KEY (id_contract_state_contract),
+    UNIQUE (id_contract)
 );
 
-CREATE UNIQUE INDEX ON latest_contract_state_materialized_view (id_contract_state_contract);
\ No newline at end of file
+-- (Re)constrói o conteúdo a partir de contract_state_contract
+TRUNCATE latest_contract_state_materialized_view;
+INSERT INTO latest_contract_state_materialized_view
+SELECT DISTINCT ON (contract_state_contract.id_contract) *
+FROM contract_state_contract
+WHERE contract_state_contract.deleted_at IS NULL
+ORDER BY contract_state_contract.id_contract, contract_state_contract.created_at DESC, contract_state_contract.id_contract_state_contract DESC;
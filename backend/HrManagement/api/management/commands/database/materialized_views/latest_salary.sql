@@ -1,13 +1,25 @@
-DROP MATERIALIZED VIEW IF EXISTS latest_salary_materialized_view;
-CREATE MATERIALIZED VIEW latest_salary_materialized_view AS (
-    SELECT *
-    FROM salary_history
-    WHERE (salary_history.id_contract, salary_history.created_at) IN (
-        SELECT salary_history.id_contract, MAX(created_at)
-        FROM salary_history
-        WHERE salary_history.deleted_at IS NULL
-        GROUP BY salary_history.id_contract
-    )
+-- Tabela com o registo salarial mais recente (não apagado) de cada contrato.
+-- Era uma view materializada atualizada com REFRESH completo a cada INSERT;
+-- agora é mantida linha a linha pelos triggers de triggers/ (só a chave afetada).
+-- O nome foi mantido para que as consultas existentes continuem iguais.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'latest_salary_materialized_view') THEN
+        DROP MATERIALIZED VIEW latest_salary_materialized_view CASCADE;
+    END IF;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS latest_salary_materialized_view (
+    LIKE salary_history,
+    PRIMARY KEY (id_salary_history),
+    UNIQUE (id_contract)
 );
 
-CREATE UNIQUE INDEX ON latest_salary_materialized_view (id_salary_history);
\ No newline at end of file
+-- (Re)constrói o conteúdo a partir de salary_history
+TRUNCATE latest_salary_materialized_view;
+INSERT INTO latest_salary_materialized_view
+SELECT DISTINCT ON (salary_history.id_contract) *
+FROM salary_history
+WHERE salary_history.deleted_at IS NULL
+ORDER BY salary_history.id_contract, salary_history.created_at DESC, salary_history.id_salary_history DESC;
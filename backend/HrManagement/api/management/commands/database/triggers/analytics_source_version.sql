@@ -0,0 +1,60 @@
+-- Invalidação do cache das analytics (api/utils/analytics_cache.py).
+-- Cada escrita numa tabela de origem incrementa a versão dessa tabela em analytics_source_version
+-- (uma vez por statement); os resultados em cache guardados com a versão anterior deixam de ser usados.
+-- Não é uma sequence de propósito (como em permissions_version.sql): nextval ficaria visível antes do commit
+-- e uma leitura feita durante a escrita guardaria os dados antigos com a versão nova. Aqui a versão muda
+-- no commit, ao mesmo tempo que os dados, e a cache lê as versões no mesmo snapshot que a query das
+-- analytics. O lock da linha serializa os commits das escritas concorrentes na mesma tabela.
+
+-- Substituídas pela versão por tabela em analytics_source_version
+DROP SEQUENCE IF EXISTS analytics_version_payments, analytics_version_bonuses, analytics_version_deductions,
+    analytics_version_absence_reason, analytics_version_contract, analytics_version_salary_history,
+    analytics_version_employees, analytics_version_roles, analytics_version_departments, analytics_version_auth_user;
+
+CREATE OR REPLACE FUNCTION bump_analytics_source_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO analytics_source_version (table_name, version)
+    VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = analytics_source_version.version + 1,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+DO $$
+DECLARE
+    source_table TEXT;
+BEGIN
+    FOREACH source_table IN ARRAY ARRAY[
+        'payments', 'bonuses', 'deductions', 'absence_reason', 'contract',
+        'salary_history', 'employees', 'roles', 'departments'
+    ]
+    LOOP
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER %I
+             AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I
+             FOR EACH STATEMENT
+             EXECUTE FUNCTION bump_analytics_source_version()',
+            'trigger_analytics_version_' || source_table,
+            source_table
+        );
+    END LOOP;
+END;
+$$;
+
+-- auth_user: só os nomes entram nas analytics (last_login e afins não invalidam o cache)
+CREATE OR REPLACE TRIGGER trigger_analytics_version_auth_user
+AFTER INSERT OR UPDATE OF first_name, last_name OR DELETE OR TRUNCATE ON auth_user
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_analytics_source_version();
+
+-- Uma linha por tabela desde o início: as escritas só fazem UPDATE
+INSERT INTO analytics_source_version (table_name)
+SELECT unnest(ARRAY[
+    'payments', 'bonuses', 'deductions', 'absence_reason', 'contract',
+    'salary_history', 'employees', 'roles', 'departments', 'auth_user'
+])
+ON CONFLICT (table_name) DO NOTHING;
@@ -0,0 +1,199 @@
+-- (Re)constrói o documento de pesquisa e as colunas da listagem dos funcionários indicados.
+-- Lê as tabelas base (e não as tabelas latest_*), porque estes triggers podem
+-- correr antes dos que mantêm essas tabelas (triggers/refrash_latest_*.sql).
+CREATE OR REPLACE FUNCTION refresh_employee_search(employee_ids UUID[])
+RETURNS VOID AS $$
+BEGIN
+    IF employee_ids IS NULL OR cardinality(employee_ids) = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO employee_search (
+        id_employee, full_name, search_document, groups_document,
+        first_name, id_role, role_name, role_hex_color, id_department, department_name,
+        id_contract_state, state, state_icon, state_hex_color, updated_at
+    )
+    SELECT
+        e.id_employee,
+        au.first_name || ' ' || au.last_name,
+        concat_ws(' ', au.first_name || ' ' || au.last_name, e.id_employee::text, r.role_name, d.name, cs.state),
+        concat_ws(' ',
+            (
+                SELECT string_agg(ag.name, ' ')
+                FROM auth_user_groups aug
+                JOIN auth_group ag ON ag.id = aug.group_id
+                WHERE aug.user_id = au.id
+            ),
+            (
+                SELECT string_agg(tt.name, ' ')
+                FROM trainings t
+                JOIN training_types tt ON tt.id_training_type = t.id_training_type
+                WHERE t.id_employee = e.id_employee
+            )
+        ),
+        au.first_name,
+        r.id_role,
+        r.role_name,
+        r.hex_color,
+        d.id_department,
+        d.name,
+        cs.id_contract_state,
+        cs.state,
+        cs.icon,
+        cs.hex_color,
+        CURRENT_TIMESTAMP
+    FROM employees e
+    INNER JOIN auth_user au ON au.id = e.id_auth_user
+    LEFT JOIN LATERAL (
+        SELECT c.id_contract, c.id_role
+        FROM contract c
+        WHERE c.id_employee = e.id_employee AND c.deleted_at IS NULL
+        ORDER BY c.created_at DESC, c.id_contract DESC
+        LIMIT 1
+    ) lc ON TRUE
+    LEFT JOIN roles r ON r.id_role = lc.id_role
+    LEFT JOIN departments d ON d.id_department = r.id_department
+    LEFT JOIN LATERAL (
+        SELECT csc.id_contract_state
+        FROM contract_state_contract csc
+        WHERE csc.id_contract = lc.id_contract AND csc.deleted_at IS NULL
+        ORDER BY csc.created_at DESC, csc.id_contract_state_contract DESC
+        LIMIT 1
+    ) lcs ON TRUE
+    LEFT JOIN contract_state cs ON cs.id_contract_state = lcs.id_contract_state
+    WHERE e.id_employee = ANY(employee_ids)
+    ON CONFLICT (id_employee) DO UPDATE SET
+        full_name = EXCLUDED.full_name,
+        search_document = EXCLUDED.search_document,
+        groups_document = EXCLUDED.groups_document,
+        first_name = EXCLUDED.first_name,
+        id_role = EXCLUDED.id_role,
+        role_name = EXCLUDED.role_name,
+        role_hex_color = EXCLUDED.role_hex_color,
+        id_department = EXCLUDED.id_department,
+        department_name = EXCLUDED.department_name,
+        id_contract_state = EXCLUDED.id_contract_state,
+        state = EXCLUDED.state,
+        state_icon = EXCLUDED.state_icon,
+        state_hex_color = EXCLUDED.state_hex_color,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Função única para todas as tabelas de origem: resolve os funcionários
+-- afetados pela linha alterada e atualiza apenas esses documentos.
+-- (O PL/pgSQL compila um trigger por tabela, por isso cada ramo só acede
+-- às colunas da própria tabela.)
+CREATE OR REPLACE FUNCTION sync_employee_search()
+RETURNS TRIGGER AS $$
+DECLARE
+    row_data RECORD;
+    employee_ids UUID[];
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := OLD;
+    ELSE
+        row_data := NEW;
+    END IF;
+
+    CASE TG_TABLE_NAME
+        WHEN 'employees', 'contract', 'trainings' THEN
+            employee_ids := ARRAY[row_data.id_employee];
+        WHEN 'auth_user' THEN
+            employee_ids := ARRAY(SELECT id_employee FROM employees WHERE id_auth_user = row_data.id);
+        WHEN 'auth_user_groups' THEN
+            employee_ids := ARRAY(SELECT id_employee FROM employees WHERE id_auth_user = row_data.user_id);
+        WHEN 'auth_group' THEN
+            employee_ids := ARRAY(
+                SELECT e.id_employee
+                FROM employees e
+                JOIN auth_user_groups aug ON aug.user_id = e.id_auth_user
+                WHERE aug.group_id = row_data.id
+            );
+        WHEN 'contract_state_contract' THEN
+            employee_ids := ARRAY(SELECT id_employee FROM contract WHERE id_contract = row_data.id_contract);
+        WHEN 'contract_state' THEN
+            employee_ids := ARRAY(
+                SELECT DISTINCT c.id_employee
+                FROM contract_state_contract csc
+                JOIN contract c ON c.id_contract = csc.id_contract
+                WHERE csc.id_contract_state = row_data.id_contract_state
+            );
+        WHEN 'roles' THEN
+            employee_ids := ARRAY(SELECT DISTINCT id_employee FROM contract WHERE id_role = row_data.id_role);
+        WHEN 'departments' THEN
+            employee_ids := ARRAY(
+                SELECT DISTINCT c.id_employee
+                FROM contract c
+                JOIN roles r ON r.id_role = c.id_role
+                WHERE r.id_department = row_data.id_department
+            );
+        WHEN 'training_types' THEN
+            employee_ids := ARRAY(SELECT DISTINCT id_employee FROM trainings WHERE id_training_type = row_data.id_training_type);
+    END CASE;
+
+    PERFORM refresh_employee_search(employee_ids);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_employees
+AFTER INSERT OR UPDATE ON employees
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_auth_user
+AFTER UPDATE OF first_name, last_name ON auth_user
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_contract
+AFTER INSERT OR UPDATE OR DELETE ON contract
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_contract_state_contract
+AFTER INSERT OR UPDATE OR DELETE ON contract_state_contract
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_contract_state
+AFTER UPDATE OF state, icon, hex_color ON contract_state
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_roles
+AFTER UPDATE OF role_name, hex_color, id_department ON roles
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_departments
+AFTER UPDATE OF name ON departments
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_auth_user_groups
+AFTER INSERT OR UPDATE OR DELETE ON auth_user_groups
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_auth_group
+AFTER UPDATE OF name ON auth_group
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_trainings
+AFTER INSERT OR UPDATE OR DELETE ON trainings
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+CREATE OR REPLACE TRIGGER trigger_employee_search_training_types
+AFTER UPDATE OF name ON training_types
+FOR EACH ROW
+EXECUTE FUNCTION sync_employee_search();
+
+
+-- Preenche os documentos dos funcionários que já existem
+SELECT refresh_employee_search(ARRAY(SELECT id_employee FROM employees));
@@ -0,0 +1,83 @@
+-- Manutenção incremental de payroll_monthly_summary.
+-- Triggers por statement com transition tables: cada statement junta os pagamentos afetados
+-- e aplica ao resumo só a diferença do contributo de cada um (apply_payroll_summary_payments).
+
+CREATE OR REPLACE FUNCTION sync_payroll_monthly_summary()
+RETURNS TRIGGER AS $$
+DECLARE
+    payment_ids UUID[] := '{}';
+BEGIN
+    IF TG_TABLE_NAME = 'payments' THEN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            payment_ids := payment_ids || ARRAY(SELECT id_payment FROM new_rows);
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            payment_ids := payment_ids || ARRAY(SELECT id_payment FROM old_rows);
+        END IF;
+
+    ELSIF TG_TABLE_NAME IN ('bonuses', 'deductions') THEN
+        -- Pagamentos a que os bónus/descontos estão (ou estavam) associados
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            payment_ids := payment_ids || ARRAY(SELECT id_payment FROM new_rows WHERE id_payment IS NOT NULL);
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            payment_ids := payment_ids || ARRAY(SELECT id_payment FROM old_rows WHERE id_payment IS NOT NULL);
+        END IF;
+
+    ELSIF TG_TABLE_NAME = 'contract' THEN
+        -- Um contrato pode mudar o departamento dos pagamentos do funcionário (e só dele)
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            payment_ids := payment_ids || ARRAY(
+                SELECT p.id_payment
+                FROM payments p
+                WHERE p.id_employee IN (SELECT id_employee FROM new_rows)
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            payment_ids := payment_ids || ARRAY(
+                SELECT p.id_payment
+                FROM payments p
+                WHERE p.id_employee IN (SELECT id_employee FROM old_rows)
+            );
+        END IF;
+    END IF;
+
+    IF cardinality(payment_ids) > 0 THEN
+        PERFORM apply_payroll_summary_payments(ARRAY(SELECT DISTINCT unnest(payment_ids)));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Um trigger por evento (as transition tables disponíveis dependem do evento)
+DO $$
+DECLARE
+    source_table TEXT;
+BEGIN
+    FOREACH source_table IN ARRAY ARRAY['payments', 'bonuses', 'deductions', 'contract']
+    LOOP
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER %I AFTER INSERT ON %I
+             REFERENCING NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION sync_payroll_monthly_summary()',
+            'trigger_payroll_summary_' || source_table || '_insert', source_table
+        );
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER %I AFTER UPDATE ON %I
+             REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION sync_payroll_monthly_summary()',
+            'trigger_payroll_summary_' || source_table || '_update', source_table
+        );
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER %I AFTER DELETE ON %I
+             REFERENCING OLD TABLE AS old_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION sync_payroll_monthly_summary()',
+            'trigger_payroll_summary_' || source_table || '_delete', source_table
+        );
+    END LOOP;
+END;
+$$;
+
+-- Preenche as tabelas com os pagamentos já existentes
+SELECT rebuild_payroll_monthly_summary();
@@ -0,0 +1,45 @@
+-- Invalidação das permissões em cache (api/utils/permissions.py).
+-- Cada escrita que muda as permissões de um utilizador incrementa a versão (uma vez por statement).
+-- A versão é lida da base de dados em cada pedido: muda para todos os workers no commit, ao mesmo tempo
+-- que as permissões, e as entradas em cache da versão anterior deixam de ser usadas.
+-- Não é uma sequence de propósito: nextval ficaria visível antes do commit e um worker poderia guardar
+-- as permissões antigas com a versão nova. O lock da linha só serializa escritas de permissões, que são raras.
+
+CREATE OR REPLACE FUNCTION bump_permissions_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO permissions_version (id, version)
+    VALUES (TRUE, 1)
+    ON CONFLICT (id) DO UPDATE
+    SET version = permissions_version.version + 1,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+DO $$
+DECLARE
+    source_table TEXT;
+BEGIN
+    FOREACH source_table IN ARRAY ARRAY[
+        'auth_group_permissions', 'auth_user_groups', 'auth_user_user_permissions', 'auth_group', 'auth_permission'
+    ]
+    LOOP
+        EXECUTE format(
+            'CREATE OR REPLACE TRIGGER %I
+             AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I
+             FOR EACH STATEMENT
+             EXECUTE FUNCTION bump_permissions_version()',
+            'trigger_permissions_version_' || source_table,
+            source_table
+        );
+    END LOOP;
+END;
+$$;
+
+-- auth_user: só o estado e o superuser mudam as permissões (last_login e afins não invalidam o cache)
+CREATE OR REPLACE TRIGGER trigger_permissions_version_auth_user
+AFTER UPDATE OF is_active, is_superuser OR DELETE OR TRUNCATE ON auth_user
+FOR EACH STATEMENT
+EXECUTE FUNCTION bump_permissions_version();
@@ -1,13 +1,58 @@
-CREATE OR REPLACE FUNCTION refresh_latest_contract_state() 
+-- Recalcula a linha mais recente de um só contrato em latest_contract_state_materialized_view
+CREATE OR REPLACE FUNCTION refresh_latest_contract_state_of(key_value UUID)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO latest_contract_state_materialized_view
+    SELECT *
+    FROM contract_state_contract
+    WHERE contract_state_contract.id_contract = key_value AND contract_state_contract.deleted_at IS NULL
+    ORDER BY contract_state_contract.created_at DESC, contract_state_contract.id_contract_state_contract DESC
+    LIMIT 1
+    ON CONFLICT (id_contract) DO UPDATE SET
+        id_contract_state_contract = EXCLUDED.id_contract_state_contract,
+        id_contract_state = EXCLUDED.id_contract_state,
+        created_at = EXCLUDED.created_at,
+        updated_at = EXCLUDED.updated_at,
+        deleted_at = EXCLUDED.deleted_at;
+
+    -- Já não há nenhuma linha válida para este contrato
+    IF NOT FOUND THEN
+        DELETE FROM latest_contract_state_materialized_view WHERE id_contract = key_value;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION refresh_latest_contract_state()
 RETURNS TRIGGER AS $$
 BEGIN
-    REFRESH MATERIALIZED VIEW CONCURRENTLY latest_contract_state_materialized_view;
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.deleted_at IS NULL THEN
+            -- Caso comum: a nova linha passa a ser a mais recente do contrato
+            INSERT INTO latest_contract_state_materialized_view
+            VALUES (NEW.*)
+            ON CONFLICT (id_contract) DO UPDATE SET
+                id_contract_state_contract = EXCLUDED.id_contract_state_contract,
+                id_contract_state = EXCLUDED.id_contract_state,
+                created_at = EXCLUDED.created_at,
+                updated_at = EXCLUDED.updated_at,
+                deleted_at = EXCLUDED.deleted_at
+            -- A mesma ordem da reconstrução: created_at DESC (NULL primeiro) e depois id_contract_state_contract DESC
+            WHERE (COALESCE(EXCLUDED.created_at, 'infinity'), EXCLUDED.id_contract_state_contract)
+                > (COALESCE(latest_contract_state_materialized_view.created_at, 'infinity'), latest_contract_state_materialized_view.id_contract_state_contract);
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    -- UPDATE / DELETE: recalcula apenas as chaves afetadas
+    PERFORM refresh_latest_contract_state_of(OLD.id_contract);
+    IF TG_OP = 'UPDATE' AND NEW.id_contract IS DISTINCT FROM OLD.id_contract THEN
+        PERFORM refresh_latest_contract_state_of(NEW.id_contract);
+    END IF;
     RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
-
 CREATE OR REPLACE TRIGGER trigger_refresh_latest_contract_state
-AFTER INSERT ON contract_state_contract
-FOR EACH STATEMENT
+AFTER INSERT OR UPDATE OR DELETE ON contract_state_contract
+FOR EACH ROW
 EXECUTE FUNCTION refresh_latest_contract_state();
@@ -1,13 +1,60 @@
+-- Recalcula a linha mais recente de um só funcionário em latest_contract_materialized_view
+CREATE OR REPLACE FUNCTION refresh_latest_contract_of(key_value UUID)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO latest_contract_materialized_view
+    SELECT *
+    FROM contract
+    WHERE contract.id_employee = key_value AND contract.deleted_at IS NULL
+    ORDER BY contract.created_at DESC, contract.id_contract DESC
+    LIMIT 1
+    ON CONFLICT (id_employee) DO UPDATE SET
+        id_contract = EXCLUDED.id_contract,
+        id_role = EXCLUDED.id_role,
+        id_contract_type = EXCLUDED.id_contract_type,
+        created_at = EXCLUDED.created_at,
+        updated_at = EXCLUDED.updated_at,
+        deleted_at = EXCLUDED.deleted_at;
+
+    -- Já não há nenhuma linha válida para este funcionário
+    IF NOT FOUND THEN
+        DELETE FROM latest_contract_materialized_view WHERE id_employee = key_value;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE OR REPLACE FUNCTION refresh_latest_contract()
 RETURNS TRIGGER AS $$
 BEGIN
-    REFRESH MATERIALIZED VIEW CONCURRENTLY latest_contract_materialized_view;
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.deleted_at IS NULL THEN
+            -- Caso comum: a nova linha passa a ser a mais recente do funcionário
+            INSERT INTO latest_contract_materialized_view
+            VALUES (NEW.*)
+            ON CONFLICT (id_employee) DO UPDATE SET
+                id_contract = EXCLUDED.id_contract,
+                id_role = EXCLUDED.id_role,
+                id_contract_type = EXCLUDED.id_contract_type,
+                created_at = EXCLUDED.created_at,
+                updated_at = EXCLUDED.updated_at,
+                deleted_at = EXCLUDED.deleted_at
+            -- A mesma ordem da reconstrução: created_at DESC (NULL primeiro) e depois id_contract DESC
+            WHERE (COALESCE(EXCLUDED.created_at, 'infinity'), EXCLUDED.id_contract)
+                > (COALESCE(latest_contract_materialized_view.created_at, 'infinity'), latest_contract_materialized_view.id_contract);
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    -- UPDATE / DELETE: recalcula apenas as chaves afetadas
+    PERFORM refresh_latest_contract_of(OLD.id_employee);
+    IF TG_OP = 'UPDATE' AND NEW.id_employee IS DISTINCT FROM OLD.id_employee THEN
+        PERFORM refresh_latest_contract_of(NEW.id_employee);
+    END IF;
     RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
 CREATE OR REPLACE TRIGGER trigger_refresh_latest_contract
-AFTER INSERT ON contract
-FOR EACH STATEMENT
+AFTER INSERT OR UPDATE OR DELETE ON contract
+FOR EACH ROW
 EXECUTE FUNCTION refresh_latest_contract();
-
@@ -1,13 +1,64 @@
+-- Recalcula a linha mais recente de um só contrato em latest_salary_materialized_view
+CREATE OR REPLACE FUNCTION refresh_latest_salary_of(key_value UUID)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO latest_salary_materialized_view
+    SELECT *
+    FROM salary_history
+    WHERE salary_history.id_contract = key_value AND salary_history.deleted_at IS NULL
+    ORDER BY salary_history.created_at DESC, salary_history.id_salary_history DESC
+    LIMIT 1
+    ON CONFLICT (id_contract) DO UPDATE SET
+        id_salary_history = EXCLUDED.id_salary_history,
+        id_employee_aproved_by = EXCLUDED.id_employee_aproved_by,
+        base_salary = EXCLUDED.base_salary,
+        extra_hour_rate = EXCLUDED.extra_hour_rate,
+        start_date = EXCLUDED.start_date,
+        created_at = EXCLUDED.created_at,
+        updated_at = EXCLUDED.updated_at,
+        deleted_at = EXCLUDED.deleted_at;
+
+    -- Já não há nenhuma linha válida para este contrato
+    IF NOT FOUND THEN
+        DELETE FROM latest_salary_materialized_view WHERE id_contract = key_value;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE OR REPLACE FUNCTION refresh_latest_salary()
 RETURNS TRIGGER AS $$
 BEGIN
-    REFRESH MATERIALIZED VIEW CONCURRENTLY latest_salary_materialized_view;
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.deleted_at IS NULL THEN
+            -- Caso comum: a nova linha passa a ser a mais recente do contrato
+            INSERT INTO latest_salary_materialized_view
+            VALUES (NEW.*)
+            ON CONFLICT (id_contract) DO UPDATE SET
+                id_salary_history = EXCLUDED.id_salary_history,
+                id_employee_aproved_by = EXCLUDED.id_employee_aproved_by,
+                base_salary = EXCLUDED.base_salary,
+                extra_hour_rate = EXCLUDED.extra_hour_rate,
+                start_date = EXCLUDED.start_date,
+                created_at = EXCLUDED.created_at,
+                updated_at = EXCLUDED.updated_at,
+                deleted_at = EXCLUDED.deleted_at
+            -- A mesma ordem da reconstrução: created_at DESC (NULL primeiro) e depois id_salary_history DESC
+            WHERE (COALESCE(EXCLUDED.created_at, 'infinity'), EXCLUDED.id_salary_history)
+                > (COALESCE(latest_salary_materialized_view.created_at, 'infinity'), latest_salary_materialized_view.id_salary_history);
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    -- UPDATE / DELETE: recalcula apenas as chaves afetadas
+    PERFORM refresh_latest_salary_of(OLD.id_contract);
+    IF TG_OP = 'UPDATE' AND NEW.id_contract IS DISTINCT FROM OLD.id_contract THEN
+        PERFORM refresh_latest_salary_of(NEW.id_contract);
+    END IF;
     RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
 CREATE OR REPLACE TRIGGER trigger_refresh_latest_salary
-AFTER INSERT ON salary_history
-FOR EACH STATEMENT
+AFTER INSERT OR UPDATE OR DELETE ON salary_history
+FOR EACH ROW
 EXECUTE FUNCTION refresh_latest_salary();
-
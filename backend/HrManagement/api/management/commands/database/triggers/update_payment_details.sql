@@ -1,16 +1,64 @@
--- Função trigger
+-- Totais de um pagamento inserido individualmente (ex: POST /api/payments/).
+-- Era um trigger AFTER INSERT que atribuía a NEW: as atribuições eram ignoradas e os totais nunca eram gravados.
+-- Agora os totais são calculados no BEFORE INSERT e a associação dos bónus/deduções ao pagamento
+-- é feita no AFTER INSERT (id_payment só pode ser referenciado depois de o pagamento existir).
+-- Os totais só são calculados quando o pagamento chega sem amount: um amount enviado pelo cliente
+-- (e os bónus/deduções que o acompanham) é gravado tal como está.
+-- Os pagamentos de um processamento salarial (functions/run_payroll.sql) já trazem os totais e
+-- são associados de uma só vez: hr.payroll_run = 'on' desativa estes triggers por linha.
+-- Nas cargas em massa (seed --bulk), trg_update_payment_totals é desativado com os triggers de
+-- dados derivados (api/utils/bulk.py, DERIVED_DATA_TRIGGER_PATTERNS).
+
+-- Função trigger: totais de um pagamento sem amount
 CREATE OR REPLACE FUNCTION update_payment_totals()
 RETURNS TRIGGER AS $$
 DECLARE
     base_salary NUMERIC(10, 2) := 0;
+BEGIN
+    -- deduções e bônus relacionados ao pagamento (se não foram enviados)
+    IF NEW.deduction_amount IS NULL THEN
+        SELECT COALESCE(SUM(deductions.amount), 0) INTO NEW.deduction_amount
+        FROM deductions
+        INNER JOIN absence_reason ON deductions.id_absence_reason = absence_reason.id_absence_reason
+        WHERE
+            absence_reason.id_employee = NEW.id_employee
+            AND deductions.deduction_date = NEW.payment_date;
+    END IF;
+
+    IF NEW.bonus_amount IS NULL THEN
+        SELECT COALESCE(SUM(b.amount), 0) INTO NEW.bonus_amount
+        FROM bonuses b
+        WHERE
+            b.id_employee = NEW.id_employee
+            AND b.bonus_date = NEW.payment_date;
+    END IF;
+
+    -- base salary (contrato mais recente do funcionário)
+    SELECT COALESCE(latest_salary_materialized_view.base_salary, 0) INTO base_salary
+    FROM latest_contract_materialized_view
+    INNER JOIN latest_salary_materialized_view ON latest_salary_materialized_view.id_contract = latest_contract_materialized_view.id_contract
+    WHERE latest_contract_materialized_view.id_employee = NEW.id_employee;
+
+    NEW.amount = COALESCE(base_salary, 0)
+               + COALESCE(NEW.extra_amount, 0)
+               + COALESCE(NEW.bonus_amount, 0)
+               - COALESCE(NEW.deduction_amount, 0);
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Função trigger: associa as deduções e os bônus ao pagamento
+CREATE OR REPLACE FUNCTION link_payment_details()
+RETURNS TRIGGER AS $$
 BEGIN
     -- deductions
     UPDATE deductions
     SET id_payment = NEW.id_payment
     FROM absence_reason
     WHERE deductions.id_absence_reason = absence_reason.id_absence_reason
-      AND id_employee = NEW.id_employee
-      AND deduction_date = NEW.payment_date;
+      AND absence_reason.id_employee = NEW.id_employee
+      AND deductions.deduction_date = NEW.payment_date;
 
     -- bonuses
     UPDATE bonuses
@@ -18,39 +66,21 @@ BEGIN
     WHERE id_employee = NEW.id_employee
       AND bonus_date = NEW.payment_date;
 
-    -- deduções e bônus relacionados ao pagamento
-    SELECT COALESCE(SUM(deductions.amount), 0) INTO NEW.deduction_amount
-    FROM deductions
-    INNER JOIN absence_reason ON deductions.id_absence_reason = absence_reason.id_absence_reason
-    WHERE
-        absence_reason.id_employee = NEW.id_employee
-        AND deductions.deduction_date = NEW.payment_date;
-
-    SELECT COALESCE(SUM(b.amount), 0) INTO NEW.bonus_amount
-    FROM bonuses b
-    WHERE
-        b.id_employee = NEW.id_employee
-        AND b.bonus_date = NEW.payment_date;
-
-    -- base salary
-    SELECT COALESCE(latest_salary_materialized_view.base_salary, 0) INTO base_salary FROM latest_salary_materialized_view
-    INNER JOIN contract ON contract.id_contract = latest_salary_materialized_view.id_contract
-    INNER JOIN employees ON employees.id_employee = contract.id_employee
-    WHERE employees.id_employee = NEW.id_employee
-    LIMIT 1;
-
-
-    NEW.amount = base_salary
-               + COALESCE(NEW.extra_amount, 0)
-               + COALESCE(NEW.bonus_amount, 0)
-               - COALESCE(NEW.deduction_amount, 0);
-
-    RETURN NEW;
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
--- Trigger que chama a função na inserção de pagamentos
-CREATE OR REPLACE TRIGGER trg_update_payment_totals
+-- Triggers que chamam as funções na inserção de pagamentos
+-- (DROP + CREATE: o trigger de totais passou de AFTER para BEFORE)
+DROP TRIGGER IF EXISTS trg_update_payment_totals ON payments;
+CREATE TRIGGER trg_update_payment_totals
+BEFORE INSERT ON payments
+FOR EACH ROW
+WHEN (NEW.amount IS NULL AND current_setting('hr.payroll_run', true) IS DISTINCT FROM 'on')
+EXECUTE FUNCTION update_payment_totals();
+
+CREATE OR REPLACE TRIGGER trg_link_payment_details
 AFTER INSERT ON payments
 FOR EACH ROW
-EXECUTE FUNCTION update_payment_totals();
\ No newline at end of file
+WHEN (current_setting('hr.payroll_run', true) IS DISTINCT FROM 'on')
+EXECUTE FUNCTION link_payment_details();
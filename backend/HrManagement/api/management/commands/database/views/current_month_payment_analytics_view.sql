@@ -1,39 +1,19 @@
+-- Lê o resumo pré-agregado do mês atual (payroll_monthly_summary), em vez de agregar os pagamentos
 CREATE OR REPLACE VIEW current_month_payment_analytics_view AS
-WITH current_month_payments AS (
-    SELECT
-        p.*,
-        TO_CHAR(p.payment_date, 'Month') as month_name,
-        e.id_auth_user,
-        COALESCE(b.amount, 0) as total_bonus,
-        COALESCE(d.amount, 0) as total_deduction
-    FROM payments p
-    LEFT JOIN employees e ON e.id_employee = p.id_employee
-    LEFT JOIN (
-        SELECT id_payment, SUM(amount) as amount
-        FROM bonuses
-        WHERE deleted_at IS NULL
-        GROUP BY id_payment
-    ) b ON b.id_payment = p.id_payment
-    LEFT JOIN (
-        SELECT id_payment, SUM(amount) as amount
-        FROM deductions
-        WHERE deleted_at IS NULL
-        GROUP BY id_payment
-    ) d ON d.id_payment = p.id_payment
-    WHERE p.deleted_at IS NULL
-    AND DATE_TRUNC('month', p.payment_date) = DATE_TRUNC('month', CURRENT_DATE)
-)
 SELECT
-    month_name,
-    COUNT(DISTINCT id_employee) as total_employees_paid,
-    SUM(amount) as total_base_salary,
-    SUM(total_bonus) as total_bonus_amount,
-    SUM(total_deduction) as total_deduction_amount,
-    SUM(amount + total_bonus - total_deduction) as net_payment_amount,
-    ROUND(AVG(amount + total_bonus - total_deduction), 2) as average_payment,
-    MIN(amount + total_bonus - total_deduction) as min_payment,
-    MAX(amount + total_bonus - total_deduction) as max_payment,
-    COUNT(CASE WHEN total_bonus > 0 THEN 1 END) as employees_with_bonus,
-    COUNT(CASE WHEN total_deduction > 0 THEN 1 END) as employees_with_deduction
-FROM current_month_payments
-GROUP BY month_name;
\ No newline at end of file
+    TO_CHAR(s.month, 'Month') as month_name,
+    -- Distintos no mês: um funcionário pago em dois departamentos conta uma vez
+    COALESCE(MAX(m.total_employees_paid), 0)::bigint as total_employees_paid,
+    SUM(s.total_base_salary)::numeric as total_base_salary,
+    SUM(s.total_bonus_amount) as total_bonus_amount,
+    SUM(s.total_deduction_amount) as total_deduction_amount,
+    SUM(s.net_payment_amount) as net_payment_amount,
+    ROUND(SUM(s.net_payment_amount) / NULLIF(SUM(s.total_payments), 0), 2) as average_payment,
+    MIN(s.min_payment)::numeric as min_payment,
+    MAX(s.max_payment)::numeric as max_payment,
+    SUM(s.employees_with_bonus)::bigint as employees_with_bonus,
+    SUM(s.employees_with_deduction)::bigint as employees_with_deduction
+FROM payroll_monthly_summary s
+LEFT JOIN payroll_monthly_employees m ON m.month = s.month
+WHERE s.month = DATE_TRUNC('month', CURRENT_DATE)::date
+GROUP BY s.month;
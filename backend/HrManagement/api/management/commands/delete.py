@@ -3,6 +3,7 @@
 #? python manage.py delete 
 #? python manage.py delete --quantity 1000 
 #? python manage.py delete --seeder 1_employee
+#? python manage.py delete --workers 4
 
 import re
 from django.core.management.base import BaseCommand
@@ -10,16 +11,19 @@ import importlib
 import os
 from pathlib import Path
 from django.contrib.auth.models import User
+from api.utils.seeder_graph import build_dependency_graph, list_seeders, reverse_graph, run_graph
 
 class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--quantity', type=int, default=None, help='Number of records to delete (\033[31mdepricated\033[m)')
         parser.add_argument('--seeder', type=str, help='Specific seeder file to delete records from')
+        parser.add_argument('--workers', type=int, default=1, help='Delete independent seeders in parallel on N processes (dependents are deleted before their dependencies)')
     
     def handle(self, *args, **kwargs):
         quantity = kwargs['quantity']
         seeder_name = kwargs['seeder']
+        workers = max(1, kwargs['workers'])
 
         seeders_directory = Path(__file__).resolve().parent / 'seeders'
         if seeder_name:
@@ -36,6 +40,21 @@ class Command(BaseCommand):
                     self.stdout.write(self.style.ERROR(f'No delete method found in {seeder_name}.'))
             else:
                 self.stdout.write(self.style.ERROR(f'Seeder file {seeder_name}.py not found.'))
+        elif workers > 1:
+            # Dependents are deleted before the seeders they depend on
+            graph = reverse_graph(build_dependency_graph(list_seeders(seeders_directory)))
+
+            def on_start(name):
+                self.stdout.write(self.style.SUCCESS(f'Deleting {name}...'))
+
+            def on_finish(name, result, error):
+                if error:
+                    self.stdout.write(self.style.ERROR(f'{name}: {error}'))
+
+            _, failed = run_graph(graph, 'delete', (quantity,), workers, on_start, on_finish)
+            if failed:
+                self.stdout.write(self.style.ERROR(f'Failed or skipped: {", ".join(sorted(failed))}'))
+            User.objects.all().delete()
         else:
             # Ordena os arquivos de seeders em ordem inversa para deletar na ordem correta
             seeder_files = sorted(
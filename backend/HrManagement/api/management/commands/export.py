@@ -0,0 +1,45 @@
+#
+#! export.py
+#? python manage.py export payments --output payments.csv
+#? python manage.py export payments --format parquet --output payroll_2024_12.parquet --filter date_from=2024-12-01 --filter date_to=2024-12-31
+#? python manage.py export employees --output employees.csv --filter department_id=<id_department>
+
+from django.core.management.base import BaseCommand, CommandError
+import os
+import time
+from api.utils.exports import DATASETS, EXPORT_FORMATS, copy_export, export_parquet
+
+class Command(BaseCommand):
+    help = 'Exports a dataset (payments, deductions, bonuses, salary_history, contracts, employees) to CSV or Parquet with COPY ... TO STDOUT, without loading the rows into Python.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', type=str, choices=list(DATASETS), help='Dataset to export')
+        parser.add_argument('--output', type=str, required=True, help='Output file path')
+        parser.add_argument('--format', type=str, choices=EXPORT_FORMATS, default=None, help='csv or parquet (by default taken from the output extension)')
+        parser.add_argument('--filter', type=str, action='append', default=[], help='Filter as name=value, with the same names as the list endpoint (can be repeated)')
+
+    def handle(self, *args, **kwargs):
+        dataset = kwargs['dataset']
+        output = kwargs['output']
+        export_format = kwargs['format'] or ('parquet' if output.endswith('.parquet') else 'csv')
+
+        filters = {}
+        for item in kwargs['filter']:
+            name, separator, value = item.partition('=')
+            if not separator:
+                raise CommandError(f"Invalid filter '{item}'. Use name=value.")
+            filters[name] = value
+
+        start = time.monotonic()
+        try:
+            if export_format == 'csv':
+                with open(output, 'wb') as file:
+                    copy_export(file, dataset, filters)
+            else:
+                export_parquet(output, dataset, filters)
+        except ImportError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.monotonic() - start
+        size = os.path.getsize(output) / 1024 / 1024
+        self.stdout.write(self.style.SUCCESS(f'Exported {dataset} to {output} ({size:.1f} MB) in {elapsed:.1f}s'))
@@ -0,0 +1,41 @@
+#
+#! payroll.py
+#? python manage.py payroll 2024-12 --payment-method <id_payment_method> --supervisor <id_employee>
+#? python manage.py payroll 2024-12 --payment-method <id_payment_method> --supervisor <id_employee> --payment-date 2024-12-27 --state Active
+
+from django.core.management.base import BaseCommand, CommandError
+from datetime import datetime
+from api.utils.payroll import DEFAULT_CONTRACT_STATES, check_payment_date, parse_month, run_payroll
+
+class Command(BaseCommand):
+    help = 'Runs the payroll of a month: creates the payments of every employee with an active contract not yet paid in the month, with set-based SQL (run_payroll).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('month', type=str, help='Month to pay (YYYY-MM)')
+        parser.add_argument('--payment-method', type=str, required=True, help='id_payment_method of the payments')
+        parser.add_argument('--supervisor', type=str, required=True, help='id_employee recorded as the supervisor of the payments')
+        parser.add_argument('--payment-date', type=str, default=None, help='Date of the payments, YYYY-MM-DD, inside the month (default: last day of the month)')
+        parser.add_argument('--state', type=str, action='append', help=f"Contract state paid (can be repeated; default: {', '.join(DEFAULT_CONTRACT_STATES)})")
+
+    def handle(self, *args, **kwargs):
+        try:
+            month = parse_month(kwargs['month'])
+            payment_date = datetime.strptime(kwargs['payment_date'], '%Y-%m-%d').date() if kwargs['payment_date'] else None
+        except ValueError:
+            raise CommandError('Invalid month or payment date. Use YYYY-MM and YYYY-MM-DD.')
+
+        try:
+            check_payment_date(month, payment_date)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        run = run_payroll(month, kwargs['payment_method'], kwargs['supervisor'], payment_date, kwargs['state'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Payroll {month:%Y-%m} ({run['id_payroll_run']}): {run['payments_created']} payments, "
+            f"total {run['total_amount']}, {run['bonuses_linked']} bonuses and {run['deductions_linked']} deductions linked"
+        ))
+        self.stdout.write(
+            f"Extra hours of {run['extra_hours_employees']} employees read in {run['extra_hours_ms']:.0f}ms; "
+            f"SQL {run['duration_ms']}ms; total {run['elapsed_ms']:.0f}ms"
+        )
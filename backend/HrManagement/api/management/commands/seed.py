@@ -1,60 +1,126 @@
 #
 #! seed.py
 #? python manage.py seed
-#? python manage.py seed --quantity 1000 
+#? python manage.py seed --quantity 1000
 #? python manage.py seed --seeder 1_employee
+#? python manage.py seed --bulk --quantity 500000
+#? python manage.py seed --workers 4
 
 from django.core.management.base import BaseCommand
+from contextlib import nullcontext
 import importlib
 import os
 from pathlib import Path
 import re
+import time
+from api.utils.bulk import deferred_derived_data
+from api.utils.seeder_graph import build_dependency_graph, list_seeders, run_graph
+
+MIN_QUANTITY = 10
+MAX_QUANTITY = 10000
+MAX_BULK_QUANTITY = 5000000
 
 class Command(BaseCommand):
 
     def add_arguments(self, parser):
-        parser.add_argument('--quantity', type=int, default=100, help='Number of records to create (min 10, max 10000)')
+        parser.add_argument('--quantity', type=int, default=100, help=f'Number of records to create (min {MIN_QUANTITY}, max {MAX_QUANTITY}, or {MAX_BULK_QUANTITY} with --bulk)')
         parser.add_argument('--seeder', type=str, help='Specific seeder file to run (without the .py extension)')
-    
+        parser.add_argument('--bulk', action='store_true', help='Load rows in batches with COPY (seeders with a seed_bulk function); the others still run row by row, capped at the normal maximum')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per COPY batch in --bulk mode')
+        parser.add_argument('--workers', type=int, default=1, help='Run independent seeders in parallel on N processes, following the TABLES / DEPENDS_ON declared by each seeder')
+
     def handle(self, *args, **kwargs):
         quantity = kwargs['quantity']
         seeder_file_name = kwargs['seeder']
+        bulk = kwargs['bulk']
+        batch_size = max(1, kwargs['batch_size'])
+        workers = max(1, kwargs['workers'])
+
+        max_quantity = MAX_BULK_QUANTITY if bulk else MAX_QUANTITY
+        if quantity < MIN_QUANTITY:
+            quantity = MIN_QUANTITY
+            print(f'The minimum quantity is {MIN_QUANTITY}. Defaulting to {MIN_QUANTITY}.')
+        elif quantity > max_quantity:
+            quantity = max_quantity
+            print(f'The maximum quantity is {max_quantity}. Defaulting to {max_quantity}.')
 
-        if quantity < 10:
-            quantity = 10
-            print('The minimum quantity is 10. Defaulting to 10.')
-        elif quantity > 10000:
-            quantity = 10000
-            print('The maximum quantity is 10000. Defaulting to 10000.')
-        
         seeders_directory = Path(__file__).resolve().parent / 'seeders'
 
-        if seeder_file_name:
-            seeder_file_path = seeders_directory / f"{seeder_file_name}.py"
-            if os.path.isfile(seeder_file_path):
-                print(f"Seeder file found: {seeder_file_path}")
-                seeder_module = importlib.import_module(f'api.management.commands.seeders.{seeder_file_name}')
-                
-                if hasattr(seeder_module, 'seed'):
-                    self.stdout.write(self.style.SUCCESS(f'Seeding {seeder_file_name}...'))
-                    seeder_module.seed(quantity)
+        # In bulk mode the triggers maintaining derived data are disabled and the data is rebuilt once at the end
+        with deferred_derived_data() if bulk else nullcontext():
+            if seeder_file_name:
+                seeder_file_path = seeders_directory / f"{seeder_file_name}.py"
+                if os.path.isfile(seeder_file_path):
+                    print(f"Seeder file found: {seeder_file_path}")
+                    seeder_module = importlib.import_module(f'api.management.commands.seeders.{seeder_file_name}')
+
+                    if hasattr(seeder_module, 'seed'):
+                        self.run_seeder(seeder_file_name, seeder_module, quantity, bulk, batch_size)
+                    else:
+                        self.stdout.write(self.style.ERROR(f'No seed method found in {seeder_file_name}.'))
                 else:
-                    self.stdout.write(self.style.ERROR(f'No seed method found in {seeder_file_name}.'))
+                    self.stdout.write(self.style.ERROR(f'Seeder file {seeder_file_name}.py not found.'))
+            elif workers > 1:
+                self.run_parallel(seeders_directory, quantity, bulk, batch_size, workers)
             else:
-                self.stdout.write(self.style.ERROR(f'Seeder file {seeder_file_name}.py not found.'))
+                seeder_files = sorted(
+                    [f for f in os.listdir(seeders_directory) if f.endswith('.py') and f != '__init__.py'],
+                    key=lambda x: int(re.match(r'(\d+)_', x).group(1))
+                )
+
+                for seeder_file in seeder_files:
+                    seeder_name = seeder_file[:-3]  # Remove a extensão .py
+                    print(f"Seeder file: {seeder_name}")
+                    seeder_module = importlib.import_module(f'api.management.commands.seeders.{seeder_name}')
+
+                    if hasattr(seeder_module, 'seed'):
+                        self.run_seeder(seeder_name, seeder_module, quantity, bulk, batch_size)
+
+        self.stdout.write(self.style.SUCCESS('Seeding completed!'))
+
+    def run_seeder(self, seeder_name, seeder_module, quantity, bulk, batch_size):
+        start = time.monotonic()
+
+        if bulk and hasattr(seeder_module, 'seed_bulk'):
+            self.stdout.write(self.style.SUCCESS(f'Bulk seeding {seeder_name}...'))
+            rows = seeder_module.seed_bulk(quantity, batch_size)
+            elapsed = time.monotonic() - start
+            rate = rows / elapsed if elapsed > 0 else 0
+            self.stdout.write(self.style.SUCCESS(f'{seeder_name}: {rows} rows in {elapsed:.1f}s ({rate:.0f} rows/s)'))
         else:
-            seeder_files = sorted(
-                [f for f in os.listdir(seeders_directory) if f.endswith('.py') and f != '__init__.py'],
-                key=lambda x: int(re.match(r'(\d+)_', x).group(1))
-            )
-            
-            for seeder_file in seeder_files:
-                seeder_name = seeder_file[:-3]  # Remove a extensão .py
-                print(f"Seeder file: {seeder_name}")
-                seeder_module = importlib.import_module(f'api.management.commands.seeders.{seeder_name}')
-                
-                if hasattr(seeder_module, 'seed'):
-                    self.stdout.write(self.style.SUCCESS(f'Seeding {seeder_name}...'))
-                    seeder_module.seed(quantity)
-                    
-        self.stdout.write(self.style.SUCCESS('Seeding completed!'))
\ No newline at end of file
+            self.stdout.write(self.style.SUCCESS(f'Seeding {seeder_name}...'))
+            seeder_module.seed(min(quantity, MAX_QUANTITY))
+            if bulk:
+                self.stdout.write(f'{seeder_name}: {time.monotonic() - start:.1f}s')
+
+    def run_parallel(self, seeders_directory, quantity, bulk, batch_size, workers):
+        graph = build_dependency_graph(list_seeders(seeders_directory))
+        started = {}
+
+        def task(seeder_name, module):
+            if bulk and hasattr(module, 'seed_bulk'):
+                return 'seed_bulk', (quantity, batch_size)
+            if hasattr(module, 'seed'):
+                return 'seed', (min(quantity, MAX_QUANTITY),)
+            return None
+
+        def on_start(seeder_name):
+            started[seeder_name] = time.monotonic()
+            self.stdout.write(self.style.SUCCESS(f'Seeding {seeder_name}...'))
+
+        def on_finish(seeder_name, rows, error):
+            if error:
+                self.stdout.write(self.style.ERROR(f'{seeder_name}: {error}'))
+                return
+            elapsed = time.monotonic() - started[seeder_name]
+            if isinstance(rows, int):
+                rate = rows / elapsed if elapsed > 0 else 0
+                self.stdout.write(self.style.SUCCESS(f'{seeder_name}: {rows} rows in {elapsed:.1f}s ({rate:.0f} rows/s)'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{seeder_name}: done in {elapsed:.1f}s'))
+
+        start = time.monotonic()
+        _, failed = run_graph(graph, task, None, workers, on_start, on_finish)
+        self.stdout.write(f'Seeders finished in {time.monotonic() - start:.1f}s on {workers} workers')
+        if failed:
+            self.stdout.write(self.style.ERROR(f'Failed or skipped: {", ".join(sorted(failed))}'))
@@ -4,6 +4,9 @@ from api.utils.mongo_client import get_mongo_db
 from datetime import datetime, timedelta
 from django.db import connection
 
+TABLES = ['attendance']
+DEPENDS_ON = ['employees']
+
 """
 Seeder para popular a coleção no MongoDB: attendance.
 """
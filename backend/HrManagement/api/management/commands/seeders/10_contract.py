@@ -4,6 +4,10 @@
 
 from django.db import connection
 from faker import Faker
+from api.utils.bulk import copy_in_batches
+
+TABLES = ['contract']
+DEPENDS_ON = ['employees', 'contract_type', 'roles']
 
 """ 
 CREATE TABLE IF NOT EXISTS contract (
@@ -61,6 +65,41 @@ def seed(quantity=100):
             if (quantity >= 4) and ((_ + 1) % (quantity // 4) == 0):  # 25% checkpoints
                 print(f"Progress: {((_ + 1) / quantity) * 100:.0f}% completed.")
 
+def seed_bulk(quantity=100, batch_size=5000):
+    """
+    Bulk version of seed: one contract per employee without one, loaded with COPY.
+    """
+    fake = Faker()
+    with connection.cursor() as cursor:
+        cursor.execute("""
+                        SELECT e.id_employee
+                        FROM employees e
+                        WHERE NOT EXISTS (SELECT 1 FROM contract c WHERE c.id_employee = e.id_employee)
+                        LIMIT %s;
+                       """, [quantity])
+        employees = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("SELECT id_contract_type FROM contract_type;")
+        contract_types = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("SELECT id_role FROM roles;")
+        roles = [row[0] for row in cursor.fetchall()]
+
+        if not employees or not contract_types or not roles:
+            print("No employees, contract types or roles found. Please create them before running the contract seeder.")
+            return 0
+
+        rows = (
+            (id_employee, fake.random_element(elements=contract_types), fake.random_element(elements=roles))
+            for id_employee in employees
+        )
+        return copy_in_batches(
+            cursor, 'contract',
+            ['id_employee', 'id_contract_type', 'id_role'],
+            rows, len(employees), batch_size
+        )
+
+
 def delete(quantity=None):
     with connection.cursor() as cursor:
         if quantity is not None and quantity > 0:
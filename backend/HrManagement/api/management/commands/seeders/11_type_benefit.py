@@ -5,6 +5,9 @@
 from django.db import connection
 from faker import Faker
 
+TABLES = ['type_benefit']
+DEPENDS_ON = []
+
 """ 
 CREATE TABLE IF NOT EXISTS type_benefit (
     id_type_benefit UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
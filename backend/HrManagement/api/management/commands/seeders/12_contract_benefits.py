@@ -5,6 +5,9 @@
 from django.db import connection
 from faker import Faker
 
+TABLES = ['contract_benefits']
+DEPENDS_ON = ['contract', 'type_benefit']
+
 """
 CREATE TABLE IF NOT EXISTS contract_benefits (
     id_contract_benefit UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
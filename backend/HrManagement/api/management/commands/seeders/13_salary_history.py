@@ -4,8 +4,12 @@
 
 from django.db import connection
 from faker import Faker
+from api.utils.bulk import copy_in_batches
 from datetime import date
 
+TABLES = ['salary_history']
+DEPENDS_ON = ['contract', 'employees']
+
 """ 
 CREATE TABLE IF NOT EXISTS salary_history (
     id_salary_history UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -65,6 +69,51 @@ def seed(quantity=100):
             if (quantity >= 4) and ((_ + 1) % (quantity // 4) == 0):  # 25% checkpoints
                 print(f"Progress: {((_ + 1) / quantity) * 100:.0f}% completed.")
 
+def seed_bulk(quantity=100, batch_size=5000):
+    """
+    Bulk version of seed: one salary record per contract without one for today, loaded with COPY.
+    """
+    fake = Faker()
+    with connection.cursor() as cursor:
+        cursor.execute("""
+                        SELECT c.id_contract, c.id_employee
+                        FROM contract c
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM salary_history sh
+                            WHERE sh.id_contract = c.id_contract AND sh.start_date = CURRENT_DATE
+                        )
+                        LIMIT %s;
+                       """, [quantity])
+        contracts_and_employees = cursor.fetchall()
+
+        cursor.execute("SELECT id_employee FROM employees;")
+        all_employees = [row[0] for row in cursor.fetchall()]
+
+        if not contracts_and_employees or len(all_employees) < 2:
+            print("No contracts or employees found. Please create contracts and employees before running the salary history seeder.")
+            return 0
+
+        def approver(id_employee):
+            id_employee_aproved_by = fake.random_element(elements=all_employees)
+            while id_employee_aproved_by == id_employee:
+                id_employee_aproved_by = fake.random_element(elements=all_employees)
+            return id_employee_aproved_by
+
+        start_date = date.today()
+        rows = (
+            (
+                id_contract, approver(id_employee),
+                fake.random_int(min=1000, max=10000), fake.random_int(min=10, max=50), start_date
+            )
+            for id_contract, id_employee in contracts_and_employees
+        )
+        return copy_in_batches(
+            cursor, 'salary_history',
+            ['id_contract', 'id_employee_aproved_by', 'base_salary', 'extra_hour_rate', 'start_date'],
+            rows, len(contracts_and_employees), batch_size
+        )
+
+
 def delete(quantity=None):
     with connection.cursor() as cursor:
         if quantity is not None and quantity > 0:
@@ -5,6 +5,9 @@
 from django.db import connection
 from faker import Faker
 
+TABLES = ['contract_state']
+DEPENDS_ON = []
+
 """ 
 CREATE TABLE IF NOT EXISTS contract_state (
     id_contract_state UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
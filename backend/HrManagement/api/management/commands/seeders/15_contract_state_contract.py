@@ -4,6 +4,10 @@
 
 from django.db import connection
 from faker import Faker
+from api.utils.bulk import copy_in_batches
+
+TABLES = ['contract_state_contract']
+DEPENDS_ON = ['contract', 'contract_state']
 
 """ 
 CREATE TABLE IF NOT EXISTS contract_state_contract (
@@ -51,6 +55,38 @@ def seed(quantity=100):
             if (quantity >= 4) and ((_ + 1) % (quantity // 4) == 0):  # 25% checkpoints
                 print(f"Progress: {((_ + 1) / quantity) * 100:.0f}% completed.")
 
+def seed_bulk(quantity=100, batch_size=5000):
+    """
+    Bulk version of seed: one state per contract without one, loaded with COPY.
+    """
+    fake = Faker()
+    with connection.cursor() as cursor:
+        cursor.execute("""
+                        SELECT c.id_contract
+                        FROM contract c
+                        WHERE NOT EXISTS (SELECT 1 FROM contract_state_contract csc WHERE csc.id_contract = c.id_contract)
+                        LIMIT %s;
+                       """, [quantity])
+        contracts = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("SELECT id_contract_state FROM contract_state;")
+        contract_states = [row[0] for row in cursor.fetchall()]
+
+        if not contracts or not contract_states:
+            print("No contracts or contract states found. Please create contracts and contract states before running the contract state contract seeder.")
+            return 0
+
+        rows = (
+            (fake.random_element(elements=contract_states), id_contract)
+            for id_contract in contracts
+        )
+        return copy_in_batches(
+            cursor, 'contract_state_contract',
+            ['id_contract_state', 'id_contract'],
+            rows, len(contracts), batch_size
+        )
+
+
 def delete(quantity=None):
     with connection.cursor() as cursor:
         if quantity is not None and quantity > 0:
@@ -4,6 +4,9 @@
 
 from django.db import connection
 
+TABLES = ['contract_leave_type']
+DEPENDS_ON = []
+
 """ 
 CREATE TABLE IF NOT EXISTS contract_leave_type (
     id_leave_type UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
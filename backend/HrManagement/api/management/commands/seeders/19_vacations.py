@@ -7,6 +7,9 @@ from faker import Faker
 import random
 from datetime import timedelta, datetime
 
+TABLES = ['vacations']
+DEPENDS_ON = ['employees']
+
 """ 
 CREATE TABLE IF NOT EXISTS vacations (
     id_vacation UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -7,6 +7,10 @@ import random
 from django.db import connection
 from faker import Faker
 from django.contrib.auth.hashers import make_password
+from api.utils.bulk import copy_in_batches
+
+TABLES = ['auth_user', 'employees']
+DEPENDS_ON = []
 
 
 """ 
@@ -39,23 +43,27 @@ create table auth_user
 );
  """
 
+def create_default_user(cursor):
+    cursor.execute("""SELECT * FROM employees
+                   WHERE id_auth_user = 1
+                   LIMIT 1;""")
+    if cursor.fetchone() is None:
+        passw = make_password("seguinte")
+        cursor.execute(
+            """
+            INSERT INTO auth_user (id, username, password, first_name, last_name, email, is_superuser, is_staff, is_active, date_joined)
+            VALUES (1, 'benno', %s, 'pedro', 'benno', 'pedro@example.com', False, False, True, CURRENT_TIMESTAMP);
+            """,
+            [passw]
+        )
+        cursor.execute("""INSERT INTO employees (id_auth_user, phone, src, birth_date, created_at, updated_at)
+                       VALUES (1, '123456789', 'https://encrypted-tbn0.gstatic.com/images?q=tbn:ANd9GcRKVA3tt00vmEdcfrTjLzjCk8eYD4en-wVUQpbPpKxu6DmNQz_XtAJUK137I4PfNGfczyY&usqp=CAU', '1990-01-01', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP);""")
+
+
 def seed(quantity=100):
     fake = Faker()
     with connection.cursor() as cursor:
-        cursor.execute("""SELECT * FROM employees
-                       WHERE id_auth_user = 1
-                       LIMIT 1;""")
-        if cursor.fetchone() is None:
-            passw = make_password("seguinte")
-            cursor.execute(
-                """
-                INSERT INTO auth_user (id, username, password, first_name, last_name, email, is_superuser, is_staff, is_active, date_joined)
-                VALUES (1, 'benno', %s, 'pedro', 'benno', 'pedro@example.com', False, False, True, CURRENT_TIMESTAMP);
-                """,
-                [passw]
-            )
-            cursor.execute("""INSERT INTO employees (id_auth_user, phone, src, birth_date, created_at, updated_at)
-                           VALUES (1, '123456789', 'https://encrypted-tbn0.gstatic.com/images?q=tbn:ANd9GcRKVA3tt00vmEdcfrTjLzjCk8eYD4en-wVUQpbPpKxu6DmNQz_XtAJUK137I4PfNGfczyY&usqp=CAU', '1990-01-01', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP);""")
+        create_default_user(cursor)
         # Fetch existing usernames to ensure uniqueness
         cursor.execute("SELECT username FROM auth_user;")
         existing_usernames = {row[0] for row in cursor.fetchall()}
@@ -110,6 +118,55 @@ def seed(quantity=100):
                 print(f"Progress: {((_ + 1) / quantity) * 100:.0f}% completed.")
 
 
+def seed_bulk(quantity=100, batch_size=5000):
+    """
+    Bulk version of seed: rows are generated in batches and loaded with COPY,
+    and every user shares the same password hash (make_password runs once).
+    """
+    fake = Faker()
+    password = make_password("password")
+
+    with connection.cursor() as cursor:
+        create_default_user(cursor)
+
+        cursor.execute("SELECT COALESCE(MAX(id), 1) + 1 FROM auth_user;")
+        first_id = cursor.fetchone()[0]
+
+        # The auth_user id becomes part of the username, so usernames are unique without a lookup
+        users = (
+            (
+                id_auth_user, f"{fake.user_name()}{id_auth_user}", password,
+                fake.first_name(), fake.last_name(), fake.email(),
+                False, False, True, 'now'
+            )
+            for id_auth_user in range(first_id, first_id + quantity)
+        )
+        total = copy_in_batches(
+            cursor, 'auth_user',
+            ['id', 'username', 'password', 'first_name', 'last_name', 'email', 'is_superuser', 'is_staff', 'is_active', 'date_joined'],
+            users, quantity, batch_size
+        )
+
+        # Explicit ids do not advance the identity sequence
+        cursor.execute("SELECT setval(pg_get_serial_sequence('auth_user', 'id'), (SELECT MAX(id) FROM auth_user));")
+
+        employees = (
+            (
+                id_auth_user, fake.phone_number(),
+                f"https://picsum.photos/300/300?random={fake.uuid4()}",
+                fake.date_of_birth(minimum_age=18, maximum_age=65)
+            )
+            for id_auth_user in range(first_id, first_id + quantity)
+        )
+        total += copy_in_batches(
+            cursor, 'employees',
+            ['id_auth_user', 'phone', 'src', 'birth_date'],
+            employees, quantity, batch_size
+        )
+
+    return total
+
+
 def delete(quantity=None):
     with connection.cursor() as cursor:
         if quantity is not None and quantity > 0:
@@ -5,6 +5,9 @@
 from django.db import connection
 from faker import Faker
 
+TABLES = ['certificate_types']
+DEPENDS_ON = []
+
 
 """
 CREATE TABLE IF NOT EXISTS certificate_types (
@@ -7,6 +7,9 @@ from django.db import connection
 from faker import Faker
 from datetime import timedelta
 
+TABLES = ['certifications']
+DEPENDS_ON = ['employees', 'certificate_types']
+
 """ 
 CREATE TABLE IF NOT EXISTS certifications (
     id_certification UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -5,6 +5,9 @@
 import random
 from django.db import connection
 
+TABLES = ['employee_hierarchy']
+DEPENDS_ON = ['employees']
+
 """
 CREATE TABLE IF NOT EXISTS employee_hierarchy (
     id_employee_hierarchy UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
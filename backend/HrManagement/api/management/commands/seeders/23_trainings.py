@@ -7,6 +7,9 @@ from django.db import connection
 from faker import Faker
 from datetime import timedelta
 
+TABLES = ['trainings']
+DEPENDS_ON = ['employees', 'training_types']
+
 """ 
 CREATE TABLE IF NOT EXISTS trainings (
     id_training UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
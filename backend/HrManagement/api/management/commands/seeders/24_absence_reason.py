@@ -7,6 +7,9 @@ from django.db import connection
 from faker import Faker
 from datetime import timedelta
 
+TABLES = ['absence_reason']
+DEPENDS_ON = ['employees']
+
 """ 
 CREATE TABLE IF NOT EXISTS absence_reason (
     id_absence_reason UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
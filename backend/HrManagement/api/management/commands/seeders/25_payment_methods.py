@@ -6,6 +6,9 @@ import random
 from django.db import connection
 from faker import Faker
 
+TABLES = ['payment_methods']
+DEPENDS_ON = []
+
 """ 
 CREATE TABLE IF NOT EXISTS payment_methods (
     id_payment_method UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -5,6 +5,10 @@
 import random
 from django.db import connection
 from faker import Faker
+from api.utils.bulk import copy_in_batches
+
+TABLES = ['payments']
+DEPENDS_ON = ['employees', 'payment_methods', 'salary_history']
 
 """ 
 CREATE TABLE IF NOT EXISTS payments (
@@ -83,6 +87,48 @@ def seed(quantity=100):
             if (quantity >= 4) and ((_ + 1) % (quantity // 4) == 0):
                 print(f"Progress: {((_ + 1) / quantity) * 100:.0f}% completed.")
 
+def seed_bulk(quantity=100, batch_size=5000):
+    """
+    Bulk version of seed: one payment per employee without one, loaded with COPY.
+    """
+    fake = Faker()
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT e.id_employee
+            FROM employees e
+            WHERE NOT EXISTS (SELECT 1 FROM payments p WHERE p.id_employee = e.id_employee)
+            LIMIT %s;
+        """, [quantity])
+        employees = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("SELECT id_payment_method FROM payment_methods;")
+        payment_methods = [row[0] for row in cursor.fetchall()]
+
+        if not employees or not payment_methods:
+            print("No employees or payment methods found. Please create them before running the payments seeder.")
+            return 0
+
+        src = "https://images.pexels.com/photos/261679/pexels-photo-261679.jpeg?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=1"
+
+        def payment(id_employee):
+            extra_amount = fake.random_int(min=100, max=1000) if fake.boolean(chance_of_getting_true=75) else 0
+            deduction_amount = fake.random_int(min=100, max=1000) if fake.boolean(chance_of_getting_true=75) else 0
+            bonus_amount = fake.random_int(min=100, max=1000) if fake.boolean(chance_of_getting_true=75) else 0
+            amount = max(0, extra_amount + bonus_amount - deduction_amount)
+            payment_note = fake.text() if fake.boolean(chance_of_getting_true=75) else None
+            return (
+                id_employee, fake.random_element(elements=employees), fake.random_element(elements=payment_methods),
+                amount, fake.date_this_year(), extra_amount, deduction_amount, bonus_amount, payment_note, src
+            )
+
+        return copy_in_batches(
+            cursor, 'payments',
+            ['id_employee', 'id_employee_supervisor', 'id_payment_method', 'amount', 'payment_date',
+             'extra_amount', 'deduction_amount', 'bonus_amount', 'payment_note', 'src'],
+            (payment(id_employee) for id_employee in employees), len(employees), batch_size
+        )
+
+
 def delete(quantity=None):
     with connection.cursor() as cursor:
         if quantity is not None and quantity > 0:
@@ -6,6 +6,9 @@ import random
 from django.db import connection
 from faker import Faker
 
+TABLES = ['deductions']
+DEPENDS_ON = ['payments', 'absence_reason']
+
 """ 
 CREATE TABLE IF NOT EXISTS deductions (
     id_deduction UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
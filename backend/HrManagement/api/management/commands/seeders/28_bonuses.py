@@ -6,6 +6,9 @@ import random
 from django.db import connection
 from faker import Faker
 
+TABLES = ['bonuses']
+DEPENDS_ON = ['payments']
+
 """ 
 CREATE TABLE IF NOT EXISTS bonuses (
     id_bonus UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
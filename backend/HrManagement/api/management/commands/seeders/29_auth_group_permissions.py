@@ -3,6 +3,9 @@
 
 from django.db import connection
 
+TABLES = ['auth_group_permissions']
+DEPENDS_ON = ['auth_group', 'auth_permission']
+
 GROUP_PERMISSIONS = {
     # HR Management
     "HR Manager": [
@@ -171,7 +174,9 @@ GROUP_PERMISSIONS = {
         
         "view_all_permissions", "add_group_permissions", "delete_group_permissions",
         
-        "view_analytics"
+        "view_analytics",
+        
+        "view_health"
     ],
     
     "Developer": [
@@ -270,7 +275,10 @@ GROUP_PERMISSIONS = {
         "view_all_permissions_user_group",
         
         # Analytics
-        "view_analytics"
+        "view_analytics",
+        
+        # Health
+        "view_health"
     ],
     
     "Marketing": [
@@ -4,6 +4,9 @@
 
 from django.db import connection
 
+TABLES = ['auth_permission']
+DEPENDS_ON = []
+
 PERMISSIONS = [
     ## Tipos de Certificado
     ("view_all_certificate_types", "Pode visualizar todos os tipos de certificado"),
@@ -123,6 +126,10 @@ PERMISSIONS = [
     ("update_bonus", "Pode atualizar um bônus"),
     ("delete_bonus", "Pode deletar um bônus"),
     
+    ## Processamento salarial
+    ("view_payroll_runs", "Pode visualizar os processamentos salariais"),
+    ("run_payroll", "Pode executar o processamento salarial de um mês"),
+    
     ## Cargos (Roles)
     ("view_all_roles", "Pode visualizar todos os cargos"),
     ("view_role", "Pode visualizar um cargo"),
@@ -151,6 +158,9 @@ PERMISSIONS = [
 
     ## analytics
     ("view_analytics", "Pode visualizar as análises"),
+
+    ## health
+    ("view_health", "Pode visualizar as métricas das ligações à base de dados"),
     
     ## Permissoes User Grupo
     ("view_all_permissions_user_group", "Pode visualizar todas as permissões de utilizador de grupo"),
@@ -3,6 +3,9 @@
 
 from django.db import connection
 
+TABLES = ['auth_user_groups']
+DEPENDS_ON = ['auth_user', 'employees', 'contract', 'roles']
+
 def seed(quantity=None):
     with connection.cursor() as cursor:
         # Get existing user-group mappings to avoid duplicates
@@ -31,7 +34,13 @@ def seed(quantity=None):
                     r.id_auth_group as group_id
                 FROM auth_user au
                 JOIN employees e ON e.id_auth_user = au.id
-                JOIN latest_contract_materialized_view lcv ON lcv.id_employee = e.id_employee
+                -- Read from contract itself: latest_contract_materialized_view is rebuilt only at the end of a bulk seed
+                JOIN (
+                    SELECT DISTINCT ON (id_employee) id_employee, id_role
+                    FROM contract
+                    WHERE deleted_at IS NULL
+                    ORDER BY id_employee, created_at DESC
+                ) lcv ON lcv.id_employee = e.id_employee
                 JOIN roles r ON r.id_role = lcv.id_role
                 WHERE au.is_active = true
                 AND e.deleted_at IS NULL
@@ -4,6 +4,9 @@
 
 from django.db import connection
 
+TABLES = ['departments', 'roles']
+DEPENDS_ON = ['auth_group']
+
 """ 
 CREATE TABLE IF NOT EXISTS departments (
     id_department UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
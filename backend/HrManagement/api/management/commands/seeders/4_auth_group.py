@@ -1,5 +1,8 @@
 from django.db import connection
 
+TABLES = ['auth_group']
+DEPENDS_ON = []
+
 groups = [
     # (name, description)
     ("HR Manager", "Group responsible for managing all HR functionalities."),
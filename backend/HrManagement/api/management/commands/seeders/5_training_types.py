@@ -6,6 +6,9 @@
 from django.db import connection
 from faker import Faker
 
+TABLES = ['training_types']
+DEPENDS_ON = []
+
 """ 
 CREATE TABLE IF NOT EXISTS training_types (
     id_training_type UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
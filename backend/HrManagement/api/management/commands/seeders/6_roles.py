@@ -6,6 +6,9 @@ import random
 from django.db import connection
 from faker import Faker
 
+TABLES = ['roles']
+DEPENDS_ON = ['departments', 'auth_group']
+
 """ 
 CREATE TABLE IF NOT EXISTS roles (
     id_role UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
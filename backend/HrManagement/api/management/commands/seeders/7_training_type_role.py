@@ -5,6 +5,9 @@
 from django.db import connection
 from faker import Faker
 
+TABLES = ['training_type_role']
+DEPENDS_ON = ['roles', 'training_types']
+
 """ 
 CREATE TABLE IF NOT EXISTS training_type_role (
     id_training_type UUID NOT NULL,
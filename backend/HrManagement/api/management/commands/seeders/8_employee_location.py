@@ -4,6 +4,10 @@
 
 from django.db import connection
 from faker import Faker
+from api.utils.bulk import copy_in_batches
+
+TABLES = ['employee_location']
+DEPENDS_ON = ['employees']
 
 """ 
 CREATE TABLE IF NOT EXISTS employee_location (
@@ -55,6 +59,38 @@ def seed(quantity=100):
             if (quantity >= 4) and ((_ + 1) % (quantity // 4) == 0):  # 25% checkpoints
                 print(f"Progress: {((_ + 1) / quantity) * 100:.0f}% completed.")
         
+def seed_bulk(quantity=100, batch_size=5000):
+    """
+    Bulk version of seed: one location per employee without one, loaded with COPY.
+    """
+    fake = Faker()
+    with connection.cursor() as cursor:
+        cursor.execute("""
+                        SELECT e.id_employee
+                        FROM employees e
+                        WHERE NOT EXISTS (SELECT 1 FROM employee_location el WHERE el.id_employee = e.id_employee)
+                        LIMIT %s;
+                       """, [quantity])
+        employees = [row[0] for row in cursor.fetchall()]
+
+        if not employees:
+            print("No employees found. Please create employees before running the employee_location seeder.")
+            return 0
+
+        rows = (
+            (
+                id_employee, fake.street_address(), fake.city(), fake.state_abbr(),
+                fake.country_code(representation="alpha-2"), fake.zipcode()
+            )
+            for id_employee in employees
+        )
+        return copy_in_batches(
+            cursor, 'employee_location',
+            ['id_employee', 'address', 'city', 'district', 'country', 'zip_code'],
+            rows, len(employees), batch_size
+        )
+
+
 def delete(quantity=None):
     with connection.cursor() as cursor:
         if quantity is not None and quantity > 0:
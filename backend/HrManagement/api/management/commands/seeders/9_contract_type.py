@@ -5,6 +5,9 @@
 from django.db import connection
 from faker import Faker
 
+TABLES = ['contract_type']
+DEPENDS_ON = []
+
 """ 
 CREATE TABLE IF NOT EXISTS contract_type (
     id_contract_type UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
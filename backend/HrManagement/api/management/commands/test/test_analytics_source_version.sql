@@ -0,0 +1,3 @@
+SELECT table_name, version, updated_at
+FROM analytics_source_version
+ORDER BY table_name;
@@ -0,0 +1,8 @@
+SELECT count_employees(
+    NULL::varchar,    -- name_param
+    NULL::UUID,       -- id_param
+    NULL::uuid,       -- department_id_param
+    NULL::uuid,       -- role_param
+    NULL::uuid,       -- status_param
+    NULL::varchar     -- global_search_param
+);
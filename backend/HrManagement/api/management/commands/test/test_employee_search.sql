@@ -0,0 +1,5 @@
+SELECT id_employee, full_name, search_document, groups_document
+FROM employee_search
+WHERE search_document ILIKE '%' || 'a' || '%'
+ORDER BY word_similarity('a', search_document) DESC
+LIMIT 5;
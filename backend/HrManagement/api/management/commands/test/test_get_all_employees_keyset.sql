@@ -0,0 +1,14 @@
+SELECT *
+FROM get_all_employees_keyset(
+    NULL::varchar,    -- name_param
+    NULL::UUID,       -- id_param
+    NULL::uuid,       -- department_id_param
+    NULL::uuid,       -- role_param
+    NULL::uuid,       -- status_param
+    'employee_name',  -- order_by_param
+    'ASC',            -- order_direction_param
+    NULL::varchar,    -- global_search_param
+    NULL::text,       -- cursor_key_param
+    NULL::uuid,       -- cursor_id_param
+    2                 -- limit_param
+);
@@ -0,0 +1,3 @@
+SELECT get_employee_details(
+    '12e1f7b4-a340-4f6e-b93b-6000082f852c'::UUID
+);
\ No newline at end of file
@@ -0,0 +1,35 @@
+SELECT
+    listing_order_keys(ARRAY['description', 'password', 'name', 'description']::text[], ARRAY['name', 'description'], 'name')
+        = ARRAY['description', 'name'] AS allowed_keys,
+    listing_order_keys(ARRAY['password']::text[], ARRAY['name', 'description'], 'name') = ARRAY['name'] AS unknown_key_uses_default,
+    listing_order_keys(ARRAY[ARRAY['description']]::text[], ARRAY['name', 'description'], 'name') = ARRAY['description'] AS nested_array,
+    listing_order_descs(ARRAY['description', 'password', 'name']::text[], ARRAY['desc', 'ASC']::text[], ARRAY['name', 'description'])
+        = ARRAY[TRUE, FALSE] AS order_descs,
+    listing_order_descs(NULL::text[], NULL::text[], ARRAY['name'], TRUE) = ARRAY[TRUE] AS default_desc_direction,
+    listing_order_by(ARRAY['name'], ARRAY['t.name'], ARRAY['t.id']) = concat_ws(E',\n        ',
+        'CASE WHEN order_keys[1] = ''name'' AND NOT order_descs[1] THEN t.name END ASC NULLS LAST',
+        'CASE WHEN order_keys[1] = ''name'' AND order_descs[1] THEN t.name END DESC NULLS LAST',
+        'CASE WHEN NOT order_descs[1] THEN t.id END ASC',
+        'CASE WHEN order_descs[1] THEN t.id END DESC'
+    ) AS order_by,
+    listing_search_pattern(NULL) IS NULL AS search_pattern_without_search,
+    listing_search_uuid('not-a-uuid') IS NULL AS search_not_uuid,
+    listing_search_integer('42') = 42 AS search_integer;
+
+SELECT
+    count_employees() = (SELECT COUNT(*) FROM employee_search) AS count_without_filters,
+    (SELECT COUNT(*) FROM employee_listing(NULL, NULL, NULL, NULL, NULL, NULL)) = (SELECT COUNT(*) FROM employee_search) AS no_filters;
+
+SELECT *
+FROM get_all_employees(
+    NULL::varchar,    -- name_param
+    NULL::uuid,       -- id_param
+    NULL::uuid,       -- department_id_param
+    NULL::uuid,       -- role_param
+    NULL::uuid,       -- status_param
+    ARRAY['department_name', 'employee_name']::text[],  -- order_by_param
+    ARRAY['DESC', 'ASC']::text[],                        -- order_direction_param
+    NULL::varchar,    -- global_search_param
+    2,                -- limit_param
+    0                 -- offset_param
+);
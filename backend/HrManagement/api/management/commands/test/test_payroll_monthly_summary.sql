@@ -0,0 +1,4 @@
+SELECT month, department_name, total_payments, total_employees_paid, net_payment_amount, min_payment, max_payment
+FROM payroll_monthly_summary
+ORDER BY month DESC, department_name
+LIMIT 24;
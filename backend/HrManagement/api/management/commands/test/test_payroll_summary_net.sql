@@ -0,0 +1,86 @@
+-- Processamento salarial de um funcionário com um bónus e uma dedução: o líquido do resumo é o amount do
+-- pagamento (base + bónus - dedução), sem voltar a somar os bónus e deduções associados.
+-- Falha com uma exceção se os totais não baterem certo; desfeito no fim (exceção HRT00 apanhada).
+DO $$
+DECLARE
+    employee_id UUID;
+    salary NUMERIC;
+    month_start DATE := '2099-02-01';
+    payment payments;
+    summary RECORD;
+BEGIN
+    BEGIN
+        SELECT lc.id_employee, COALESCE(ls.base_salary, 0)
+        INTO employee_id, salary
+        FROM latest_contract_materialized_view lc
+        INNER JOIN latest_contract_state_materialized_view lcs ON lcs.id_contract = lc.id_contract
+        INNER JOIN contract_state cs ON cs.id_contract_state = lcs.id_contract_state
+        INNER JOIN latest_salary_materialized_view ls ON ls.id_contract = lc.id_contract
+        INNER JOIN employees e ON e.id_employee = lc.id_employee
+        WHERE cs.state IN ('Active', 'Renewed')
+          AND e.deleted_at IS NULL
+        ORDER BY lc.id_employee
+        LIMIT 1;
+
+        IF employee_id IS NULL THEN
+            RAISE NOTICE 'test_payroll_summary_net: sem funcionários com contrato ativo';
+            RAISE EXCEPTION 'rollback' USING ERRCODE = 'HRT00';
+        END IF;
+
+        INSERT INTO bonuses (id_employee, bonus_note, amount, bonus_date)
+        VALUES (employee_id, 'test_payroll_summary_net', 100.00, month_start + 9);
+
+        WITH absence AS (
+            INSERT INTO absence_reason (id_employee, id_employee_supervisor, id_employee_substitute, name, description, start_date, end_date)
+            VALUES (employee_id, employee_id, employee_id, 'test', 'test_payroll_summary_net', month_start + 10, month_start + 10)
+            RETURNING id_absence_reason
+        )
+        INSERT INTO deductions (id_absence_reason, deduction_note, amount, deduction_date)
+        SELECT id_absence_reason, 'test_payroll_summary_net', 30.00, month_start + 10 FROM absence;
+
+        PERFORM run_payroll(
+            month_start,
+            (SELECT id_payment_method FROM payment_methods ORDER BY id_payment_method LIMIT 1),
+            employee_id
+        );
+
+        SELECT * INTO payment
+        FROM payments
+        WHERE id_employee = employee_id
+          AND payment_date BETWEEN month_start AND (month_start + INTERVAL '1 month' - INTERVAL '1 day')::date;
+
+        IF payment.amount IS DISTINCT FROM salary + 100.00 - 30.00 THEN
+            RAISE EXCEPTION 'payment amount % <> % + 100.00 - 30.00', payment.amount, salary;
+        END IF;
+
+        SELECT SUM(s.net_payment_amount) AS net, SUM(s.total_base_salary) AS base,
+               SUM(s.total_bonus_amount) AS bonus, SUM(s.total_deduction_amount) AS deduction
+        INTO summary
+        FROM payroll_monthly_summary s
+        WHERE s.month = month_start;
+
+        -- O mês só tem os pagamentos deste processamento
+        IF summary.net IS DISTINCT FROM (
+            SELECT SUM(amount) FROM payments
+            WHERE payment_date BETWEEN month_start AND (month_start + INTERVAL '1 month' - INTERVAL '1 day')::date
+              AND deleted_at IS NULL
+        ) THEN
+            RAISE EXCEPTION 'summary net % <> sum of payment amounts', summary.net;
+        END IF;
+
+        IF summary.net IS DISTINCT FROM summary.base + summary.bonus - summary.deduction THEN
+            RAISE EXCEPTION 'summary net % <> base % + bonus % - deduction %',
+                summary.net, summary.base, summary.bonus, summary.deduction;
+        END IF;
+
+        IF (SELECT amount FROM payroll_summary_payment WHERE id_payment = payment.id_payment) IS DISTINCT FROM payment.amount
+           OR (SELECT base FROM payroll_summary_payment WHERE id_payment = payment.id_payment) IS DISTINCT FROM salary THEN
+            RAISE EXCEPTION 'payroll_summary_payment of % does not match the payment', payment.id_payment;
+        END IF;
+
+        RAISE EXCEPTION 'rollback' USING ERRCODE = 'HRT00';
+    EXCEPTION WHEN SQLSTATE 'HRT00' THEN
+        NULL;
+    END;
+END;
+$$;
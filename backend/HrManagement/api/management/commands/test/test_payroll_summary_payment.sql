@@ -0,0 +1,16 @@
+-- Grupos em que o resumo incremental difere do contributo guardado de cada pagamento (deve vir vazio)
+SELECT COALESCE(s.month, f.month) AS month, COALESCE(s.department_key, f.department_key) AS department_key,
+       s.total_payments, f.total_payments AS expected_payments,
+       s.net_payment_amount, f.net_payment_amount AS expected_net_payment_amount
+FROM payroll_monthly_summary s
+FULL JOIN (
+    SELECT month, department_key, COUNT(*) AS total_payments, COUNT(DISTINCT id_employee) AS total_employees_paid,
+           SUM(amount) AS net_payment_amount, MIN(amount) AS min_payment, MAX(amount) AS max_payment
+    FROM payroll_summary_payment
+    GROUP BY month, department_key
+) f ON f.month = s.month AND f.department_key = s.department_key
+WHERE s.total_payments IS DISTINCT FROM f.total_payments
+   OR s.total_employees_paid IS DISTINCT FROM f.total_employees_paid
+   OR s.net_payment_amount IS DISTINCT FROM f.net_payment_amount
+   OR s.min_payment IS DISTINCT FROM f.min_payment
+   OR s.max_payment IS DISTINCT FROM f.max_payment;
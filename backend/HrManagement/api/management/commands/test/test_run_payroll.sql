@@ -0,0 +1,12 @@
+-- Processamento salarial de um mês sem pagamentos, desfeito no fim (ROLLBACK)
+BEGIN;
+
+SELECT id_payroll_run, month, payment_date, payments_created, bonuses_linked, deductions_linked, total_amount, duration_ms
+FROM run_payroll(
+    '2099-01-01'::date,                                                              -- month_param
+    (SELECT id_payment_method FROM payment_methods ORDER BY id_payment_method LIMIT 1), -- id_payment_method_param
+    (SELECT id_employee FROM employees ORDER BY id_employee LIMIT 1),                 -- id_employee_supervisor_param
+    '[]'::jsonb                                                                      -- extra_amounts_param
+);
+
+ROLLBACK;
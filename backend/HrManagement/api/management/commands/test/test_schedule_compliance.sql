@@ -0,0 +1,4 @@
+SELECT period_start, period_end, department_name, employees, scheduled_days, absent_days, late_days, late_minutes, missing_punches
+FROM schedule_compliance_department
+ORDER BY period_start DESC, late_minutes DESC
+LIMIT 24;
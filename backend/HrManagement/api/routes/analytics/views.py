@@ -8,6 +8,15 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from api.utils.dotenv import is_debug_mode 
 from api.utils.permissions import check_permission_decorator
 from rest_framework.decorators import action
+from datetime import date, datetime
+from api.utils.analytics_cache import (
+    ANALYTICS_SOURCES, compute_analytics, get_analytics_cache_key, get_cached_analytics,
+    get_source_versions, get_stale_analytics, store_analytics
+)
+from api.utils.parallel_queries import run_queries_in_parallel
+from api.utils.schedule_compliance import METRICS as SCHEDULE_COMPLIANCE_METRICS
+from django.core.cache import cache
+from functools import partial
 
 
 class AbsenceAnalyticsSerializer(serializers.Serializer):
@@ -43,11 +52,48 @@ class TotalEmployeesPerDepartmentSerializer(serializers.Serializer):
     total_employees = serializers.IntegerField()
 
 
+class PayrollMonthlySummarySerializer(serializers.Serializer):
+    month = serializers.DateField()
+    id_department = serializers.UUIDField(allow_null=True)
+    department_name = serializers.CharField(allow_null=True)
+    total_payments = serializers.IntegerField()
+    total_employees_paid = serializers.IntegerField()
+    total_base_salary = serializers.DecimalField(max_digits=14, decimal_places=2)
+    total_bonus_amount = serializers.DecimalField(max_digits=14, decimal_places=2)
+    total_deduction_amount = serializers.DecimalField(max_digits=14, decimal_places=2)
+    net_payment_amount = serializers.DecimalField(max_digits=14, decimal_places=2)
+    average_payment = serializers.DecimalField(max_digits=14, decimal_places=2, allow_null=True)
+    min_payment = serializers.DecimalField(max_digits=14, decimal_places=2, allow_null=True)
+    max_payment = serializers.DecimalField(max_digits=14, decimal_places=2, allow_null=True)
+    employees_with_bonus = serializers.IntegerField()
+    employees_with_deduction = serializers.IntegerField()
+
+
 class AnalyticsViewSet(ViewSet):
     if not is_debug_mode():
         authentication_classes = [JWTAuthentication]
         permission_classes = [IsAuthenticated]
 
+    # Resultado -> (view, serializer)
+    ANALYTICS_VIEWS = {
+        'current_month_payments': ('current_month_payment_analytics_view', CurrentMonthPaymentAnalyticsSerializer),
+        'top_absences': ('absence_analytics_view', AbsenceAnalyticsSerializer),
+        'department_salaries': ('salary_by_departament_view', SalaryByDepartmentSerializer),
+        'department_counts': ('total_employees_per_department_view', TotalEmployeesPerDepartmentSerializer),
+    }
+
+    def fetch_analytics(self, name, cursor):
+        """Executa a view de analytics e devolve o resultado serializado"""
+        view_name, serializer_class = self.ANALYTICS_VIEWS[name]
+        cursor.execute(f"SELECT * FROM {view_name}")
+        serializer = serializer_class(data=self.dictfetchall(cursor), many=True)
+        serializer.is_valid()
+        return [dict(row) for row in serializer.data]
+
+    def cached_analytics(self, cursor, name, versions=None):
+        """Resultado serializado de uma view de analytics, em cache até mudarem as tabelas de origem"""
+        return get_cached_analytics(cursor, name, partial(self.fetch_analytics, name), versions)
+
     def dictfetchall(self, cursor):
         """Retorna todas as linhas do cursor como dict"""
         columns = [col[0] for col in cursor.description]
@@ -61,11 +107,7 @@ class AnalyticsViewSet(ViewSet):
     def absence_analytics(self, request):
         try:
             with connection.cursor() as cursor:
-                cursor.execute("SELECT * FROM absence_analytics_view")
-                data = self.dictfetchall(cursor)
-                serializer = AbsenceAnalyticsSerializer(data=data, many=True)
-                serializer.is_valid()
-                return Response(serializer.data)
+                return Response(self.cached_analytics(cursor, 'top_absences'))
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
@@ -77,11 +119,7 @@ class AnalyticsViewSet(ViewSet):
     def current_month_payments(self, request):
         try:
             with connection.cursor() as cursor:
-                cursor.execute("SELECT * FROM current_month_payment_analytics_view")
-                data = self.dictfetchall(cursor)
-                serializer = CurrentMonthPaymentAnalyticsSerializer(data=data, many=True)
-                serializer.is_valid()
-                return Response(serializer.data)
+                return Response(self.cached_analytics(cursor, 'current_month_payments'))
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
@@ -93,11 +131,7 @@ class AnalyticsViewSet(ViewSet):
     def salary_by_department(self, request):
         try:
             with connection.cursor() as cursor:
-                cursor.execute("SELECT * FROM salary_by_departament_view")
-                data = self.dictfetchall(cursor)
-                serializer = SalaryByDepartmentSerializer(data=data, many=True)
-                serializer.is_valid()
-                return Response(serializer.data)
+                return Response(self.cached_analytics(cursor, 'department_salaries'))
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
@@ -109,54 +143,219 @@ class AnalyticsViewSet(ViewSet):
     def employees_per_department(self, request):
         try:
             with connection.cursor() as cursor:
-                cursor.execute("SELECT * FROM total_employees_per_department_view")
-                data = self.dictfetchall(cursor)
-                serializer = TotalEmployeesPerDepartmentSerializer(data=data, many=True)
-                serializer.is_valid()
-                return Response(serializer.data)
+                return Response(self.cached_analytics(cursor, 'department_counts'))
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @check_permission_decorator('view_analytics')
+    @action(detail=False, methods=['get'])
+    def payroll_monthly(self, request):
+        """
+        Resumo mensal dos pagamentos por departamento (payroll_monthly_summary).
+        URL: /api/analytics/payroll_monthly/?start_month=2024-01&end_month=2024-12&department_id=<id_department>
+        Por omissão, os últimos 12 meses.
+        """
+        try:
+            today = date.today()
+            first_month = today.year * 12 + today.month - 1 - 11
+            start_month = self.parse_month(request.query_params.get('start_month')) or date(first_month // 12, first_month % 12 + 1, 1)
+            end_month = self.parse_month(request.query_params.get('end_month')) or date(today.year, today.month, 1)
+        except ValueError:
+            return Response({'error': 'Invalid month. Use YYYY-MM.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        department_id = request.query_params.get('department_id', None)
+        department_condition = "AND id_department = %s" if department_id else ""
+        params = [start_month, end_month] + ([department_id] if department_id else [])
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    SELECT month, id_department, department_name, total_payments, total_employees_paid,
+                           total_base_salary, total_bonus_amount, total_deduction_amount, net_payment_amount,
+                           ROUND(net_payment_amount / NULLIF(total_payments, 0), 2) AS average_payment,
+                           min_payment, max_payment, employees_with_bonus, employees_with_deduction
+                    FROM payroll_monthly_summary
+                    WHERE month BETWEEN %s AND %s {department_condition}
+                    ORDER BY month, department_name
+                    """,
+                    params
+                )
+                departments = self.dictfetchall(cursor)
+
+                # Totais de cada mês (todos os departamentos). Os funcionários distintos do mês vêm de
+                # payroll_monthly_employees: somar os departamentos contaria duas vezes quem foi pago em dois
+                employees_paid = "SUM(s.total_employees_paid)" if department_id else "COALESCE(MAX(m.total_employees_paid), 0)"
+                cursor.execute(
+                    f"""
+                    SELECT s.month, NULL::uuid AS id_department, NULL AS department_name,
+                           SUM(total_payments) AS total_payments, {employees_paid} AS total_employees_paid,
+                           SUM(total_base_salary) AS total_base_salary, SUM(total_bonus_amount) AS total_bonus_amount,
+                           SUM(total_deduction_amount) AS total_deduction_amount, SUM(net_payment_amount) AS net_payment_amount,
+                           ROUND(SUM(net_payment_amount) / NULLIF(SUM(total_payments), 0), 2) AS average_payment,
+                           MIN(min_payment) AS min_payment, MAX(max_payment) AS max_payment,
+                           SUM(employees_with_bonus) AS employees_with_bonus, SUM(employees_with_deduction) AS employees_with_deduction
+                    FROM payroll_monthly_summary s
+                    LEFT JOIN payroll_monthly_employees m ON m.month = s.month
+                    WHERE s.month BETWEEN %s AND %s {department_condition}
+                    GROUP BY s.month
+                    ORDER BY s.month
+                    """,
+                    params
+                )
+                months = self.dictfetchall(cursor)
+
+            return Response({
+                'start_month': start_month,
+                'end_month': end_month,
+                'months': PayrollMonthlySummarySerializer(months, many=True).data,
+                'departments': PayrollMonthlySummarySerializer(departments, many=True).data
+            })
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @check_permission_decorator('view_analytics')
+    @action(detail=False, methods=['get'])
+    def schedule_compliance(self, request):
+        """
+        Cumprimento do horário por departamento e os funcionários com pior resultado (schedule_compliance).
+        URL: /api/analytics/schedule_compliance/?period_start=2024-12-01&period_end=2024-12-31&department_id=<id_department>&order_by=late_minutes&limit=50
+        Por omissão, o último período calculado pelo comando schedule_compliance.
+        """
+        order_by = request.query_params.get('order_by', 'late_minutes')
+        if order_by not in SCHEDULE_COMPLIANCE_METRICS:
+            return Response({'error': f"Invalid order_by. Use one of: {', '.join(SCHEDULE_COMPLIANCE_METRICS)}."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            period_start = request.query_params.get('period_start', None)
+            period_end = request.query_params.get('period_end', None)
+            period_start = datetime.strptime(period_start, '%Y-%m-%d').date() if period_start else None
+            period_end = datetime.strptime(period_end, '%Y-%m-%d').date() if period_end else None
+            limit = int(request.query_params.get('limit', 50))
+        except ValueError:
+            return Response({'error': 'Invalid period or limit. Use YYYY-MM-DD and an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        department_id = request.query_params.get('department_id', None)
+        department_condition = "AND sc.id_department = %s" if department_id else ""
+        metrics = ', '.join(f"sc.{metric}" for metric in SCHEDULE_COMPLIANCE_METRICS)
+
+        try:
+            with connection.cursor() as cursor:
+                if not (period_start and period_end):
+                    cursor.execute(
+                        """
+                        SELECT period_start, period_end
+                        FROM schedule_compliance_department
+                        ORDER BY computed_at DESC
+                        LIMIT 1
+                        """
+                    )
+                    latest = cursor.fetchone()
+                    if not latest:
+                        return Response({'error': 'No schedule compliance computed yet.'}, status=status.HTTP_404_NOT_FOUND)
+                    period_start, period_end = latest
+
+                params = [period_start, period_end] + ([department_id] if department_id else [])
+                cursor.execute(
+                    f"""
+                    SELECT sc.id_department, sc.department_name, sc.employees, {metrics}, sc.computed_at
+                    FROM schedule_compliance_department sc
+                    WHERE sc.period_start = %s AND sc.period_end = %s {department_condition}
+                    ORDER BY sc.{order_by} DESC, sc.department_name
+                    """,
+                    params
+                )
+                departments = self.dictfetchall(cursor)
+
+                cursor.execute(
+                    f"""
+                    SELECT sc.id_employee, u.first_name, u.last_name, sc.id_department, {metrics}
+                    FROM schedule_compliance sc
+                    INNER JOIN employees e ON e.id_employee = sc.id_employee
+                    INNER JOIN auth_user u ON u.id = e.id_auth_user
+                    WHERE sc.period_start = %s AND sc.period_end = %s {department_condition}
+                    ORDER BY sc.{order_by} DESC, u.first_name, u.last_name
+                    LIMIT %s
+                    """,
+                    params + [limit]
+                )
+                employees = self.dictfetchall(cursor)
+
+            return Response({
+                'period_start': period_start,
+                'period_end': period_end,
+                'order_by': order_by,
+                'departments': departments,
+                'employees': employees
+            })
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def parse_month(self, value):
+        """Converte YYYY-MM no primeiro dia do mês"""
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m').date()
+
     @check_permission_decorator('view_analytics')
     def list(self, request):
         """
         Retorna um resumo geral para o dashboard combinando todas as views
         """
         try:
+            # Uma só leitura das versões das tabelas de origem; cada resultado vem do cache se não mudou
             with connection.cursor() as cursor:
-                # Dados de pagamento do mês atual
-                cursor.execute("SELECT * FROM current_month_payment_analytics_view")
-                payment_data = self.dictfetchall(cursor)
-                payment_serializer = CurrentMonthPaymentAnalyticsSerializer(data=payment_data, many=True)
-                payment_serializer.is_valid()
+                versions = get_source_versions(
+                    cursor, {table for tables in ANALYTICS_SOURCES.values() for table in tables}
+                )
 
-                # Top 5 funcionários com mais ausências
-                cursor.execute("SELECT * FROM absence_analytics_view")
-                absence_data = self.dictfetchall(cursor)
-                absence_serializer = AbsenceAnalyticsSerializer(data=absence_data, many=True)
-                absence_serializer.is_valid()
+            data, meta, missing = {}, {}, []
+            for name in self.ANALYTICS_VIEWS:
+                result = cache.get(get_analytics_cache_key(name, versions))
+                if result is None:
+                    missing.append(name)
+                else:
+                    data[name] = result
+                    meta[name] = {'cached': True, 'stale': False, 'error': None}
 
-                # Dados de salário por departamento
-                cursor.execute("SELECT * FROM salary_by_departament_view")
-                salary_data = self.dictfetchall(cursor)
-                salary_serializer = SalaryByDepartmentSerializer(data=salary_data, many=True)
-                salary_serializer.is_valid()
+            # Os que não estão em cache correm em paralelo, cada um na sua ligação e com timeout próprio;
+            # cada um relê as versões no snapshot da sua query e fica em cache com essa chave
+            outcomes = run_queries_in_parallel({
+                name: partial(compute_analytics, name=name, compute=partial(self.fetch_analytics, name))
+                for name in missing
+            }) if missing else {}
+
+            for name, outcome in outcomes.items():
+                if outcome['error'] is None:
+                    key, result = outcome['result']
+                    store_analytics(name, key, result)
+                    data[name] = result
+                    meta[name] = {'cached': False, 'stale': False, 'error': None, 'elapsed_ms': outcome['elapsed_ms']}
+                else:
+                    # Resultado parcial: o último valor conhecido (stale) ou vazio, com o erro
+                    stale = get_stale_analytics(name)
+                    data[name] = stale if stale is not None else []
+                    meta[name] = {'cached': False, 'stale': stale is not None, 'error': outcome['error']}
 
+            return Response({
+                # Dados de pagamento do mês atual
+                'current_month_payments': data['current_month_payments'],
+                # Top 5 funcionários com mais ausências
+                'top_absences': data['top_absences'],
+                # Dados de salário por departamento
+                'department_salaries': data['department_salaries'],
                 # Total de funcionários por departamento
-                cursor.execute("SELECT * FROM total_employees_per_department_view")
-                dept_data = self.dictfetchall(cursor)
-                dept_serializer = TotalEmployeesPerDepartmentSerializer(data=dept_data, many=True)
-                dept_serializer.is_valid()
-
-                return Response({
-                    'current_month_payments': payment_serializer.data,
-                    'top_absences': absence_serializer.data,
-                    'department_salaries': salary_serializer.data,
-                    'department_counts': dept_serializer.data
-                })
+                'department_counts': data['department_counts'],
+                'meta': meta
+            })
 
         except Exception as e:
             return Response(
@@ -3,7 +3,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from bson import ObjectId  
+from pymongo.errors import DuplicateKeyError
 from api.utils.mongo_client import get_mongo_db
+from api.utils.attendance import ingest_attendance_events, MAX_EVENTS
 from datetime import datetime
 
 from api.utils.dotenv import is_debug_mode 
@@ -82,63 +84,70 @@ class AttendanceViewSet(ViewSet):
     def create(self, request):
         db = get_mongo_db()
         collection = db['attendance']
-        date = datetime.now().date()
 
         try:
             data = request.data
             id_employee = request.auth['sub']
             date = datetime.now().date().strftime("%Y-%m-%d")
-            print(date)
-
-            existing_record = collection.find_one({"id_employee": id_employee, "date": date})
-
-            if existing_record:
-                sessions = existing_record.get('sessions', [])
-
-                if 'checkin' in data:
-                    """ for session in sessions:
-                        last_checkin_time = datetime.strptime(session['checkin'], "%H:%M:%S")
-                        new_checkin_time = datetime.strptime(data['checkin'], "%H:%M:%S")
-
-                        if abs((new_checkin_time - last_checkin_time).total_seconds()) < 180:
-                            return Response({'detail': 'Check-in já registrado recentemente para essa data.'}, status=status.HTTP_200_OK) """
-
-                    new_session = {
-                        'checkin': data['checkin'],
-                        'checkout': None  
-                    }
-                    sessions.append(new_session)
-
-                elif 'checkout' in data:
-                    for session in sessions:
-                        if 'checkin' in session and session['checkout'] is None:
-                            session['checkout'] = data['checkout']
-                            break
-                
-                collection.update_one(
-                    {"_id": existing_record["_id"]},
-                    {"$set": {"sessions": sessions}}
-                )
-                return Response({'detail': 'Sessão atualizada com sucesso!'}, status=status.HTTP_200_OK)
-
-            else:
-                if 'checkin' not in data:
-                    return Response({'detail': 'O check-in é obrigatório ao criar uma nova entrada.'}, status=status.HTTP_400_BAD_REQUEST)
 
+            if 'checkin' in data:
+                # Upsert com $push: abre a sessão (e cria o documento do dia) numa só operação
                 new_session = {
                     'checkin': data['checkin'],
                     'checkout': None
                 }
+                for attempt in range(2):
+                    try:
+                        result = collection.update_one(
+                            {"id_employee": id_employee, "date": date},
+                            {
+                                "$push": {"sessions": new_session},
+                                "$setOnInsert": {"id_employee": id_employee, "date": date}
+                            },
+                            upsert=True
+                        )
+                        break
+                    except DuplicateKeyError:
+                        # Dois upserts concorrentes do mesmo dia: o segundo passa a encontrar o documento
+                        if attempt:
+                            raise
+
+                if result.upserted_id is not None:
+                    return Response({'id': str(result.upserted_id)}, status=status.HTTP_201_CREATED)
+                return Response({'detail': 'Sessão atualizada com sucesso!'}, status=status.HTTP_200_OK)
 
-                new_data = {
-                    'id_employee': id_employee,
-                    'date': date,
-                    'sessions': [new_session]  
-                }
+            elif 'checkout' in data:
+                # Fecha a primeira sessão em aberto ($ posicional) numa só operação
+                document = collection.find_one_and_update(
+                    {"id_employee": id_employee, "date": date, "sessions.checkout": None},
+                    {"$set": {"sessions.$.checkout": data['checkout']}},
+                    projection={'_id': 1}
+                )
+                if document is None:
+                    return Response({'detail': 'Não existe nenhum check-in em aberto para esta data.'}, status=status.HTTP_400_BAD_REQUEST)
+                return Response({'detail': 'Sessão atualizada com sucesso!'}, status=status.HTTP_200_OK)
+
+            return Response({'detail': 'O check-in é obrigatório ao criar uma nova entrada.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-                result = collection.insert_one(new_data)
-                return Response({'id': str(result.inserted_id)}, status=status.HTTP_201_CREATED)
+    """
+        Bulk ingestion for badge terminals e.g POST attendance/bulk/
+        {"events": [{"id_employee": "...", "date": "2024-12-26", "time": "09:00:00", "direction": "in"}, ...]}
+    """
+    @check_permission_decorator('create_attendance')
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        events = request.data.get('events') if isinstance(request.data, dict) else request.data
+        if not isinstance(events, list) or not events:
+            return Response({'detail': 'É necessária uma lista de eventos.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(events) > MAX_EVENTS:
+            return Response({'detail': f'Máximo de {MAX_EVENTS} eventos por pedido.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            db = get_mongo_db()
+            return Response(ingest_attendance_events(db['attendance'], events), status=status.HTTP_200_OK)
         except Exception as e:
             return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
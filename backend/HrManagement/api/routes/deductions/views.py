@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from django.db import connection
+from api.utils.streaming import STREAM_RENDERER_CLASSES, get_stream_format, stream_query
 from datetime import datetime
 
 from api.utils.dotenv import is_debug_mode
@@ -11,6 +12,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 class DeductionsViewSet(ViewSet):
+    renderer_classes = STREAM_RENDERER_CLASSES
+
     if not is_debug_mode():
         authentication_classes = [JWTAuthentication]
         permission_classes = [IsAuthenticated]
@@ -29,14 +32,24 @@ class DeductionsViewSet(ViewSet):
             INNER JOIN payments p ON d.id_payment = p.id_payment
             INNER JOIN absence_reason ar ON d.id_absence_reason = ar.id_absence_reason
         """
+        params = []
+        conditions = []
+
         if id_payment:
-            query += " WHERE p.id_payment = %s"
-            params = [id_payment]
+            conditions.append("p.id_payment = %s")
+            params.append(id_payment)
         if id_employee:
-            query += " WHERE ar.id_employee = %s ORDER BY d.deduction_date DESC"
-            params = [id_employee]
-        else:
-            params = []
+            conditions.append("ar.id_employee = %s")
+            params.append(id_employee)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if id_employee:
+            query += " ORDER BY d.deduction_date DESC"
+
+        stream_format = get_stream_format(request)
+        if stream_format:
+            return stream_query(query, params, stream_format)
 
         with connection.cursor() as cursor:
             cursor.execute(query, params)
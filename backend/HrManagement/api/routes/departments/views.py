@@ -52,41 +52,18 @@ class DepartmentViewSet(ViewSet):
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
 
-                departments = {}
                 total_count = rows[0][-1] if rows else 0
 
-                for row in rows:
-                    department_id = row[0]
-                    if department_id not in departments:
-                        departments[department_id] = {
-                            'id_department': row[0],
-                            'name': row[1],
-                            'description': row[2],
-                            'roles': {}
-                        }
-
-                    role_id = row[3]
-                    if role_id and role_id not in departments[department_id]['roles']:
-                        departments[department_id]['roles'][role_id] = {
-                            'id_role': row[3],
-                            'role_name': row[4],
-                            'hex_color': row[5],
-                            'description': row[6],
-                            'training_types': []
-                        }
-
-                    if row[7]:  # If training type exists
-                        departments[department_id]['roles'][role_id]['training_types'].append({
-                            'id_training_type': row[7],
-                            'name': row[8],
-                            'description': row[9],
-                            'hours': row[10]
-                        })
-
-                for department in departments.values():
-                    department['roles'] = list(department['roles'].values())
-
-                department_list = list(departments.values())
+                # One row per department: roles (with their training_types) already come aggregated (JSON) from get_all_departments
+                department_list = [
+                    {
+                        'id_department': row[0],
+                        'name': row[1],
+                        'description': row[2],
+                        'roles': row[3]
+                    }
+                    for row in rows
+                ]
 
                 return Response({
                     'departments': department_list,
@@ -8,15 +8,72 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from api.utils.dotenv import is_debug_mode 
 
 from django.db import connection
+from django.http import HttpResponse
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from django.contrib.auth.models import User
 from django.contrib.auth.models import Permission
 from django.contrib.auth.models import Group
 from api.utils.permissions import check_permission_decorator
+from api.utils.pagination import encode_cursor, decode_cursor, get_cached_count, get_estimated_count
+from api.utils.prepared_statements import register_query
 
 from .serializers import UpdateSerializer
 
+# Hot queries: prepared once per connection (see api.utils.prepared_statements)
+GET_ALL_EMPLOYEES = register_query(
+    'get_all_employees',
+    ['varchar', 'uuid', 'uuid', 'uuid', 'uuid', 'text', 'text', 'varchar', 'integer', 'integer'],
+    """
+    SELECT *
+        FROM get_all_employees(
+            %s,    -- name_param
+            %s,    -- id_param
+            %s,    -- department_id_param
+            %s,    -- role_param
+            %s,    -- status_param
+            ARRAY[%s]::text[],   -- order_by_param
+            ARRAY[%s]::text[],  -- order_direction_param
+            %s,    -- global_search_param
+            %s,    -- limit_param
+            %s     -- offset_param
+        );
+    """
+)
+
+GET_ALL_EMPLOYEES_KEYSET = register_query(
+    'get_all_employees_keyset',
+    ['varchar', 'uuid', 'uuid', 'uuid', 'uuid', 'text', 'text', 'varchar', 'text', 'uuid', 'integer'],
+    """
+    SELECT *
+        FROM get_all_employees_keyset(
+            %s,    -- name_param
+            %s,    -- id_param
+            %s,    -- department_id_param
+            %s,    -- role_param
+            %s,    -- status_param
+            %s,    -- order_by_param
+            %s,    -- order_direction_param
+            %s,    -- global_search_param
+            %s,    -- cursor_key_param
+            %s,    -- cursor_id_param
+            %s     -- limit_param
+        );
+    """
+)
+
+COUNT_EMPLOYEES = register_query(
+    'count_employees',
+    ['varchar', 'uuid', 'uuid', 'uuid', 'uuid', 'varchar'],
+    "SELECT count_employees(%s, %s, %s, %s, %s, %s);"
+)
+
+GET_EMPLOYEE_DETAILS = register_query(
+    'get_employee_details',
+    ['uuid'],
+    "SELECT get_employee_details(%s)::text;"
+)
+
 class EmployeeInstanceMock:
     def __init__(self, id_auth_user, id_employee):
         self.id_auth_user = id_auth_user
@@ -43,68 +100,36 @@ class EmployeeViewSet(viewsets.ViewSet):
         department_id = request.GET.get('department_id', None)
         role_id = request.GET.get('role_id', None)
         status_id = request.GET.get('status_id', None)
-        order_by = request.GET.get('order_by', 'first_name')
+        global_search = request.GET.get('global_search', None)
+        global_search = None if global_search == '' else global_search
+
+        # Searches are ranked by relevance unless another ordering is requested
+        order_by = request.GET.get('order_by', 'relevance' if global_search else 'first_name')
         order_direction = request.GET.get('order_direction', 'ASC')
         
         limit = int(request.GET.get('limit', 5))
         offset = int(request.GET.get('offset', 0))
-        
-        global_search = request.GET.get('global_search', None)
-        global_search = None if global_search == '' else global_search
+
+        # exact | cached | approximate | none
+        count_mode = request.GET.get('count', 'exact')
+
+        filters = [name, id_param, department_id, role_id, status_id, global_search]
 
         with connection.cursor() as cursor:
             try:
-                cursor.execute(
-                    """
-                    SELECT *
-                        FROM get_all_employees(
-                            %s,    -- name_param
-                            %s,    -- id_param
-                            %s,    -- department_id_param
-                            %s,    -- role_param
-                            %s,    -- status_param
-                            ARRAY[%s]::text[],   -- order_by_param
-                            ARRAY[%s]::text[],  -- order_direction_param
-                            %s::varchar    -- global_search_param
-                        )
-                        LIMIT %s
-                        OFFSET %s;
-                    """,
+                # Cursor (keyset) pagination: /employees/?cursor= for the first page, then ?cursor=<next_cursor>
+                if 'cursor' in request.GET:
+                    return self.list_by_cursor(request, cursor, filters, order_by, order_direction, limit, count_mode)
+
+                GET_ALL_EMPLOYEES.execute(
+                    cursor,
                     [name, id_param, department_id, role_id, status_id, order_by, order_direction, global_search, limit, offset]
                 )
                 rows = cursor.fetchall()
 
-                employee_data = [
-                    {
-                        'id': emp[0],
-                        'employee_name': emp[1],
-                        'role_name': emp[2],
-                        'role_hex_color': emp[3],
-                        'department_name': emp[4],
-                        'state_name': emp[5],
-                        'state_icon': emp[6],
-                        'state_hex_color': emp[7]
-                    }
-                    for emp in rows
-                ]
-                
-                cursor.execute(
-                    """
-                    SELECT count(*)
-                        FROM get_all_employees(
-                            %s,    -- name_param
-                            %s,    -- id_param
-                            %s,    -- department_id_param
-                            %s,    -- role_param
-                            %s,    -- status_param
-                            ARRAY[%s]::text[],   -- order_by_param
-                            ARRAY[%s]::text[],  -- order_direction_param
-                            %s::varchar    -- global_search_param
-                        );
-                    """,
-                    [name, id_param, department_id, role_id, status_id, order_by, order_direction, global_search]
-                )
-                total_count = cursor.fetchone()[0]
+                employee_data = [self.employee_row_to_dict(emp) for emp in rows]
+
+                total_count = self.get_total_count(cursor, filters, count_mode)
             except Exception as e:
                 return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
@@ -112,6 +137,78 @@ class EmployeeViewSet(viewsets.ViewSet):
             'employees': employee_data,
             'total_count': total_count,
         }, status=status.HTTP_200_OK)
+
+    def list_by_cursor(self, request, cursor, filters, order_by, order_direction, limit, count_mode):
+        try:
+            position = decode_cursor(request.GET.get('cursor'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # The ordering travels inside the cursor so later pages stay consistent
+        if position:
+            order_by = position.get('order_by', order_by)
+            order_direction = position.get('order_direction', order_direction)
+
+        # One extra row tells whether there is a next page
+        GET_ALL_EMPLOYEES_KEYSET.execute(
+            cursor,
+            filters[:5] + [order_by, order_direction, filters[5],
+                           position['key'] if position else None,
+                           position['id'] if position else None,
+                           limit + 1]
+        )
+        rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor({
+                'key': last[8],
+                'id': last[0],
+                'order_by': order_by,
+                'order_direction': order_direction,
+            })
+
+        return Response({
+            'employees': [self.employee_row_to_dict(emp) for emp in rows],
+            'next_cursor': next_cursor,
+            'total_count': self.get_total_count(cursor, filters, count_mode),
+        }, status=status.HTTP_200_OK)
+
+    def get_total_count(self, cursor, filters, count_mode):
+        """
+        exact: COUNT over the filtered employees (no ordering nor GROUP BY).
+        cached: same as exact, reused for COUNT_CACHE_TIMEOUT seconds.
+        approximate: planner estimate when there are no filters (falls back to cached otherwise).
+        none: skip the count.
+        """
+        if count_mode == 'none':
+            return None
+
+        if count_mode == 'approximate' and not any(filters):
+            return get_estimated_count(cursor, 'employees')
+
+        def count_employees():
+            COUNT_EMPLOYEES.execute(cursor, filters)
+            return cursor.fetchone()[0]
+
+        if count_mode == 'exact':
+            return count_employees()
+
+        return get_cached_count('employees', filters, count_employees)
+
+    def employee_row_to_dict(self, emp):
+        return {
+            'id': emp[0],
+            'employee_name': emp[1],
+            'role_name': emp[2],
+            'role_hex_color': emp[3],
+            'department_name': emp[4],
+            'state_name': emp[5],
+            'state_icon': emp[6],
+            'state_hex_color': emp[7]
+        }
     
     """ 
     retrieve an employee by id
@@ -121,179 +218,17 @@ class EmployeeViewSet(viewsets.ViewSet):
     def retrieve(self, request, pk=None):
         with connection.cursor() as cursor:
             try:
-                # Retrieve employee details
-                cursor.execute(
-                    """
-                    SELECT * FROM get_employees_by_id(%s);
-                    """,
-                    [pk]
-                )
+                # The whole profile document is built by the database in one round trip
+                GET_EMPLOYEE_DETAILS.execute(cursor, [pk])
                 employee = cursor.fetchone()
-
-                if not employee:
-                    return Response({'error': 'Employee not found'}, status=status.HTTP_404_NOT_FOUND)
-
-                # Retrieve latest contract
-                cursor.execute(
-                    """
-                    SELECT c.id_contract, c.created_at, c.updated_at, ct.id_contract_type, ct.contract_type_name, ct.description
-                    FROM latest_contract_materialized_view c
-                    INNER JOIN contract_type ct ON c.id_contract_type = ct.id_contract_type
-                    WHERE c.id_employee = %s
-                    ORDER BY c.created_at DESC
-                    LIMIT 1;
-                    """,
-                    [pk]
-                )
-                contract = cursor.fetchone()
-
-                # Retrieve contract state history
-                cursor.execute(
-                    """
-                    SELECT contract_state_contract.id_contract_state_contract, contract_state_contract.id_contract_state, contract_state.state, contract_state.description, contract_state.hex_color, contract_state.icon
-                    FROM contract_state_contract
-                    INNER JOIN contract_state ON contract_state_contract.id_contract_state = contract_state.id_contract_state
-                    ORDER BY contract_state_contract.created_at DESC
-                    LIMIT 1;
-                    """
-                )
-                contract_state = cursor.fetchone()
-
-                # Retrieve trainings
-                cursor.execute(
-                    """
-                    SELECT t.id_training, t.start_date, t.end_date, tt.id_training_type, tt.name, tt.description, tt.hours
-                    FROM trainings t
-                    INNER JOIN training_types tt ON t.id_training_type = tt.id_training_type
-                    WHERE t.id_employee = %s;
-                    """,
-                    [pk]
-                )
-                trainings = cursor.fetchall()
-
-                # Retrieve certifications
-                cursor.execute(
-                    """
-                    SELECT c.id_certification, c.issue_date, c.expiration_date, ct.id_certificate_type, ct.name, ct.description, c.issuing_organization, ct.icon, ct.hex_color
-                    FROM certifications c
-                    INNER JOIN certificate_types ct ON c.id_certificate_type = ct.id_certificate_type
-                    WHERE c.id_employee = %s;
-                    """,
-                    [pk]
-                )
-                certifications = cursor.fetchall()
-
-                # Retrieve department details
-                cursor.execute(
-                    """
-                    SELECT d.*
-                    FROM departments d
-                    INNER JOIN roles r ON d.id_department = r.id_department
-                    WHERE r.id_role = %s;
-                    """,
-                    [employee[7]]
-                )
-                department = cursor.fetchone()
-
-                # Retrive salary details
-                cursor.execute(
-                    """
-                    SELECT latest_salary_materialized_view.id_salary_history, latest_salary_materialized_view.id_employee_aproved_by, latest_salary_materialized_view.base_salary, latest_salary_materialized_view.extra_hour_rate, latest_salary_materialized_view.start_date
-                    FROM latest_salary_materialized_view
-                    WHERE id_contract = %s
-                    ORDER BY created_at DESC
-                    LIMIT 1;
-                    """,
-                    [contract[0]] if contract else [None]
-                )
-                salary = cursor.fetchone()
-
             except Exception as e:
                 return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Organize data into structured JSON
-        employee_data = {
-            'id_employee': employee[0],
-            'employee_name': employee[1],
-            'phone': employee[2],
-            'photo': employee[3],
-            'email': employee[4],
-            'birth_date': employee[5],
-            'date_joined': employee[6],
-            'location': {
-                'city': employee[16],
-                'country': employee[17],
-                'district': employee[18],
-                'address': employee[19],
-                'zip_code': employee[20],
-            },
-            'contract': {
-                'id_contract': contract[0] if contract else None,
-                'created_at': contract[1] if contract else None,
-                'salary': {
-                    'id:_salary': salary[0] if salary else None,
-                    'id_aproved_by': salary[1] if salary else None,
-                    'base_salary': salary[2] if salary else None,
-                    'extra_hour_rate': salary[3] if salary else None,
-                    'start_date': salary[4] if salary else None,
-                },
-                'contract_type': {
-                    'id_contract_type': contract[3] if contract else None,
-                    'contract_type_name': contract[4] if contract else None,
-                    'description': contract[5] if contract else None,
-                },
-                'contract_state': {
-                    'id_contract_state_contract': contract_state[0] if contract_state else None,
-                    'id_contract_state': contract_state[1] if contract_state else None,
-                    'state_name': contract_state[2] if contract_state else None,
-                    'description': contract_state[3] if contract_state else None,
-                    'hex_color': contract_state[4] if contract_state else None,
-                    'icon': contract_state[5] if contract_state else None,
-                },
-                'role': {
-                    'id_role': employee[7],
-                    'role_name': employee[8],
-                    'hex_color': employee[9],
-                    'description': employee[10],
-                },
-                'department': {
-                    'id_department': department[0] if department else None,
-                    'department_name': department[1] if department else None,
-                    'description': department[2] if department else None,
-                },
-                'created_at': contract[1] if contract else None,
-            },
-            'trainings': [
-                {
-                    'id_training': training[0] if training else None,
-                    'start_date': training[1] if training else None,
-                    'end_date': training[2] if training else None,
-                    'training_type': {
-                        'id_training_type': training[3] if training else None,
-                        'training_type_name': training[4] if training else None,
-                        'description': training[5] if training else None,
-                        'hours': training[6] if training else None,
-                    }
-                } for training in trainings if trainings
-            ],
-            'certifications': [
-                {
-                    'id_certification': cert[0] if cert else None,
-                    'issue_date': cert[1] if cert else None,
-                    'expiration_date': cert[2] if cert else None,
-                    'certificate_type': {
-                        'id_certificate_type': cert[3] if cert else None,
-                        'certificate_type_name': cert[4] if cert else None,
-                        'description': cert[5] if cert else None,
-                        'icon': cert[7] if cert else None,
-                        'hex_color': cert[8] if cert else None,
-                    },
-                    'issuing_organization': cert[6] if cert else None,
-                } for cert in certifications if certifications
-            ]
-        }
+        if not employee or employee[0] is None:
+            return Response({'error': 'Employee not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        return Response(employee_data, status=status.HTTP_200_OK)
+        # Already serialized JSON, sent as is
+        return HttpResponse(employee[0], content_type='application/json', status=status.HTTP_200_OK)
 
         
     """ 
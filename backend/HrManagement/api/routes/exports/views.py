@@ -0,0 +1,66 @@
+import tempfile
+from datetime import datetime
+from django.http import FileResponse, StreamingHttpResponse
+from rest_framework.viewsets import ViewSet
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from api.utils.dotenv import is_debug_mode
+from api.utils.permissions import check_permission
+from api.utils.exports import DATASETS, EXPORT_FORMATS, export_parquet, stream_csv_export
+
+
+class ExportsViewSet(ViewSet):
+    if not is_debug_mode():
+        authentication_classes = [JWTAuthentication]
+        permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        """
+        URL: /api/exports/
+        """
+        return Response({
+            name: {'filters': list(dataset.get('filters', dataset.get('arguments', [])))}
+            for name, dataset in DATASETS.items()
+        }, status=status.HTTP_200_OK)
+
+    def retrieve(self, request, pk=None):
+        """
+        URL: /api/exports/<dataset>/?output=csv|parquet&<filters of the dataset>
+        e.g /api/exports/payments/?output=csv&date_from=2024-12-01&date_to=2024-12-31
+        """
+        dataset = DATASETS.get(pk)
+        if dataset is None:
+            return Response({'detail': f"Dataset '{pk}' not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        response = check_permission(request.user, dataset['permission'], request.auth)
+        if response:
+            return response
+
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            return Response({'detail': f"output must be one of: {', '.join(EXPORT_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = request.query_params.dict()
+        filename = f"{pk}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output}"
+
+        try:
+            if output == 'csv':
+                response = StreamingHttpResponse(stream_csv_export(pk, filters), content_type='text/csv')
+                response['Content-Disposition'] = f'attachment; filename="{filename}"'
+                return response
+
+            # Parquet needs the whole file (the footer is written last): built on disk, then streamed
+            parquet_file = tempfile.TemporaryFile()
+            try:
+                export_parquet(parquet_file, pk, filters)
+            except Exception:
+                parquet_file.close()
+                raise
+            parquet_file.seek(0)
+            return FileResponse(parquet_file, as_attachment=True, filename=filename, content_type='application/vnd.apache.parquet')
+        except ImportError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        except Exception as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
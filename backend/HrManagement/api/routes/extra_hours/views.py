@@ -3,6 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from api.utils.mongo_client import get_mongo_db
+from api.utils.streaming import STREAM_RENDERER_CLASSES, get_stream_format, stream_documents, stream_rows
+from api.utils.payroll import iter_extra_hours_pay, parse_month
 from datetime import datetime
 
 from api.utils.dotenv import is_debug_mode 
@@ -12,6 +14,8 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 
 
 class ExtraHoursViewSet(ViewSet):
+    renderer_classes = STREAM_RENDERER_CLASSES
+
     if not is_debug_mode():
         authentication_classes = [JWTAuthentication]
         permission_classes = [IsAuthenticated]
@@ -24,10 +28,32 @@ class ExtraHoursViewSet(ViewSet):
         db = get_mongo_db()
         collection = db['extrahours']
 
+        stream_format = get_stream_format(request)
+        if stream_format:
+            return stream_documents(collection.find({}, {'_id': 0}), stream_format)
+
         documents = list(collection.find({}, {'_id': 0}))
 
         return Response(documents, status=status.HTTP_200_OK)
 
+    @check_permission_decorator('view_all_extra_hours')
+    @action(detail=False, methods=['get'])
+    def pay(self, request):
+        """
+        Valor das horas extra de cada funcionário num mês (horas agregadas no MongoDB x extra_hour_rate).
+        URL: /api/extra_hours/pay/?month=2024-12
+        """
+        try:
+            month = parse_month(request.query_params.get('month') or datetime.now().strftime('%Y-%m'))
+        except ValueError:
+            return Response({'detail': 'Invalid month. Use YYYY-MM.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        stream_format = get_stream_format(request)
+        if stream_format:
+            return stream_rows(iter_extra_hours_pay(month), stream_format)
+
+        return Response(list(iter_extra_hours_pay(month)), status=status.HTTP_200_OK)
+
     @check_permission_decorator('view_extra_hours')
     def retrieve(self, request, pk=None):
         db = get_mongo_db()
@@ -19,9 +19,9 @@ class GroupPermissionsViewUserSet(ViewSet):
         """
         List all employees with their groups and permissions.
         """
-        order_by = request.GET.get('order_by', 'name')
-        order_direction = request.GET.get('order_direction', 'ASC')
         global_search = request.GET.get('global_search', None)
+        order_by = request.GET.get('order_by', 'relevance' if global_search else 'name')
+        order_direction = request.GET.get('order_direction', 'ASC')
         limit = request.GET.get('limit', None)
         offset = request.GET.get('offset', None)
 
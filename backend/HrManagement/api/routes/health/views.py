@@ -0,0 +1,30 @@
+from django.db import connection
+from rest_framework.viewsets import ViewSet
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from api.utils.dotenv import is_debug_mode
+from api.utils.permissions import check_permission_decorator
+from api.utils.mongo_client import get_mongo_pool_metrics
+from api.utils.database_pool import get_database_pool_metrics
+from api.utils.prepared_statements import get_prepared_statement_stats
+
+
+class HealthViewSet(ViewSet):
+    if not is_debug_mode():
+        authentication_classes = [JWTAuthentication]
+        permission_classes = [IsAuthenticated]
+
+    @check_permission_decorator('view_health')
+    def list(self, request):
+        """
+        Métricas dos pools de ligações deste processo.
+        """
+        with connection.cursor() as cursor:
+            prepared_statements = get_prepared_statement_stats(cursor)
+
+        return Response({
+            'postgres': get_database_pool_metrics(),
+            'prepared_statements': prepared_statements,
+            'mongo': get_mongo_pool_metrics(),
+        })
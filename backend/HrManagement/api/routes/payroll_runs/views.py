@@ -0,0 +1,65 @@
+from rest_framework.viewsets import ViewSet
+from rest_framework.response import Response
+from rest_framework import status
+
+from api.utils.dotenv import is_debug_mode
+from api.utils.permissions import check_permission_decorator
+from api.utils.payroll import check_payment_date, get_payroll_runs, parse_month, run_payroll
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from datetime import datetime
+
+
+class PayrollRunsViewSet(ViewSet):
+    if not is_debug_mode():
+        authentication_classes = [JWTAuthentication]
+        permission_classes = [IsAuthenticated]
+
+    @check_permission_decorator('view_payroll_runs')
+    def list(self, request):
+        """
+        URL: /api/payroll_runs/?month=<YYYY-MM>
+        """
+        month = request.query_params.get('month', None)
+        try:
+            if month:
+                parse_month(month)
+        except ValueError:
+            return Response({'detail': 'Invalid month. Use YYYY-MM.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(get_payroll_runs(month), status=status.HTTP_200_OK)
+
+    @check_permission_decorator('run_payroll')
+    def create(self, request):
+        """
+        Processa os pagamentos de um mês.
+        URL: POST /api/payroll_runs/
+        Body: {"month": "2024-12", "id_payment_method": "<id>", "id_employee_supervisor": "<id>",
+               "payment_date": "2024-12-31" (opcional, dentro do mês), "contract_states": ["Active", "Renewed"] (opcional)}
+        """
+        data = request.data
+        try:
+            month = parse_month(data['month'])
+            payment_date = datetime.strptime(data['payment_date'], '%Y-%m-%d').date() if data.get('payment_date') else None
+        except KeyError:
+            return Response({'detail': 'month is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({'detail': 'Invalid month or payment_date. Use YYYY-MM and YYYY-MM-DD.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            check_payment_date(month, payment_date)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not data.get('id_payment_method') or not data.get('id_employee_supervisor'):
+            return Response({'detail': 'id_payment_method and id_employee_supervisor are required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            run = run_payroll(
+                month, data['id_payment_method'], data['id_employee_supervisor'],
+                payment_date, data.get('contract_states')
+            )
+        except Exception as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(run, status=status.HTTP_201_CREATED)
@@ -57,39 +57,22 @@ class RolesViewSet(ViewSet):
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
 
-                roles_dict = {}
                 total_count = rows[0][-1] if rows else 0
 
-                for row in rows:
-                    role_id = row[0]  # id_role is the first column
-                    
-                    if role_id not in roles_dict:
-                        roles_dict[role_id] = {
-                            'id_role': row[0],
-                            'id_department': row[1],
-                            'id_auth_group': row[2],
-                            'role_name': row[3],
-                            'hex_color': row[4],
-                            'description': row[5],
-                            'department_name': row[6],
-                            'training_types': []
-                        }
-                    
-                    # Add training type if it exists and is not null
-                    if row[7]:  # id_training_type is not null
-                        training_type = {
-                            'id_training_type': row[7],
-                            'name': row[8],
-                            'description': row[9],
-                            'hours': row[10]
-                        }
-                        # Check if training type is not already in the list
-                        if not any(tt['id_training_type'] == training_type['id_training_type'] 
-                                 for tt in roles_dict[role_id]['training_types']):
-                            roles_dict[role_id]['training_types'].append(training_type)
-
-                # Convert dictionary to list
-                roles = list(roles_dict.values())
+                # One row per role: training_types already comes aggregated (JSON) from get_all_roles
+                roles = [
+                    {
+                        'id_role': row[0],
+                        'id_department': row[1],
+                        'id_auth_group': row[2],
+                        'role_name': row[3],
+                        'hex_color': row[4],
+                        'description': row[5],
+                        'department_name': row[6],
+                        'training_types': row[7]
+                    }
+                    for row in rows
+                ]
 
                 return Response({
                     'roles': roles,
@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from django.db import connection
+from api.utils.streaming import STREAM_RENDERER_CLASSES, get_stream_format, stream_query
 
 from api.utils.dotenv import is_debug_mode
 from api.utils.permissions import check_permission_decorator, check_permission
@@ -10,6 +11,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 class SalaryHistoryViewSet(ViewSet):
+    renderer_classes = STREAM_RENDERER_CLASSES
+
     if not is_debug_mode():
         authentication_classes = [JWTAuthentication]
         permission_classes = [IsAuthenticated]
@@ -43,6 +46,10 @@ class SalaryHistoryViewSet(ViewSet):
 
         query += " ORDER BY sh.created_at DESC"
 
+        stream_format = get_stream_format(request)
+        if stream_format:
+            return stream_query(query, params, stream_format)
+
         with connection.cursor() as cursor:
             cursor.execute(query, params)
             columns = [col[0] for col in cursor.description]
@@ -3,6 +3,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from api.utils.mongo_client import get_mongo_db
+from api.utils.streaming import STREAM_RENDERER_CLASSES, get_stream_format, stream_documents
 
 from api.utils.dotenv import is_debug_mode
 from api.utils.permissions import check_permission_decorator, check_permission
@@ -11,6 +12,8 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 
 
 class ScheduleViewSet(ViewSet):
+    renderer_classes = STREAM_RENDERER_CLASSES
+
     if not is_debug_mode():
         authentication_classes = [JWTAuthentication]
         permission_classes = [IsAuthenticated]
@@ -24,6 +27,10 @@ class ScheduleViewSet(ViewSet):
         db = get_mongo_db()
         collection = db['schedule']
 
+        stream_format = get_stream_format(request)
+        if stream_format:
+            return stream_documents(collection.find({}, {'_id': 0}), stream_format)
+
         documents = list(collection.find({}, {'_id': 0}))
 
         return Response(documents, status=status.HTTP_200_OK)
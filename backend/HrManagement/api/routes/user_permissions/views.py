@@ -1,6 +1,7 @@
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from api.utils.permissions import get_permission_codenames
 
 class UserPermissionsViewSet(ViewSet):
     permission_classes = [IsAuthenticated]
@@ -9,6 +10,6 @@ class UserPermissionsViewSet(ViewSet):
         """
         List all permissions for the authenticated user.
         """
-        permissions = [perm.split('.', 1)[-1] for perm in request.user.get_all_permissions()]
+        permissions = sorted(get_permission_codenames(request.user))
         return Response({"permissions": permissions})
     
\ No newline at end of file
@@ -24,6 +24,9 @@ from .routes.auth_groups.views import AuthGroupViewSet
 from .routes.permissions.views import PermissionsViewSet
 from .routes.analytics.views import AnalyticsViewSet
 from .routes.group_permissions_user.views import GroupPermissionsViewUserSet
+from .routes.health.views import HealthViewSet
+from .routes.exports.views import ExportsViewSet
+from .routes.payroll_runs.views import PayrollRunsViewSet
 
 router = DefaultRouter()
 router.register(r'analytics', AnalyticsViewSet, basename='analytics')
@@ -51,5 +54,8 @@ router.register(r'roles', RolesViewSet, basename='roles')
 router.register(r'authgroup', AuthGroupViewSet, basename='authgroup')
 router.register(r'permissions', PermissionsViewSet, basename='permissions')
 router.register(r'permissions_user_group', GroupPermissionsViewUserSet, basename='permissions_user_group')
+router.register(r'health', HealthViewSet, basename='health')
+router.register(r'exports', ExportsViewSet, basename='exports')
+router.register(r'payroll_runs', PayrollRunsViewSet, basename='payroll_runs')
 
 urlpatterns = router.urls
@@ -0,0 +1,88 @@
+import hashlib
+from datetime import date
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+# Tables read by each analytics result. A write to any of them (counted per statement in
+# analytics_source_version, in the writing transaction) changes the cache key of the result.
+ANALYTICS_SOURCES = {
+    'current_month_payments': ['payments', 'bonuses', 'deductions', 'employees'],
+    'top_absences': ['absence_reason', 'employees', 'auth_user'],
+    'department_salaries': ['salary_history', 'contract', 'roles', 'departments', 'employees'],
+    'department_counts': ['contract', 'roles', 'departments'],
+}
+
+
+def get_source_versions(cursor, tables):
+    """
+    Returns the data version of each table (0 for tables that were never written).
+    """
+    cursor.execute(
+        "SELECT table_name, version FROM analytics_source_version WHERE table_name = ANY(%s);",
+        [list(tables)]
+    )
+    versions = dict(cursor.fetchall())
+    return {table: versions.get(table) or 0 for table in tables}
+
+
+def get_analytics_cache_key(name, versions):
+    """
+    Cache key of an analytics result: the versions of its source tables (ANALYTICS_SOURCES)
+    and the current month, so a write to one of them, or a new month, changes the key.
+    """
+    stamp = ','.join(f'{table}:{versions.get(table, 0)}' for table in ANALYTICS_SOURCES[name])
+    digest = hashlib.md5(f'{date.today():%Y-%m}|{stamp}'.encode()).hexdigest()
+    return f'analytics:{name}:{digest}'
+
+
+def compute_analytics(cursor, name, compute):
+    """
+    Computes an analytics result and its cache key from the same snapshot, so the result is never
+    stored under the versions of a write it does not see. Must be the first query of its transaction.
+
+    Returns:
+        tuple: (cache key, result of compute(cursor))
+    """
+    cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ;")
+    versions = get_source_versions(cursor, ANALYTICS_SOURCES[name])
+    return get_analytics_cache_key(name, versions), compute(cursor)
+
+
+def store_analytics(name, key, result):
+    """
+    Caches a computed result for ANALYTICS_CACHE_TIMEOUT seconds, and keeps it as the last
+    known result of the analytics (served, marked stale, when a new computation fails).
+    """
+    cache.set(key, result, settings.ANALYTICS_CACHE_TIMEOUT)
+    cache.set(f'analytics:last:{name}', result, None)
+
+
+def get_stale_analytics(name):
+    """
+    Returns the last computed result of an analytics, whatever the current versions, or None.
+    """
+    return cache.get(f'analytics:last:{name}')
+
+
+def get_cached_analytics(cursor, name, compute, versions=None):
+    """
+    Returns an analytics result from the cache, computing it with compute(cursor) on a miss.
+    Entries are keyed with get_analytics_cache_key and expire after ANALYTICS_CACHE_TIMEOUT seconds.
+
+    Args:
+        cursor: A database cursor (used to read the versions when they are not given).
+        name (str): One of ANALYTICS_SOURCES.
+        compute (callable): Returns the (JSON serializable) result, given a cursor.
+        versions (dict, optional): Versions already read with get_source_versions.
+    """
+    if versions is None:
+        versions = get_source_versions(cursor, ANALYTICS_SOURCES[name])
+
+    result = cache.get(get_analytics_cache_key(name, versions))
+    if result is None:
+        # The key is read again with the data: a write committed since the lookup is in both or in neither
+        with transaction.atomic(), connection.cursor() as snapshot_cursor:
+            key, result = compute_analytics(snapshot_cursor, name, compute)
+        store_analytics(name, key, result)
+    return result
@@ -0,0 +1,317 @@
+import time
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+MAX_EVENTS = 10000
+DIRECTIONS = ('in', 'out')
+DUPLICATE_KEY_ERROR = 11000
+NO_OPEN_SESSION = 'Não existe nenhum check-in em aberto.'
+
+# Por ordem: cada evento é rejeitado com a mensagem da primeira verificação que falha
+VALIDATION_ERRORS = (
+    'Evento inválido.',
+    'id_employee inválido.',
+    'Data inválida. Use YYYY-MM-DD.',
+    'Hora inválida. Use HH:mm:ss.',
+    "direction deve ser 'in' ou 'out'.",
+)
+UUID_HYPHENS = (8, 13, 18, 23)
+DATE_DIGITS = (0, 1, 2, 3, 5, 6, 8, 9)
+TIME_DIGITS = (0, 1, 3, 4, 6, 7)
+MONTH_DAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError('Attendance ingestion requires numpy (pip install numpy).') from e
+    return np
+
+
+def _characters(np, values, width):
+    """
+    Code points of the values as an (n, width) matrix, plus the length of each value.
+    Values longer than width are cut (their length tells them apart); shorter ones are padded with 0.
+    """
+    lengths = np.char.str_len(np.array(values, dtype=str))
+    codes = np.array(values, dtype=f'U{width}').view(np.uint32).reshape(len(values), width).astype(np.int64)
+    return codes, lengths
+
+
+def _all_digits(codes, positions):
+    digits = codes[:, list(positions)]
+    return ((digits >= 48) & (digits <= 57)).all(axis=1)
+
+
+def validate_events(events):
+    """
+    Valida os eventos (id_employee, date, time, direction) coluna a coluna, com operações sobre arrays.
+
+    id_employee tem de ser um UUID no formato canónico (8-4-4-4-12), date uma data YYYY-MM-DD que exista
+    e time uma hora HH:mm:ss.
+
+    Returns:
+        list: A mensagem de erro de cada evento, ou None quando é válido (pela mesma ordem).
+    """
+    np = _numpy()
+    is_dict = np.array([isinstance(event, dict) for event in events], dtype=bool)
+
+    def column(field):
+        return [
+            event.get(field) if isinstance(event, dict) and isinstance(event.get(field), str) else ''
+            for event in events
+        ]
+
+    # id_employee: 36 caracteres, hífens nas posições do formato canónico e dígitos hexadecimais no resto
+    codes, lengths = _characters(np, [
+        str(event.get('id_employee')) if isinstance(event, dict) and event.get('id_employee') is not None else ''
+        for event in events
+    ], 36)
+    hyphens = np.zeros(36, dtype=bool)
+    hyphens[list(UUID_HYPHENS)] = True
+    lower = codes | 32
+    hexadecimal = ((codes >= 48) & (codes <= 57)) | ((lower >= 97) & (lower <= 102))
+    valid_id = (lengths == 36) & np.where(hyphens, codes == 45, hexadecimal).all(axis=1)
+
+    # date: YYYY-MM-DD, com o número de dias do mês (anos bissextos incluídos)
+    codes, lengths = _characters(np, column('date'), 10)
+    digits = codes - 48
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 5] * 10 + digits[:, 6]
+    day = digits[:, 8] * 10 + digits[:, 9]
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = np.array(MONTH_DAYS)[np.clip(month, 0, 12)] + ((month == 2) & leap)
+    valid_date = (
+        (lengths == 10) & (codes[:, 4] == 45) & (codes[:, 7] == 45) & _all_digits(codes, DATE_DIGITS)
+        & (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+    )
+
+    # time: HH:mm:ss entre 00:00:00 e 23:59:59
+    codes, lengths = _characters(np, column('time'), 8)
+    digits = codes - 48
+    valid_time = (
+        (lengths == 8) & (codes[:, 2] == 58) & (codes[:, 5] == 58) & _all_digits(codes, TIME_DIGITS)
+        & (digits[:, 0] * 10 + digits[:, 1] < 24) & (digits[:, 3] < 6) & (digits[:, 6] < 6)
+    )
+
+    valid_direction = np.isin(np.array(column('direction'), dtype=str), DIRECTIONS)
+
+    failed = ~np.stack([is_dict, valid_id, valid_date, valid_time, valid_direction])
+    first_failure = failed.argmax(axis=0)
+    return [
+        VALIDATION_ERRORS[reason] if invalid else None
+        for invalid, reason in zip(failed.any(axis=0).tolist(), first_failure.tolist())
+    ]
+
+
+def _close_first_open_session(checkout):
+    # Equivalente em pipeline a {"$set": {"sessions.$.checkout": checkout}} sobre a primeira sessão em aberto
+    return {'$set': {'sessions': {'$let': {
+        'vars': {'open': {'$indexOfArray': ['$sessions.checkout', None]}},
+        'in': {'$map': {
+            'input': {'$range': [0, {'$size': '$sessions'}]},
+            'as': 'i',
+            'in': {'$cond': [
+                {'$eq': ['$$i', '$$open']},
+                {'$mergeObjects': [{'$arrayElemAt': ['$sessions', '$$i']}, {'checkout': checkout}]},
+                {'$arrayElemAt': ['$sessions', '$$i']},
+            ]},
+        }},
+    }}}}
+
+
+def _day_operation(id_employee, event_date, sessions, closing_checkout=None):
+    """
+    Upsert do dia com as novas sessões e, se indicado, o checkout da sessão já gravada em aberto.
+
+    Quando fecha uma sessão, o filtro exige uma sessão em aberto. Se ela deixou de existir depois da
+    leitura, o resultado da operação no bulk_write mostra-o: o upsert colide no índice único
+    (id_employee, date) quando o dia existe, ou insere um documento novo quando não existe.
+    """
+    query = {'id_employee': id_employee, 'date': event_date}
+    pipeline = [{'$set': {
+        'id_employee': id_employee,
+        'date': event_date,
+        'sessions': {'$ifNull': ['$sessions', []]},
+    }}]
+    if closing_checkout is not None:
+        query['sessions'] = {'$elemMatch': {'checkout': None}}
+        pipeline.append(_close_first_open_session(closing_checkout))
+    if sessions:
+        pipeline.append({'$set': {'sessions': {'$concatArrays': ['$sessions', sessions]}}})
+    return UpdateOne(query, pipeline, upsert=True)
+
+
+def build_operations(groups, open_days, results):
+    """
+    Converte os eventos de cada dia/funcionário numa única atualização (pipeline com upsert).
+
+    Dentro do lote, cada 'out' fecha o 'in' anterior do mesmo lote; um 'out' sem 'in' anterior
+    fecha a sessão que já estava em aberto na base de dados (se existir).
+
+    Returns:
+        tuple: (lista de UpdateOne, lista com os índices dos eventos aplicados por cada operação,
+        lista com o evento que fecha uma sessão já gravada em cada operação (ou None) e a operação
+        só com as novas sessões, usada se esse fecho não se aplicar (ou None, se não há sessões novas)).
+    """
+    operations, operation_events, closings = [], [], []
+    for (id_employee, event_date), events in groups.items():
+        sessions, applied = [], []
+        closing_event, closing_checkout = None, None
+        open_session = None
+        existing_open = (id_employee, event_date) in open_days
+
+        for index, event in sorted(events, key=lambda item: item[1]['time']):
+            if event['direction'] == 'in':
+                open_session = {'checkin': event['time'], 'checkout': None}
+                sessions.append(open_session)
+                applied.append(index)
+            elif open_session is not None:
+                open_session['checkout'] = event['time']
+                open_session = None
+                applied.append(index)
+            elif existing_open and closing_checkout is None and not sessions:
+                closing_event, closing_checkout = index, event['time']
+                applied.append(index)
+            else:
+                results[index] = {'status': 'rejected', 'detail': NO_OPEN_SESSION}
+
+        if not applied:
+            continue
+
+        operations.append(_day_operation(id_employee, event_date, sessions, closing_checkout))
+        operation_events.append(applied)
+        closings.append(
+            (closing_event, _day_operation(id_employee, event_date, sessions) if sessions else None)
+            if closing_event is not None else None
+        )
+    return operations, operation_events, closings
+
+
+def _bulk_write(collection, operations):
+    """
+    Executa as operações sem ordem.
+
+    Returns:
+        tuple: (resultado, {índice da operação: erro}, {índice da operação: _id do documento inserido}).
+    """
+    try:
+        details, errors = collection.bulk_write(operations, ordered=False).bulk_api_result, {}
+    except BulkWriteError as e:
+        details = e.details
+        errors = {error['index']: error for error in details.get('writeErrors', [])}
+    return details, errors, {upsert['index']: upsert['_id'] for upsert in details.get('upserted', [])}
+
+
+def ingest_attendance_events(collection, events):
+    """
+    Aplica um lote de eventos de assiduidade (terminais de picagem) com um único bulk_write.
+
+    Args:
+        collection: Coleção 'attendance'.
+        events (list): Dicts com id_employee, date (YYYY-MM-DD), time (HH:mm:ss) e direction ('in'/'out').
+
+    Returns:
+        dict: results (um por evento, pela mesma ordem) e stats.
+    """
+    start = time.monotonic()
+    results = [None] * len(events)
+
+    groups = {}
+    for index, error in enumerate(validate_events(events)):
+        if error:
+            results[index] = {'status': 'rejected', 'detail': error}
+            continue
+        event = events[index]
+        key = (str(event['id_employee']), event['date'])
+        groups.setdefault(key, []).append((index, event))
+
+    # Dias com uma sessão em aberto (para os 'out' sem 'in' no lote): uma única leitura
+    closing_keys = [
+        key for key, group in groups.items()
+        if min(group, key=lambda item: item[1]['time'])[1]['direction'] == 'out'
+    ]
+    open_days = set()
+    if closing_keys:
+        documents = collection.find(
+            {'$or': [{'id_employee': id_employee, 'date': event_date} for id_employee, event_date in closing_keys],
+             'sessions.checkout': None},
+            {'_id': 0, 'id_employee': 1, 'date': 1}
+        )
+        open_days = {(document['id_employee'], document['date']) for document in documents}
+
+    operations, operation_events, closings = build_operations(groups, open_days, results)
+
+    write_result, errors, upserted = {}, {}, {}
+    unapplied_closes = set()
+    if operations:
+        write_result, errors, upserted = _bulk_write(collection, operations)
+
+        retry, retry_operations, resolved = [], [], []
+        for operation_index, error in errors.items():
+            if error.get('code') != DUPLICATE_KEY_ERROR:
+                continue
+            if closings[operation_index] is None:
+                # Upserts concorrentes do mesmo dia colidem no índice único: repetem-se uma vez
+                retry.append(operation_index)
+                retry_operations.append(operations[operation_index])
+                continue
+            # O dia existe mas a sessão em aberto foi fechada depois da leitura: o fecho não se aplica
+            # e as novas sessões do dia voltam a ser gravadas sem ele
+            closing_event, sessions_operation = closings[operation_index]
+            unapplied_closes.add(closing_event)
+            if sessions_operation is not None:
+                retry.append(operation_index)
+                retry_operations.append(sessions_operation)
+            else:
+                resolved.append(operation_index)
+        for operation_index in resolved:
+            errors.pop(operation_index)
+
+        # O dia deixou de existir depois da leitura: o upsert criou-o sem fechar nenhuma sessão
+        empty_days = []
+        for operation_index, document_id in upserted.items():
+            if closings[operation_index] is not None:
+                closing_event, sessions_operation = closings[operation_index]
+                unapplied_closes.add(closing_event)
+                if sessions_operation is None:
+                    empty_days.append(document_id)
+        if empty_days:
+            collection.delete_many({'_id': {'$in': empty_days}, 'sessions': []})
+
+        if retry:
+            retry_result, retry_errors, _ = _bulk_write(collection, retry_operations)
+            for index in retry:
+                errors.pop(index)
+            errors.update({retry[index]: error for index, error in retry_errors.items()})
+            for counter in ('nUpserted', 'nMatched', 'nModified'):
+                write_result[counter] = write_result.get(counter, 0) + retry_result.get(counter, 0)
+        write_result['nUpserted'] = write_result.get('nUpserted', 0) - len(empty_days)
+
+    for operation_index, event_indexes in enumerate(operation_events):
+        error = errors.get(operation_index)
+        for index in event_indexes:
+            if index in unapplied_closes:
+                results[index] = {'status': 'rejected', 'detail': NO_OPEN_SESSION}
+            elif error:
+                results[index] = {'status': 'error', 'detail': error.get('errmsg', 'Erro ao gravar.')}
+            else:
+                results[index] = {'status': 'applied'}
+
+    elapsed = time.monotonic() - start
+    applied = sum(1 for result in results if result['status'] == 'applied')
+    return {
+        'results': results,
+        'stats': {
+            'received': len(events),
+            'applied': applied,
+            'rejected': sum(1 for result in results if result['status'] == 'rejected'),
+            'errors': sum(1 for result in results if result['status'] == 'error'),
+            'documents': len(operations),
+            'upserted': write_result.get('nUpserted', 0),
+            'modified': write_result.get('nModified', 0),
+            'elapsed_ms': round(elapsed * 1000, 1),
+            'events_per_second': round(len(events) / elapsed) if elapsed > 0 else None,
+        },
+    }
@@ -0,0 +1,206 @@
+import io
+import time
+from contextlib import contextmanager
+from itertools import islice
+from django.db import connection
+
+COPY_CHUNK_SIZE = 64 * 1024
+
+# Triggers that maintain derived data (latest_* tables, employee_search and payroll_monthly_summary),
+# plus the payment totals trigger (bulk loads always supply the totals).
+# During bulk loads they are disabled and the derived data is rebuilt once at the end.
+DERIVED_DATA_TRIGGER_PATTERNS = (
+    'trigger_refresh_latest_%', 'trigger_employee_search_%', 'trigger_payroll_summary_%', 'trg_update_payment_totals',
+)
+
+
+def batched(iterable, size):
+    """
+    Splits an iterable into lists of at most size items.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def copy_value(value):
+    """
+    Formats a value for COPY ... FROM STDIN (text format).
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def copy_expert(cursor, sql, file):
+    """
+    Runs a COPY ... FROM STDIN / TO STDOUT statement reading from or writing to a file-like
+    object, with psycopg2 (copy_expert) or psycopg 3 (cursor.copy).
+    """
+    if hasattr(cursor, 'copy_expert'):
+        cursor.copy_expert(sql, file)
+        return
+
+    with cursor.copy(sql) as copy:
+        if 'FROM STDIN' in sql.upper():
+            while True:
+                data = file.read(COPY_CHUNK_SIZE)
+                if not data:
+                    break
+                copy.write(data)
+        else:
+            for data in copy:
+                file.write(bytes(data))
+
+
+def copy_rows(cursor, table, columns, rows):
+    """
+    Loads rows into a table with a single COPY FROM STDIN.
+
+    Args:
+        cursor: A database cursor.
+        table (str): The target table.
+        columns (list): The columns present in each row, in order (the others get their defaults).
+        rows (list): Tuples of values.
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    copy_expert(cursor, f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    return len(rows)
+
+
+class BulkProgress:
+    """
+    Prints progress and throughput (rows per second) of a bulk load.
+    """
+
+    def __init__(self, label, total):
+        self.label = label
+        self.total = total
+        self.rows = 0
+        self.start = time.monotonic()
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.monotonic() - self.start
+        return self.rows / elapsed if elapsed > 0 else 0
+
+    def add(self, rows):
+        self.rows += rows
+        percent = (self.rows / self.total) * 100 if self.total else 100
+        print(f"{self.label}: {self.rows}/{self.total} rows ({percent:.0f}%), {self.rows_per_second:.0f} rows/s")
+
+    def done(self):
+        elapsed = time.monotonic() - self.start
+        print(f"{self.label}: {self.rows} rows in {elapsed:.1f}s ({self.rows_per_second:.0f} rows/s)")
+        return self.rows
+
+
+def copy_in_batches(cursor, table, columns, rows, total, batch_size, label=None):
+    """
+    Loads rows (any iterable, usually a generator) in COPY batches, reporting progress.
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    progress = BulkProgress(label or table, total)
+    for batch in batched(rows, batch_size):
+        progress.add(copy_rows(cursor, table, columns, batch))
+    return progress.done()
+
+
+def rebuild_derived_data(cursor):
+    """
+    Rebuilds the latest_* tables, the employee search documents and the monthly payroll
+    summary from the base tables.
+    """
+    cursor.execute("SELECT rebuild_latest_tables();")
+    cursor.execute("SELECT refresh_employee_search(ARRAY(SELECT id_employee FROM employees));")
+    cursor.execute("SELECT rebuild_payroll_monthly_summary();")
+
+
+def derived_data_triggers(cursor):
+    """
+    Lists the triggers that maintain derived data.
+
+    Returns:
+        list: (table, trigger, enabled) for each trigger.
+    """
+    cursor.execute(
+        """
+        SELECT c.relname, t.tgname, t.tgenabled <> 'D'
+        FROM pg_trigger t
+        INNER JOIN pg_class c ON c.oid = t.tgrelid
+        WHERE NOT t.tgisinternal
+          AND t.tgname LIKE ANY(%s);
+        """,
+        [list(DERIVED_DATA_TRIGGER_PATTERNS)]
+    )
+    return cursor.fetchall()
+
+
+def restore_derived_data_triggers(cursor):
+    """
+    Re-enables the derived data triggers left disabled by an interrupted bulk load
+    and rebuilds the derived data they missed.
+
+    Returns:
+        list: (table, trigger) for each trigger re-enabled.
+    """
+    disabled = [(table, trigger) for table, trigger, enabled in derived_data_triggers(cursor) if not enabled]
+    if disabled:
+        for table, trigger in disabled:
+            cursor.execute(f'ALTER TABLE "{table}" ENABLE TRIGGER "{trigger}";')
+        rebuild_derived_data(cursor)
+    return disabled
+
+
+@contextmanager
+def deferred_derived_data():
+    """
+    Disables the per-row triggers that maintain derived data for the duration of a bulk load,
+    then re-enables them and rebuilds the derived data once, set-based.
+
+    The loads commit as they go (and may run on several processes), so the triggers cannot be
+    disabled in the same transaction. If the process dies mid-load they stay disabled: the next
+    bulk load or `python manage.py database` re-enables them and rebuilds the derived data.
+    """
+    with connection.cursor() as cursor:
+        triggers = derived_data_triggers(cursor)
+
+        leftover = [trigger for _, trigger, enabled in triggers if not enabled]
+        if leftover:
+            print(f"Warning: triggers left disabled by an interrupted bulk load: {', '.join(leftover)}")
+
+        for table, trigger, enabled in triggers:
+            if enabled:
+                cursor.execute(f'ALTER TABLE "{table}" DISABLE TRIGGER "{trigger}";')
+
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for table, trigger, _ in triggers:
+                cursor.execute(f'ALTER TABLE "{table}" ENABLE TRIGGER "{trigger}";')
+
+            start = time.monotonic()
+            rebuild_derived_data(cursor)
+            print(f"Derived data rebuilt in {time.monotonic() - start:.1f}s")
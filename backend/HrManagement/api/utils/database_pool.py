@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db import connection
+
+
+def get_database_pool_metrics():
+    """
+    Metrics of the PostgreSQL connections: the configured mode, the psycopg pool statistics
+    (in psycopg_pool mode) and the server-side view of the application's connections.
+    """
+    database = connection.settings_dict
+    metrics = {
+        'mode': settings.DATABASE_POOL_MODE,
+        'driver': 'psycopg3' if settings.PSYCOPG3 else 'psycopg2',
+        'conn_max_age': database.get('CONN_MAX_AGE'),
+        'health_checks': database.get('CONN_HEALTH_CHECKS'),
+        'server_side_cursors': not database.get('DISABLE_SERVER_SIDE_CURSORS'),
+    }
+
+    # Django >= 5.1 exposes the psycopg_pool.ConnectionPool when OPTIONS['pool'] is set
+    pool = getattr(connection, 'pool', None)
+    if pool is not None:
+        stats = pool.get_stats()
+        requests = stats.get('requests_num', 0)
+        metrics['pool'] = {
+            'min_size': pool.min_size,
+            'max_size': pool.max_size,
+            'size': stats.get('pool_size', 0),
+            'available': stats.get('pool_available', 0),
+            'in_use': stats.get('pool_size', 0) - stats.get('pool_available', 0),
+            'waiting': stats.get('requests_waiting', 0),
+            'requests': requests,
+            'requests_queued': stats.get('requests_queued', 0),
+            'requests_errors': stats.get('requests_errors', 0),
+            'wait_ms_total': stats.get('requests_wait_ms', 0),
+            'wait_ms_avg': round(stats.get('requests_wait_ms', 0) / requests, 2) if requests else 0,
+            'connections_created': stats.get('connections_num', 0),
+        }
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT COALESCE(state, 'unknown'), COUNT(*), COALESCE(SUM(CASE WHEN wait_event_type = 'Lock' THEN 1 ELSE 0 END), 0)
+            FROM pg_stat_activity
+            WHERE datname = current_database()
+              AND application_name = %s
+            GROUP BY state;
+            """,
+            [database['OPTIONS'].get('application_name', '')]
+        )
+        states = {state: (count, waiting) for state, count, waiting in cursor.fetchall()}
+
+    metrics['server'] = {
+        'connections': sum(count for count, _ in states.values()),
+        'active': states.get('active', (0, 0))[0],
+        'idle': states.get('idle', (0, 0))[0],
+        'idle_in_transaction': states.get('idle in transaction', (0, 0))[0],
+        'waiting_on_locks': sum(waiting for _, waiting in states.values()),
+    }
+    return metrics
@@ -0,0 +1,272 @@
+import queue
+import tempfile
+import threading
+from django.db import connection
+from api.utils.bulk import copy_expert
+
+EXPORT_FORMATS = ('csv', 'parquet')
+STREAM_BUFFER_SIZE = 64 * 1024
+STREAM_QUEUE_SIZE = 32
+
+# Datasets available for export. The filters have the same names as in the list endpoints;
+# 'arguments' are passed in order to a set-returning function instead.
+DATASETS = {
+    'payments': {
+        'permission': 'view_all_payments',
+        'query': """
+            SELECT p.*, pm.name AS payment_method_name
+            FROM payments p
+            INNER JOIN payment_methods pm ON p.id_payment_method = pm.id_payment_method
+        """,
+        'filters': {
+            'id_employee': 'p.id_employee = %s',
+            'date_from': 'p.payment_date >= %s',
+            'date_to': 'p.payment_date <= %s',
+        },
+        'order_by': 'p.payment_date, p.id_payment',
+    },
+    'deductions': {
+        'permission': 'view_all_deductions',
+        'query': """
+            SELECT d.*, ar.id_employee
+            FROM deductions d
+            INNER JOIN payments p ON d.id_payment = p.id_payment
+            INNER JOIN absence_reason ar ON d.id_absence_reason = ar.id_absence_reason
+        """,
+        'filters': {
+            'id_payment': 'p.id_payment = %s',
+            'id_employee': 'ar.id_employee = %s',
+            'date_from': 'd.deduction_date >= %s',
+            'date_to': 'd.deduction_date <= %s',
+        },
+        'order_by': 'd.deduction_date, d.id_deduction',
+    },
+    'bonuses': {
+        'permission': 'view_all_bonuses',
+        'query': "SELECT b.* FROM bonuses b",
+        'filters': {
+            'payment_id': 'b.id_payment = %s',
+            'id_employee': 'b.id_employee = %s',
+            'date_from': 'b.bonus_date >= %s',
+            'date_to': 'b.bonus_date <= %s',
+        },
+        'order_by': 'b.bonus_date, b.id_bonus',
+    },
+    'salary_history': {
+        'permission': 'view_all_salary_history',
+        'query': """
+            SELECT sh.*, c.id_employee
+            FROM salary_history sh
+            INNER JOIN contract c ON sh.id_contract = c.id_contract
+        """,
+        'filters': {
+            'id_contract': 'c.id_contract = %s',
+            'id_employee': 'c.id_employee = %s',
+        },
+        'order_by': 'sh.created_at DESC, sh.id_salary_history',
+    },
+    'contracts': {
+        'permission': 'view_all_employees',
+        'query': """
+            SELECT c.*, r.role_name, r.id_department, d.name AS department_name, ct.contract_type_name
+            FROM contract c
+            INNER JOIN roles r ON c.id_role = r.id_role
+            INNER JOIN departments d ON r.id_department = d.id_department
+            INNER JOIN contract_type ct ON c.id_contract_type = ct.id_contract_type
+        """,
+        'filters': {
+            'id_employee': 'c.id_employee = %s',
+            'department_id': 'r.id_department = %s',
+            'role_id': 'c.id_role = %s',
+        },
+        'order_by': 'c.created_at, c.id_contract',
+    },
+    'employees': {
+        'permission': 'view_all_employees',
+        'query': """
+            SELECT * FROM get_all_employees(
+                %s, %s::uuid, %s::uuid, %s::uuid, %s::uuid,
+                ARRAY['first_name']::text[], ARRAY['ASC']::text[], %s::varchar
+            )
+        """,
+        'arguments': ['name', 'id', 'department_id', 'role_id', 'status_id', 'global_search'],
+    },
+}
+
+
+def build_export_query(dataset_name, filters):
+    """
+    Builds the SELECT of a dataset with the given filters.
+
+    Args:
+        dataset_name (str): One of DATASETS.
+        filters (dict): Filter values by name; unknown names and empty values are ignored.
+
+    Returns:
+        tuple: (sql, params).
+
+    Raises:
+        ValueError: If the dataset does not exist.
+    """
+    dataset = DATASETS.get(dataset_name)
+    if dataset is None:
+        raise ValueError(f"Unknown dataset '{dataset_name}'. Available: {', '.join(DATASETS)}.")
+
+    query = dataset['query'].strip()
+    if 'arguments' in dataset:
+        return query, [filters.get(name) or None for name in dataset['arguments']]
+
+    conditions, params = [], []
+    for name, condition in dataset['filters'].items():
+        if filters.get(name):
+            conditions.append(condition)
+            params.append(filters[name])
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if dataset.get('order_by'):
+        query += f" ORDER BY {dataset['order_by']}"
+    return query, params
+
+
+def copy_export(file, dataset_name, filters):
+    """
+    Writes a dataset as CSV (with header) to a binary file-like object with COPY ... TO STDOUT.
+    Rows go straight from PostgreSQL to the file, without becoming Python objects.
+    """
+    query, params = build_export_query(dataset_name, filters)
+    with connection.cursor() as cursor:
+        # COPY does not take bind parameters: they are inlined (and escaped) by the driver
+        sql = cursor.mogrify(query, params)
+        sql = sql.decode() if isinstance(sql, bytes) else sql
+        copy_expert(cursor, f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER true)", file)
+
+
+class _QueueWriter:
+    """
+    File-like object that hands COPY output to another thread in chunks of STREAM_BUFFER_SIZE.
+    """
+
+    def __init__(self, chunks, cancelled):
+        self.chunks = chunks
+        self.cancelled = cancelled
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data.encode() if isinstance(data, str) else data
+        if len(self.buffer) >= STREAM_BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self._put(bytes(self.buffer))
+            self.buffer = bytearray()
+
+    def _put(self, item):
+        while True:
+            if self.cancelled.is_set():
+                # Raising inside copy_expert aborts the COPY
+                raise IOError('Export cancelled.')
+            try:
+                self.chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+
+def _stream_chunks(dataset_name, filters):
+    chunks = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    cancelled = threading.Event()
+    done = object()
+
+    def run():
+        writer = _QueueWriter(chunks, cancelled)
+        try:
+            copy_export(writer, dataset_name, filters)
+            writer.flush()
+            writer._put(done)
+        except Exception as e:
+            if not cancelled.is_set():
+                chunks.put(e)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is done:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        # The client went away (or the export ended): stop the COPY thread
+        cancelled.set()
+
+
+def stream_csv_export(dataset_name, filters):
+    """
+    Returns an iterator over the CSV of a dataset, in chunks, while COPY runs on a separate
+    thread (and connection). At most STREAM_QUEUE_SIZE chunks are buffered, so memory stays
+    bounded for any result size.
+
+    Raises:
+        ValueError: If the dataset does not exist (before anything is streamed).
+    """
+    build_export_query(dataset_name, filters)
+    return _stream_chunks(dataset_name, filters)
+
+
+def _arrow_type(pa, type_code):
+    # PostgreSQL type OIDs -> Arrow types; anything else (uuid, text, timestamptz...) stays a string
+    return {
+        16: pa.bool_(),
+        20: pa.int64(),
+        21: pa.int64(),
+        23: pa.int64(),
+        700: pa.float64(),
+        701: pa.float64(),
+        1700: pa.decimal128(38, 10),
+        1082: pa.date32(),
+        1114: pa.timestamp('us'),
+    }.get(type_code, pa.string())
+
+
+def export_parquet(output, dataset_name, filters):
+    """
+    Writes a dataset as Parquet. COPY writes the CSV to a temporary file, which Arrow then
+    converts block by block, with column types taken from the query.
+
+    Args:
+        output: Path or binary file-like object for the Parquet file.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError('Parquet export requires pyarrow (pip install pyarrow).') from e
+
+    query, params = build_export_query(dataset_name, filters)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT * FROM ({query}) AS export LIMIT 0", params)
+        schema = pa.schema([(col[0], _arrow_type(pa, col[1])) for col in cursor.description])
+
+    with tempfile.TemporaryFile() as csv_file:
+        copy_export(csv_file, dataset_name, filters)
+        csv_file.seek(0)
+
+        reader = pa_csv.open_csv(
+            csv_file,
+            convert_options=pa_csv.ConvertOptions(
+                column_types=schema, strings_can_be_null=True, quoted_strings_can_be_null=False,
+                true_values=['t'], false_values=['f']
+            )
+        )
+        with pq.ParquetWriter(output, schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
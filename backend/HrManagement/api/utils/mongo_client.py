@@ -1,6 +1,81 @@
+import atexit
+import os
+import threading
 import pymongo
+from pymongo import monitoring
 from decouple import config
 
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Contadores do pool de ligações do MongoClient deste processo.
+    """
+
+    COUNTERS = (
+        'pools_created', 'pools_cleared', 'connections_created', 'connections_closed',
+        'checkouts', 'checkins', 'checkout_failures',
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def _increment(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+        counters['connections_open'] = counters['connections_created'] - counters['connections_closed']
+        counters['connections_in_use'] = counters['checkouts'] - counters['checkins']
+        return counters
+
+    def pool_created(self, event):
+        self._increment('pools_created')
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._increment('pools_cleared')
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._increment('connections_created')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._increment('connections_closed')
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._increment('checkout_failures')
+
+    def connection_checked_out(self, event):
+        self._increment('checkouts')
+
+    def connection_checked_in(self, event):
+        self._increment('checkins')
+
+
+pool_metrics = PoolMetricsListener()
+
+
 def get_mongo_connection_string():
     """
     Retorna a string de conexão do MongoDB usando as configurações do arquivo .env.
@@ -11,17 +86,108 @@ def get_mongo_connection_string():
     password = config('MONGO_PASSWORD', default='')
     db_name = config('MONGO_DATABASE_NAME', default='mongo')
     auth_source = config('MONGO_AUTH_SOURCE', default='admin')
-    
+
     return f"mongodb://{username}:{password}@{host}:{port}/{db_name}?authSource={auth_source}"
 
+
+def get_mongo_client_options():
+    """
+    Opções do pool, timeouts, read preference e write concern, configuráveis no .env.
+    """
+    write_concern_w = config('MONGO_WRITE_CONCERN_W', default='1')
+    options = {
+        'maxPoolSize': config('MONGO_MAX_POOL_SIZE', default=100, cast=int),
+        'minPoolSize': config('MONGO_MIN_POOL_SIZE', default=0, cast=int),
+        'maxIdleTimeMS': config('MONGO_MAX_IDLE_TIME_MS', default=60000, cast=int),
+        'waitQueueTimeoutMS': config('MONGO_WAIT_QUEUE_TIMEOUT_MS', default=5000, cast=int),
+        'connectTimeoutMS': config('MONGO_CONNECT_TIMEOUT_MS', default=5000, cast=int),
+        'serverSelectionTimeoutMS': config('MONGO_SERVER_SELECTION_TIMEOUT_MS', default=5000, cast=int),
+        'socketTimeoutMS': config('MONGO_SOCKET_TIMEOUT_MS', default=30000, cast=int),
+        'readPreference': config('MONGO_READ_PREFERENCE', default='primary'),
+        'w': int(write_concern_w) if write_concern_w.isdigit() else write_concern_w,
+    }
+    if config('MONGO_WRITE_CONCERN_J', default=False, cast=bool):
+        options['journal'] = True
+    return options
+
+
+def get_mongo_client():
+    """
+    Retorna o MongoClient partilhado pelo processo (criado na primeira utilização).
+
+    Depois de um fork o processo filho cria o seu próprio cliente, porque as
+    ligações e threads do cliente do processo pai não podem ser reutilizadas.
+    """
+    global _client, _client_pid
+
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            if _client_pid != pid:
+                pool_metrics.reset()
+            # connect=False: a ligação só é aberta no primeiro pedido (seguro com fork)
+            _client = pymongo.MongoClient(
+                get_mongo_connection_string(),
+                connect=False,
+                event_listeners=[pool_metrics],
+                **get_mongo_client_options(),
+            )
+            _client_pid = pid
+    return _client
+
+
+def close_mongo_client():
+    """
+    Fecha o cliente partilhado (ligações e threads de monitorização).
+    """
+    global _client, _client_pid
+
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+def _forget_client_after_fork():
+    # O filho não fecha o cliente herdado (pertence ao pai); apenas deixa de o usar
+    global _client, _client_pid, _client_lock
+    _client = None
+    _client_pid = None
+    _client_lock = threading.Lock()
+
+
+atexit.register(close_mongo_client)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_client_after_fork)
+
+
 def get_mongo_db():
     """
-    Retorna a database do MongoDB usando a string de conexão.
+    Retorna a database do MongoDB usando o cliente partilhado.
     """
-    connection_string = get_mongo_connection_string()
     try:
-        client = pymongo.MongoClient(connection_string)
-        return client[config('MONGO_DATABASE_NAME', default='mongo')]
+        return get_mongo_client()[config('MONGO_DATABASE_NAME', default='mongo')]
     except Exception as e:
         print(f"Erro ao conectar ao MongoDB: {e}")
         return None
+
+
+def get_mongo_pool_metrics():
+    """
+    Métricas do pool de ligações do MongoDB deste processo.
+    """
+    options = get_mongo_client_options()
+    metrics = {
+        'pid': os.getpid(),
+        'client_created': _client is not None and _client_pid == os.getpid(),
+        'max_pool_size': options['maxPoolSize'],
+        'min_pool_size': options['minPoolSize'],
+        'read_preference': options['readPreference'],
+        'write_concern': {'w': options['w'], 'j': options.get('journal', False)},
+    }
+    metrics.update(pool_metrics.snapshot())
+    return metrics
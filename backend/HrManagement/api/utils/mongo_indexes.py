@@ -0,0 +1,110 @@
+import threading
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+PROGRESS_INTERVAL = 2
+
+
+def _same_index(existing, declared):
+    return (
+        list(existing['key']) == list(declared['keys'])
+        and bool(existing.get('unique', False)) == bool(declared.get('unique', False))
+    )
+
+
+def _watch_index_build(db, collection_name, index_name, stop, log):
+    """
+    Mostra o progresso de uma criação de índice (via $currentOp) até stop ser ativado.
+    """
+    namespace = f"{db.name}.{collection_name}"
+    last_message = None
+    while not stop.wait(PROGRESS_INTERVAL):
+        try:
+            operations = db.client.admin.aggregate([
+                {'$currentOp': {'allUsers': True}},
+                {'$match': {'ns': namespace, 'command.createIndexes': collection_name}},
+            ])
+            for operation in operations:
+                progress = operation.get('progress')
+                message = operation.get('msg', 'Index Build')
+                if progress and progress.get('total'):
+                    message = f"{message} {progress['done'] / progress['total'] * 100:.0f}%"
+                if message != last_message:
+                    log(f"  {collection_name}.{index_name}: {message}")
+                    last_message = message
+        except OperationFailure:
+            # Sem permissão para $currentOp: a criação continua, apenas sem progresso
+            return
+
+
+def _create_index(collection, declared, log):
+    stop = threading.Event()
+    watcher = threading.Thread(
+        target=_watch_index_build,
+        args=(collection.database, collection.name, declared['name'], stop, log),
+        daemon=True,
+    )
+    watcher.start()
+    try:
+        collection.create_indexes([
+            IndexModel(declared['keys'], name=declared['name'], unique=declared.get('unique', False))
+        ])
+    finally:
+        stop.set()
+        watcher.join()
+
+
+def reconcile_indexes(collection, declared_indexes, log=print):
+    """
+    Acerta os índices da coleção com os declarados: cria os que faltam, recria os que
+    mudaram de definição e remove os que não estão declarados (exceto _id_).
+
+    Args:
+        collection: Coleção pymongo.
+        declared_indexes (list): Dicts com name, keys (lista de (campo, direção)) e unique opcional.
+        log (callable): Função usada para reportar o progresso.
+
+    Returns:
+        dict: Listas de índices created, dropped, kept e failed.
+    """
+    result = {'created': [], 'dropped': [], 'kept': [], 'failed': []}
+    existing = collection.index_information()
+
+    for name, information in existing.items():
+        if name == '_id_':
+            continue
+        declared = next((index for index in declared_indexes if index['name'] == name), None)
+        # Índices não declarados, ou com outra definição, ou com as mesmas chaves sob outro nome
+        if declared is None or not _same_index(information, declared):
+            collection.drop_index(name)
+            result['dropped'].append(name)
+            log(f"  {collection.name}.{name}: removido")
+
+    existing = collection.index_information()
+    for declared in declared_indexes:
+        if declared['name'] in existing:
+            result['kept'].append(declared['name'])
+            continue
+        log(f"  {collection.name}.{declared['name']}: a criar...")
+        try:
+            _create_index(collection, declared, log)
+        except OperationFailure as e:
+            # Ex: índice único sobre dados com duplicados
+            result['failed'].append((declared['name'], str(e)))
+            log(f"  {collection.name}.{declared['name']}: erro ao criar ({e})")
+        else:
+            result['created'].append(declared['name'])
+
+    return result
+
+
+def index_sizes(collection):
+    """
+    Número de documentos e tamanho (bytes) de cada índice da coleção.
+    """
+    stats = collection.database.command('collStats', collection.name)
+    return {
+        'count': stats.get('count', 0),
+        'total_index_size': stats.get('totalIndexSize', 0),
+        'index_sizes': stats.get('indexSizes', {}),
+    }
@@ -0,0 +1,67 @@
+import base64
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import cache
+
+
+def encode_cursor(values):
+    """
+    Encodes the position of the last returned row as an opaque, URL-safe cursor.
+
+    Args:
+        values (dict): JSON serializable values identifying the position (sort key, id, ordering).
+
+    Returns:
+        str: The opaque cursor.
+    """
+    raw = json.dumps(values, separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor created by encode_cursor.
+
+    Returns:
+        dict | None: The decoded values, or None for an empty cursor (first page).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor.') from e
+    if not isinstance(values, dict):
+        raise ValueError('Invalid cursor.')
+    return values
+
+
+def get_cached_count(namespace, filters, count_func):
+    """
+    Returns a total count from the cache, computing it with count_func on a miss.
+    Counts are kept for COUNT_CACHE_TIMEOUT seconds per namespace and set of filters.
+    """
+    digest = hashlib.md5(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+    key = f'count:{namespace}:{digest}'
+    total = cache.get(key)
+    if total is None:
+        total = count_func()
+        cache.set(key, total, settings.COUNT_CACHE_TIMEOUT)
+    return total
+
+
+def get_estimated_count(cursor, table_name):
+    """
+    Returns the planner's row estimate for a table (pg_class.reltuples), without scanning it.
+    """
+    cursor.execute(
+        "SELECT GREATEST(reltuples, 0)::BIGINT FROM pg_class WHERE oid = to_regclass(%s);",
+        [table_name]
+    )
+    row = cursor.fetchone()
+    return row[0] if row else 0
@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Lock
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_executor():
+    """
+    Returns the thread pool shared by the process. Each worker thread has its own
+    database connection (Django connections are per thread), reused between tasks.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PARALLEL_QUERIES_MAX_WORKERS,
+                thread_name_prefix='parallel-queries'
+            )
+    return _executor
+
+
+def _run_with_timeout(task, timeout_ms):
+    # Same lifecycle as a request: drop the connection if it is broken or older than CONN_MAX_AGE
+    close_old_connections()
+    start = time.monotonic()
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                # The server cancels the query itself, so a slow query does not keep the worker busy
+                cursor.execute("SET LOCAL statement_timeout = %s;", [int(timeout_ms)])
+                result = task(cursor)
+        return result, time.monotonic() - start
+    finally:
+        close_old_connections()
+
+
+def run_queries_in_parallel(tasks, timeout_ms=None):
+    """
+    Runs independent query functions concurrently, each on its own connection and transaction.
+
+    Args:
+        tasks (dict): name -> function(cursor) returning the result.
+        timeout_ms (int, optional): Per query timeout (PARALLEL_QUERIES_TIMEOUT_MS by default).
+
+    Returns:
+        dict: name -> {'result', 'error', 'elapsed_ms'}; result is None when the query failed
+        or did not finish in time (error says why).
+    """
+    timeout_ms = timeout_ms or settings.PARALLEL_QUERIES_TIMEOUT_MS
+    executor = get_executor()
+    futures = {executor.submit(_run_with_timeout, task, timeout_ms): name for name, task in tasks.items()}
+
+    # A small margin so the statement_timeout error arrives before we give up waiting
+    done, _ = wait(futures, timeout=timeout_ms / 1000 + 0.5)
+
+    outcomes = {}
+    for future, name in futures.items():
+        if future not in done:
+            outcomes[name] = {'result': None, 'error': 'timeout', 'elapsed_ms': None}
+            continue
+        try:
+            result, elapsed = future.result()
+        except Exception as e:
+            outcomes[name] = {'result': None, 'error': str(e), 'elapsed_ms': None}
+        else:
+            outcomes[name] = {'result': result, 'error': None, 'elapsed_ms': round(elapsed * 1000, 1)}
+    return outcomes
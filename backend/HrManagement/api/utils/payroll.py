@@ -0,0 +1,213 @@
+import calendar
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from django.conf import settings
+from django.db import connection, transaction
+from api.utils.mongo_client import get_mongo_db
+
+# Contract states (contract_state.state) whose employees are paid by a payroll run
+DEFAULT_CONTRACT_STATES = ('Active', 'Renewed')
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 24 * SECONDS_PER_HOUR
+HOURS_PRECISION = Decimal('0.0001')
+CENTS = Decimal('0.01')
+
+PAYROLL_RUN_COLUMNS = (
+    'id_payroll_run', 'month', 'payment_date', 'id_payment_method', 'id_employee_supervisor',
+    'payments_created', 'bonuses_linked', 'deductions_linked', 'total_amount', 'duration_ms',
+    'started_at', 'finished_at',
+)
+
+
+def parse_month(value):
+    """
+    Converts YYYY-MM (or a date) into the first day of the month.
+
+    Raises:
+        ValueError: If the value is not a valid month.
+    """
+    if isinstance(value, date):
+        return value.replace(day=1)
+    return datetime.strptime(value, '%Y-%m').date()
+
+
+def month_bounds(month):
+    """
+    First and last day of the month.
+    """
+    return month, month.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+
+def check_payment_date(month, payment_date):
+    """
+    Checks that payment_date (if given) falls inside the month being paid.
+
+    Raises:
+        ValueError: If payment_date is outside the month.
+    """
+    first_day, last_day = month_bounds(parse_month(month))
+    if payment_date is not None and not first_day <= payment_date <= last_day:
+        raise ValueError(f"payment_date must be between {first_day.isoformat()} and {last_day.isoformat()}.")
+
+
+def _time_seconds(field):
+    """
+    Aggregation expression: seconds since midnight of an HH:mm:ss string field (the last three parts).
+    """
+    parts = {'$split': [field, ':']}
+    return {'$add': [
+        {'$multiply': [{'$toInt': {'$arrayElemAt': [parts, -3]}}, SECONDS_PER_HOUR]},
+        {'$multiply': [{'$toInt': {'$arrayElemAt': [parts, -2]}}, 60]},
+        {'$toInt': {'$arrayElemAt': [parts, -1]}},
+    ]}
+
+
+def extra_hours_pipeline(month):
+    """
+    Aggregation over 'extrahours' with one document per employee with extra hours in the month:
+    {'_id': id_employee, 'days': ..., 'seconds': ...}. The durations are computed by MongoDB;
+    a session ending before it starts is taken as crossing midnight.
+    """
+    first_day, last_day = month_bounds(month)
+    return [
+        # Uses the 'date' index
+        {'$match': {'date': {'$gte': first_day.isoformat(), '$lte': last_day.isoformat()}}},
+        {'$project': {
+            '_id': 0,
+            'id_employee': 1,
+            'seconds': {'$subtract': [_time_seconds('$end'), _time_seconds('$start')]},
+        }},
+        {'$group': {
+            '_id': '$id_employee',
+            'days': {'$sum': 1},
+            'seconds': {'$sum': {
+                '$cond': [{'$lt': ['$seconds', 0]}, {'$add': ['$seconds', SECONDS_PER_DAY]}, '$seconds']
+            }},
+        }},
+    ]
+
+
+def get_extra_hour_rates(cursor):
+    """
+    extra_hour_rate of every employee, in one query: the latest salary of the latest contract,
+    for contract types that allow overtime (contract_type.overtime_eligible not false).
+
+    Returns:
+        dict: id_employee (lowercase str) -> Decimal rate.
+    """
+    cursor.execute(
+        """
+        SELECT lc.id_employee::text, ls.extra_hour_rate
+        FROM latest_contract_materialized_view lc
+        INNER JOIN latest_salary_materialized_view ls ON ls.id_contract = lc.id_contract
+        LEFT JOIN contract_type ct ON ct.id_contract_type = lc.id_contract_type
+        WHERE ls.extra_hour_rate IS NOT NULL
+          AND ct.overtime_eligible IS NOT FALSE;
+        """
+    )
+    return dict(cursor.fetchall())
+
+
+def iter_extra_hours_pay(month, batch_size=None):
+    """
+    Overtime pay of each employee in the month, ready for payroll.
+
+    The extrahours documents are reduced per employee by MongoDB (extra_hours_pipeline) and read
+    batch_size at a time; the rates come from one query (get_extra_hour_rates). Only the rates and
+    the current batch are held in memory, whatever the number of documents in the month.
+
+    Yields:
+        dict: id_employee, days, hours, extra_hour_rate (None if not eligible or without a rate) and extra_amount.
+    """
+    month = parse_month(month)
+    with connection.cursor() as cursor:
+        rates = get_extra_hour_rates(cursor)
+
+    results = get_mongo_db()['extrahours'].aggregate(
+        extra_hours_pipeline(month),
+        allowDiskUse=True,
+        batchSize=batch_size or settings.STREAM_CHUNK_SIZE
+    )
+    for result in results:
+        rate = rates.get(str(result['_id']).lower())
+        hours = Decimal(result['seconds']) / SECONDS_PER_HOUR
+        yield {
+            'id_employee': result['_id'],
+            'days': result['days'],
+            'hours': hours.quantize(HOURS_PRECISION, ROUND_HALF_UP),
+            'extra_hour_rate': rate,
+            'extra_amount': (hours * rate).quantize(CENTS, ROUND_HALF_UP) if rate is not None else Decimal('0.00'),
+        }
+
+
+def run_payroll(month, id_payment_method, id_employee_supervisor, payment_date=None, contract_states=None):
+    """
+    Pays a whole month with run_payroll() (functions/run_payroll.sql): one set-based pass creates
+    the payments of every employee with an active contract not yet paid in the month and links
+    the month's bonuses and deductions to them. Overtime is paid from iter_extra_hours_pay.
+
+    Args:
+        month (date | str): Any day of the month, or YYYY-MM.
+        id_payment_method: Payment method of the payments.
+        id_employee_supervisor: Employee recorded as the supervisor of the payments.
+        payment_date (date, optional): Date of the payments, inside the month (default: last day of the month).
+        contract_states (list, optional): Contract states paid (default: DEFAULT_CONTRACT_STATES).
+
+    Returns:
+        dict: The payroll_runs row plus extra_hours_employees (paid overtime), extra_hours_ms (overtime
+        pipeline) and elapsed_ms (whole run).
+
+    Raises:
+        ValueError: If payment_date is outside the month.
+    """
+    start = time.perf_counter()
+    month = parse_month(month)
+    check_payment_date(month, payment_date)
+
+    # Only the employees with something to pay: the rest get extra_amount 0 in SQL
+    extra_amounts = [
+        {'id_employee': pay['id_employee'], 'extra_amount': str(pay['extra_amount'])}
+        for pay in iter_extra_hours_pay(month)
+        if pay['extra_amount']
+    ]
+    extra_hours_ms = (time.perf_counter() - start) * 1000
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT {', '.join(PAYROLL_RUN_COLUMNS)}
+            FROM run_payroll(%s::date, %s::uuid, %s::uuid, %s::jsonb, %s::date, %s::text[]);
+            """,
+            [
+                month, id_payment_method, id_employee_supervisor,
+                json.dumps(extra_amounts),
+                payment_date, list(contract_states or DEFAULT_CONTRACT_STATES),
+            ]
+        )
+        run = dict(zip(PAYROLL_RUN_COLUMNS, cursor.fetchone()))
+
+    run['extra_hours_employees'] = len(extra_amounts)
+    run['extra_hours_ms'] = round(extra_hours_ms, 3)
+    run['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return run
+
+
+def get_payroll_runs(month=None):
+    """
+    Payroll runs, most recent first (optionally only those of a month).
+    """
+    condition = "AND month = %s" if month else ""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT {', '.join(PAYROLL_RUN_COLUMNS)}
+            FROM payroll_runs
+            WHERE deleted_at IS NULL {condition}
+            ORDER BY started_at DESC;
+            """,
+            [parse_month(month)] if month else []
+        )
+        return [dict(zip(PAYROLL_RUN_COLUMNS, row)) for row in cursor.fetchall()]
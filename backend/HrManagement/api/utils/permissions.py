@@ -1,12 +1,147 @@
+import base64
+import zlib
 from functools import wraps
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.response import Response
-from rest_framework import status
-from django.contrib.auth.models import Permission
-from api.utils.dotenv import is_debug_mode 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from api.utils.dotenv import is_debug_mode
+
+TOKEN_PERMISSIONS_CLAIM = 'perms'
+TOKEN_PERMISSIONS_VERSION_CLAIM = 'perms_v'
+
+
+def get_permissions_version():
+    """
+    Returns the current permissions version stamp, read from the database.
+
+    The stamp is part of every cached permission set key. The triggers of
+    triggers/permissions_version.sql bump it in the same transaction as any
+    write to the permissions, so every worker sees the new stamp at commit.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT version FROM permissions_version;")
+        row = cursor.fetchone()
+    return str(row[0]) if row else '0'
+
+
+def fetch_permission_codenames(user_id):
+    """
+    Fetches the permission codenames of a user (superuser, own and group permissions) in a single query.
+    Inactive users have no permissions.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT p.codename
+            FROM auth_permission p
+            INNER JOIN auth_user u ON u.id = %s AND u.is_active
+            WHERE u.is_superuser
+               OR EXISTS (
+                    SELECT 1
+                    FROM auth_user_user_permissions uup
+                    WHERE uup.user_id = u.id AND uup.permission_id = p.id
+               )
+               OR EXISTS (
+                    SELECT 1
+                    FROM auth_group_permissions agp
+                    INNER JOIN auth_user_groups aug ON aug.group_id = agp.group_id
+                    WHERE aug.user_id = u.id AND agp.permission_id = p.id
+               );
+            """,
+            [user_id]
+        )
+        return frozenset(row[0] for row in cursor.fetchall())
+
+
+def get_cached_permission_codenames(user_id, version=None):
+    """
+    Returns the permission codenames of a user from the cache, keyed by user and permissions version.
+    """
+    if user_id is None:
+        return frozenset()
+
+    version = version or get_permissions_version()
+    key = f'permissions:{user_id}:{version}'
+    codenames = cache.get(key)
+    if codenames is None:
+        codenames = fetch_permission_codenames(user_id)
+        cache.set(key, codenames, settings.PERMISSIONS_CACHE_TIMEOUT)
+    return codenames
+
+
+def encode_permission_codenames(codenames):
+    """
+    Compact, URL-safe encoding of a set of codenames to be embedded in a JWT.
+    """
+    raw = ' '.join(sorted(codenames)).encode()
+    return base64.urlsafe_b64encode(zlib.compress(raw, 9)).decode().rstrip('=')
+
+
+def decode_permission_codenames(encoded):
+    padded = encoded + '=' * (-len(encoded) % 4)
+    raw = zlib.decompress(base64.urlsafe_b64decode(padded)).decode()
+    return frozenset(raw.split())
+
 
-def check_permission(user, permission_codename):
+def get_token_permission_codenames(token, version):
+    """
+    Returns the codenames embedded in the token, or None when the token has none
+    or was issued for another permissions version (the caller must then fall back to the database).
+    """
+    if token is None or not hasattr(token, 'get'):
+        return None
+
+    encoded = token.get(TOKEN_PERMISSIONS_CLAIM)
+    if encoded is None or token.get(TOKEN_PERMISSIONS_VERSION_CLAIM) != version:
+        return None
+
+    try:
+        return decode_permission_codenames(encoded)
+    except (ValueError, zlib.error):
+        return None
+
+
+def get_permission_codenames(user, token=None):
+    """
+    Returns the set of permission codenames (without app label) of the user.
+
+    The codenames embedded in the token are used when their version stamp is current;
+    otherwise they come from the shared cache or the database. The result is memoized
+    on the user object for the rest of the request.
+
+    Args:
+        user (User): The user object to resolve permissions for.
+        token (Token, optional): The validated JWT of the request.
+
+    Returns:
+        frozenset: The permission codenames of the user.
+    """
+    codenames = getattr(user, '_permission_codenames', None)
+    if codenames is not None:
+        return codenames
+
+    version = get_permissions_version()
+    codenames = get_token_permission_codenames(token, version)
+    if codenames is None:
+        codenames = get_cached_permission_codenames(user.pk, version)
+
+    user._permission_codenames = codenames
+    return codenames
+
+
+def add_permissions_to_token(token, user_id):
+    """
+    Embeds the user's permission codenames and the current permissions version in the token.
+    """
+    version = get_permissions_version()
+    token[TOKEN_PERMISSIONS_CLAIM] = encode_permission_codenames(get_cached_permission_codenames(user_id, version))
+    token[TOKEN_PERMISSIONS_VERSION_CLAIM] = version
+    return token
+
+
+def check_permission(user, permission_codename, token=None):
     if not is_debug_mode():
         """
         Checks if the user has a specific permission by codename.
@@ -15,19 +150,13 @@ def check_permission(user, permission_codename):
         Args:
             user (User): The user object to check permissions for.
             permission_codename (str): The codename of the permission to check (ignores app label).
+            token (Token, optional): The validated JWT of the request, used when it embeds the permissions.
 
         Returns:
             Response | None: Returns a 403 Response if the user lacks the permission; otherwise, None.
         """
-        # Refresh user to ensure permissions are up-to-date
-        user.refresh_from_db()
-
-        # Fetch all permissions directly
-        permissions = user.get_all_permissions()
+        has_permission = permission_codename in get_permission_codenames(user, token)
 
-        # Check if the user has the specific permission
-        has_permission = f"{permission_codename}" in [perm.split('.')[-1] for perm in permissions]
-        
         if not has_permission:
             return Response(
                 {"error": f"Você não tem a permissão necessária: '{permission_codename}'."},
@@ -39,11 +168,11 @@ def check_permission(user, permission_codename):
 
 
 def check_permission_decorator(permission_codename):
-    
+
     def decorator(view_func):
         @wraps(view_func)
         def _wrapped_view(self, request, *args, **kwargs):
-            response = check_permission(request.user, permission_codename)
+            response = check_permission(request.user, permission_codename, request.auth)
             if response:
                 return response
             else:
@@ -0,0 +1,176 @@
+import re
+import threading
+import weakref
+from django.conf import settings
+from django.db import DatabaseError
+
+STATEMENT_PREFIX = 'hr_'
+_PLACEHOLDER = re.compile(r'%%|%s')
+
+# SQLSTATEs after which the statement is prepared again and the query retried once
+STATEMENT_MISSING = '26000'      # invalid_sql_statement_name: new connection, DISCARD ALL...
+RESULT_TYPE_CHANGED = '0A000'    # "cached plan must not change result type": function re-created
+
+_STALE = 'stale'
+_READY = 'ready'
+
+_registry = {}
+_registry_lock = threading.Lock()
+# Raw DB-API connection -> {statement name: _READY | _STALE}; entries go away with the connection
+_connections = weakref.WeakKeyDictionary()
+_connections_lock = threading.Lock()
+
+
+def _sqlstate(error):
+    cause = error.__cause__ or error
+    return getattr(cause, 'pgcode', None) or getattr(cause, 'sqlstate', None)
+
+
+def _connection_statements(raw_connection):
+    with _connections_lock:
+        return _connections.setdefault(raw_connection, {})
+
+
+def prepared_statements_enabled():
+    return settings.PREPARED_STATEMENTS
+
+
+class PreparedQuery:
+    """
+    A hot query executed as a server-side prepared statement: PREPARE runs once per connection and
+    every later call only sends EXECUTE with the parameters, so PostgreSQL skips parsing and, once
+    it settles on a generic plan, planning.
+
+    The SQL uses %s placeholders like cursor.execute(); param_types gives the type of each one.
+    """
+
+    COUNTERS = ('executions', 'hits', 'prepares', 'reprepares', 'unprepared')
+
+    def __init__(self, name, param_types, sql):
+        sql = sql.strip().rstrip(';')
+        param_types = list(param_types)
+        placeholders = sum(1 for match in _PLACEHOLDER.finditer(sql) if match.group() == '%s')
+        if placeholders != len(param_types):
+            raise ValueError(
+                f"Query '{name}' has {placeholders} placeholders but {len(param_types)} parameter types."
+            )
+
+        self.name = name
+        self.statement = STATEMENT_PREFIX + name
+        self.param_types = param_types
+
+        positions = iter(range(1, len(param_types) + 1))
+        body = _PLACEHOLDER.sub(lambda match: '%' if match.group() == '%%' else f'${next(positions)}', sql)
+        types = f" ({', '.join(param_types)})" if param_types else ''
+        self.prepare_sql = f"PREPARE {self.statement}{types} AS {body}"
+        self.execute_sql = (
+            f"EXECUTE {self.statement}({', '.join(['%s'] * len(param_types))})" if param_types
+            else f"EXECUTE {self.statement}"
+        )
+
+        # Used when prepared statements are disabled: same query, same parameter types
+        types = iter(param_types)
+        self.unprepared_sql = _PLACEHOLDER.sub(
+            lambda match: match.group() if match.group() == '%%' else f'%s::{next(types)}', sql
+        )
+
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def _increment(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counters)
+
+    def _prepare(self, cursor, statements):
+        if statements.get(self.statement) == _STALE:
+            cursor.execute(f"DEALLOCATE {self.statement}")
+        cursor.execute(self.prepare_sql)
+        statements[self.statement] = _READY
+        self._increment('prepares')
+
+    def execute(self, cursor, params=()):
+        """
+        Executes the query on a Django cursor; the rows are read from the cursor as usual.
+        """
+        params = list(params)
+        if not prepared_statements_enabled():
+            cursor.execute(self.unprepared_sql, params)
+            self._increment('unprepared')
+            return cursor
+
+        statements = _connection_statements(cursor.db.connection)
+        if statements.get(self.statement) == _READY:
+            self._increment('hits')
+        else:
+            self._prepare(cursor, statements)
+
+        try:
+            cursor.execute(self.execute_sql, params)
+        except DatabaseError as e:
+            sqlstate = _sqlstate(e)
+            if sqlstate == STATEMENT_MISSING:
+                statements.pop(self.statement, None)
+            elif sqlstate == RESULT_TYPE_CHANGED:
+                statements[self.statement] = _STALE
+            else:
+                raise
+            # Inside a transaction the error already aborted it: the next call prepares again
+            if cursor.db.in_atomic_block:
+                raise
+            self._increment('reprepares')
+            self._prepare(cursor, statements)
+            cursor.execute(self.execute_sql, params)
+
+        self._increment('executions')
+        return cursor
+
+
+def register_query(name, param_types, sql):
+    """
+    Declares a named hot query (once, at import time) and returns its PreparedQuery.
+
+    Raises:
+        ValueError: If the name is already registered or the placeholders do not match param_types.
+    """
+    query = PreparedQuery(name, param_types, sql)
+    with _registry_lock:
+        if name in _registry:
+            raise ValueError(f"Query '{name}' is already registered.")
+        _registry[name] = query
+    return query
+
+
+def get_prepared_statement_stats(cursor):
+    """
+    Counters of each registered query in this process and the plan cache of the current connection
+    (pg_prepared_statements; generic_plans and custom_plans need PostgreSQL 14+).
+    """
+    with _registry_lock:
+        queries = {name: query.snapshot() for name, query in _registry.items()}
+
+    cursor.execute(
+        """
+        SELECT name, prepare_time, to_jsonb(p)->'generic_plans', to_jsonb(p)->'custom_plans'
+        FROM pg_prepared_statements p
+        WHERE name LIKE %s;
+        """,
+        [STATEMENT_PREFIX.replace('_', r'\_') + '%']
+    )
+    connection_statements = {
+        name[len(STATEMENT_PREFIX):]: {
+            'prepared_at': prepare_time,
+            'generic_plans': generic_plans,
+            'custom_plans': custom_plans,
+        }
+        for name, prepare_time, generic_plans, custom_plans in cursor.fetchall()
+    }
+
+    return {
+        'enabled': prepared_statements_enabled(),
+        'queries': queries,
+        'connection': connection_statements,
+    }
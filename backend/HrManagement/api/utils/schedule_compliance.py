@@ -0,0 +1,377 @@
+import array
+import time
+from datetime import date, datetime
+from django.conf import settings
+from django.db import connection, transaction
+from api.utils.bulk import copy_rows
+from api.utils.mongo_client import get_mongo_db
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+MINUTES_PER_DAY = 24 * 60
+MS_PER_DAY = 24 * 60 * 60 * 1000
+NO_TIME = -1  # no shift on that weekday / session without checkout
+
+# Metrics of each employee and, summed, of each department (columns of schedule_compliance*)
+METRICS = (
+    'scheduled_days',       # days with a shift in workSchedule (vacations and future days excluded)
+    'worked_days',          # scheduled days with at least one session
+    'absent_days',          # scheduled days without sessions
+    'late_days',            # worked days with the first checkin more than the grace period after the shift start
+    'late_minutes',
+    'early_leave_days',     # worked days with the last checkout more than the grace period before the shift end
+    'early_leave_minutes',
+    'undertime_minutes',    # scheduled minutes not worked on worked days
+    'missing_punches',      # sessions without checkout (any day)
+    'scheduled_minutes',
+    'worked_minutes',       # closed sessions (any day)
+)
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError('Schedule compliance requires numpy (pip install numpy).') from e
+    return np
+
+
+def _clock_minutes(value):
+    hours, minutes = value.split(':')[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def _time_minutes(field):
+    """
+    Aggregation expression: minutes since midnight of an HH:mm:ss string field.
+    """
+    parts = {'$split': [field, ':']}
+    return {'$add': [
+        {'$multiply': [{'$toInt': {'$arrayElemAt': [parts, 0]}}, 60]},
+        {'$toInt': {'$arrayElemAt': [parts, 1]}},
+    ]}
+
+
+def attendance_pipeline(start, end):
+    """
+    Aggregation over 'attendance' with one document per employee and three parallel arrays,
+    one item per session of the period: day (index from start), checkin and checkout
+    (minutes since midnight, NO_TIME when the session is still open).
+    """
+    origin = datetime(start.year, start.month, start.day)
+    return [
+        # Uses the 'date' index
+        {'$match': {'date': {'$gte': start.isoformat(), '$lte': end.isoformat()}}},
+        {'$unwind': '$sessions'},
+        {'$group': {
+            '_id': '$id_employee',
+            'day': {'$push': {'$toInt': {'$divide': [
+                {'$subtract': [{'$dateFromString': {'dateString': '$date'}}, origin]}, MS_PER_DAY
+            ]}}},
+            'checkin': {'$push': _time_minutes('$sessions.checkin')},
+            'checkout': {'$push': {'$cond': [
+                {'$eq': [{'$ifNull': ['$sessions.checkout', None]}, None]},
+                NO_TIME,
+                _time_minutes('$sessions.checkout'),
+            ]}},
+        }},
+    ]
+
+
+def load_employees(cursor):
+    """
+    Department of every employee (from the latest contract), in one query.
+
+    Returns:
+        dict: id_employee (lowercase str) -> (id_department, department_name), both None without a contract.
+    """
+    cursor.execute(
+        """
+        SELECT e.id_employee::text, d.id_department, d.name
+        FROM employees e
+        LEFT JOIN latest_contract_materialized_view lc ON lc.id_employee = e.id_employee
+        LEFT JOIN roles r ON r.id_role = lc.id_role
+        LEFT JOIN departments d ON d.id_department = r.id_department
+        WHERE e.deleted_at IS NULL;
+        """
+    )
+    return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+
+def load_schedules(np, known_employees):
+    """
+    Weekly schedules as (employees, 7) arrays of shift start and end minutes (NO_TIME without a shift).
+    A shift ending at or before its start ends the next day. Schedules of unknown employees, and
+    any schedule after the first of an employee, are skipped.
+
+    Returns:
+        tuple: (list of id_employee, start array, end array).
+    """
+    employees, starts, ends = [], array.array('h'), array.array('h')
+    seen = set()
+    documents = get_mongo_db()['schedule'].find(
+        {}, {'_id': 0, 'id_employee': 1, 'workSchedule': 1}
+    ).batch_size(settings.STREAM_CHUNK_SIZE)
+
+    for document in documents:
+        id_employee = str(document['id_employee']).lower()
+        if id_employee not in known_employees or id_employee in seen:
+            continue
+        seen.add(id_employee)
+        employees.append(id_employee)
+        week = document.get('workSchedule') or {}
+        for day in WEEKDAYS:
+            shift = week.get(day)
+            if not shift:
+                starts.append(NO_TIME)
+                ends.append(NO_TIME)
+                continue
+            shift_start, shift_end = _clock_minutes(shift['start']), _clock_minutes(shift['end'])
+            starts.append(shift_start)
+            ends.append(shift_end if shift_end > shift_start else shift_end + MINUTES_PER_DAY)
+
+    shape = (len(employees), len(WEEKDAYS))
+    return employees, np.array(starts, dtype=np.int16).reshape(shape), np.array(ends, dtype=np.int16).reshape(shape)
+
+
+def load_sessions(np, employee_index, start, end):
+    """
+    Attendance sessions of the period as columnar arrays: employee (row of the schedule arrays),
+    day, checkin and checkout. Sessions of employees without a schedule are skipped.
+    """
+    employees, days, checkins, checkouts = array.array('i'), array.array('i'), array.array('h'), array.array('h')
+    results = get_mongo_db()['attendance'].aggregate(
+        attendance_pipeline(start, end), allowDiskUse=True, batchSize=settings.STREAM_CHUNK_SIZE
+    )
+    for result in results:
+        index = employee_index.get(str(result['_id']).lower())
+        if index is None:
+            continue
+        employees.extend(array.array('i', [index]) * len(result['day']))
+        days.extend(result['day'])
+        checkins.extend(result['checkin'])
+        checkouts.extend(result['checkout'])
+
+    return (
+        np.array(employees, dtype=np.int64), np.array(days, dtype=np.int64),
+        np.array(checkins, dtype=np.int16), np.array(checkouts, dtype=np.int16),
+    )
+
+
+def load_excused_days(np, cursor, employee_index, start, end):
+    """
+    (employees, days) mask of the vacation days in the period.
+    """
+    excused = np.zeros((len(employee_index), (end - start).days + 1), dtype=bool)
+    cursor.execute(
+        """
+        SELECT id_employee::text, GREATEST(start_date, %s) - %s::date, LEAST(end_date, %s) - %s::date
+        FROM vacations
+        WHERE deleted_at IS NULL AND start_date <= %s AND end_date >= %s;
+        """,
+        [start, start, end, start, end, start]
+    )
+    for id_employee, first_day, last_day in cursor.fetchall():
+        index = employee_index.get(id_employee)
+        if index is not None:
+            excused[index, first_day:last_day + 1] = True
+    return excused
+
+
+def compute_compliance(np, shift_starts, shift_ends, session_employee, session_day, checkin, checkout,
+                       weekdays, excused, grace_minutes):
+    """
+    Compliance metrics of each employee, without Python loops over employees, days or sessions.
+
+    Sessions are reduced per (employee, day) cell (sort + reduceat), scattered into
+    (employees, days) grids and compared with the shift of each cell.
+
+    Args:
+        shift_starts / shift_ends: (employees, 7) shift minutes by weekday, NO_TIME without a shift.
+        session_*: one item per session; day is the index in the period.
+        weekdays (array): Weekday (0 = monday) of each day of the period.
+        excused (array): (employees, days) mask of days not evaluated (vacations, future days).
+        grace_minutes (int): Lateness / early leave tolerated.
+
+    Returns:
+        array: (employees, len(METRICS)) int64 matrix.
+    """
+    employees, days = excused.shape
+    cells = employees * days
+
+    starts = shift_starts[:, weekdays].astype(np.int32)
+    ends = shift_ends[:, weekdays].astype(np.int32)
+    scheduled = (starts != NO_TIME) & ~excused
+
+    first_in = np.full(cells, NO_TIME, dtype=np.int32)
+    last_out = np.full(cells, NO_TIME, dtype=np.int32)
+    worked = np.zeros(cells, dtype=np.int32)
+    missing = np.zeros(cells, dtype=np.int32)
+    present = np.zeros(cells, dtype=bool)
+
+    inside = (session_day >= 0) & (session_day < days)
+    if inside.any():
+        key = session_employee[inside] * days + session_day[inside]
+        checkin = checkin[inside].astype(np.int32)
+        checkout = checkout[inside].astype(np.int32)
+
+        closed = checkout != NO_TIME
+        # A checkout before the checkin is on the next day
+        checkout = np.where(closed & (checkout < checkin), checkout + MINUTES_PER_DAY, checkout)
+        duration = np.where(closed, checkout - checkin, 0)
+
+        order = np.argsort(key, kind='stable')
+        key, checkin, checkout, closed, duration = key[order], checkin[order], checkout[order], closed[order], duration[order]
+        boundaries = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        cell = key[boundaries]
+
+        first_in[cell] = np.minimum.reduceat(checkin, boundaries)
+        # NO_TIME is below every time: the last checkout ignores open sessions
+        last_out[cell] = np.maximum.reduceat(checkout, boundaries)
+        worked[cell] = np.add.reduceat(duration, boundaries)
+        missing[cell] = np.add.reduceat((~closed).astype(np.int32), boundaries)
+        present[cell] = True
+
+    first_in, last_out, worked, missing, present = (
+        grid.reshape(employees, days) for grid in (first_in, last_out, worked, missing, present)
+    )
+
+    worked_day = scheduled & present
+    absent_day = scheduled & ~present
+
+    late = np.where(worked_day, np.maximum(first_in - starts, 0), 0)
+    late = np.where(late > grace_minutes, late, 0)
+    early = np.where(worked_day & (last_out != NO_TIME), np.maximum(ends - last_out, 0), 0)
+    early = np.where(early > grace_minutes, early, 0)
+    shift_minutes = np.where(scheduled, ends - starts, 0)
+    undertime = np.where(worked_day, np.maximum(shift_minutes - worked, 0), 0)
+
+    columns = {
+        'scheduled_days': scheduled,
+        'worked_days': worked_day,
+        'absent_days': absent_day,
+        'late_days': late > 0,
+        'late_minutes': late,
+        'early_leave_days': early > 0,
+        'early_leave_minutes': early,
+        'undertime_minutes': undertime,
+        'missing_punches': missing,
+        'scheduled_minutes': shift_minutes,
+        'worked_minutes': worked,
+    }
+    return np.stack([columns[metric].sum(axis=1, dtype=np.int64) for metric in METRICS], axis=1)
+
+
+def aggregate_departments(np, metrics, employee_departments):
+    """
+    Sums the employee metrics per department (np.bincount, one pass per metric).
+
+    Returns:
+        tuple: (list of departments (id_department, department_name), employee counts, (departments, len(METRICS)) matrix).
+    """
+    departments = sorted(set(employee_departments), key=lambda department: (department[1] is None, department[1] or ''))
+    department_index = {department: index for index, department in enumerate(departments)}
+    indexes = np.fromiter(
+        (department_index[department] for department in employee_departments),
+        dtype=np.int64, count=len(employee_departments)
+    )
+
+    counts = np.bincount(indexes, minlength=len(departments))
+    totals = np.stack([
+        np.bincount(indexes, weights=metrics[:, column], minlength=len(departments)).astype(np.int64)
+        for column in range(len(METRICS))
+    ], axis=1) if len(departments) else np.zeros((0, len(METRICS)), dtype=np.int64)
+    return departments, counts, totals
+
+
+def save_compliance(cursor, start, end, employees, employee_departments, metrics, departments, counts, totals):
+    """
+    Replaces the stored results of the period (one COPY per table).
+    """
+    cursor.execute("DELETE FROM schedule_compliance WHERE period_start = %s AND period_end = %s;", [start, end])
+    cursor.execute("DELETE FROM schedule_compliance_department WHERE period_start = %s AND period_end = %s;", [start, end])
+
+    copy_rows(
+        cursor, 'schedule_compliance',
+        ['period_start', 'period_end', 'id_employee', 'id_department', *METRICS],
+        [
+            (start, end, id_employee, department[0], *values)
+            for id_employee, department, values in zip(employees, employee_departments, metrics.tolist())
+        ]
+    )
+    copy_rows(
+        cursor, 'schedule_compliance_department',
+        ['period_start', 'period_end', 'id_department', 'department_name', 'employees', *METRICS],
+        [
+            (start, end, department[0], department[1], count, *values)
+            for department, count, values in zip(departments, counts.tolist(), totals.tolist())
+        ]
+    )
+
+
+def run_schedule_compliance(start, end, grace_minutes=None):
+    """
+    Computes and stores schedule compliance (attendance vs. workSchedule) for a period.
+
+    Schedules and sessions are loaded into columnar NumPy arrays (minutes since midnight), the
+    metrics computed with array operations (compute_compliance) and the results written to
+    schedule_compliance and schedule_compliance_department, read by /api/analytics/schedule_compliance/.
+    Days after today are not evaluated.
+
+    Raises:
+        ImportError: If numpy is not installed.
+        ValueError: If end is before start.
+
+    Returns:
+        dict: Period, row counts and the time of each phase (ms).
+    """
+    np = _numpy()
+    if end < start:
+        raise ValueError('The end of the period is before its start.')
+    grace_minutes = settings.SCHEDULE_COMPLIANCE_GRACE_MINUTES if grace_minutes is None else grace_minutes
+    timings = {}
+
+    phase = time.perf_counter()
+    with connection.cursor() as cursor:
+        known_employees = load_employees(cursor)
+        employees, shift_starts, shift_ends = load_schedules(np, known_employees)
+        employee_index = {id_employee: index for index, id_employee in enumerate(employees)}
+        session_employee, session_day, checkin, checkout = load_sessions(np, employee_index, start, end)
+        excused = load_excused_days(np, cursor, employee_index, start, end)
+    timings['load_ms'] = (time.perf_counter() - phase) * 1000
+
+    phase = time.perf_counter()
+    days = (end - start).days + 1
+    weekdays = (start.weekday() + np.arange(days)) % len(WEEKDAYS)
+    evaluated_days = max(0, min(days, (date.today() - start).days + 1))
+    excused[:, evaluated_days:] = True
+
+    metrics = compute_compliance(
+        np, shift_starts, shift_ends, session_employee, session_day, checkin, checkout,
+        weekdays, excused, grace_minutes
+    )
+    employee_departments = [known_employees[id_employee] for id_employee in employees]
+    departments, counts, totals = aggregate_departments(np, metrics, employee_departments)
+    timings['compute_ms'] = (time.perf_counter() - phase) * 1000
+
+    phase = time.perf_counter()
+    with transaction.atomic(), connection.cursor() as cursor:
+        save_compliance(cursor, start, end, employees, employee_departments, metrics, departments, counts, totals)
+    timings['save_ms'] = (time.perf_counter() - phase) * 1000
+
+    return {
+        'period_start': start,
+        'period_end': end,
+        'employees': len(employees),
+        'departments': len(departments),
+        'sessions': len(session_day),
+        **{name: round(value, 3) for name, value in timings.items()},
+    }
+
+
+def default_period(today=None):
+    """
+    The current month up to today.
+    """
+    today = today or date.today()
+    return today.replace(day=1), today
+
@@ -0,0 +1,161 @@
+import importlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from django.db import connections
+
+SEEDERS_PACKAGE = 'api.management.commands.seeders'
+
+
+def seeder_number(seeder_name):
+    return int(re.match(r'(\d+)_', seeder_name).group(1))
+
+
+def list_seeders(seeders_directory):
+    """
+    Returns the seeder names (file names without .py) sorted by their numeric prefix.
+    """
+    return sorted(
+        [f[:-3] for f in os.listdir(seeders_directory) if f.endswith('.py') and not f.startswith('__')],
+        key=seeder_number
+    )
+
+
+def load_seeder(seeder_name):
+    return importlib.import_module(f'{SEEDERS_PACKAGE}.{seeder_name}')
+
+
+def build_dependency_graph(seeder_names):
+    """
+    Builds the seeding DAG from the TABLES / DEPENDS_ON declared by each seeder.
+
+    A seeder depends on every lower-numbered seeder that writes a table it reads or writes,
+    so the numeric order stays a valid order and running the graph never reorders two seeders
+    that touch the same table. A seeder without declarations depends on all lower-numbered
+    seeders (and all higher-numbered seeders depend on it).
+
+    Returns:
+        dict: seeder name -> set of seeder names it depends on.
+    """
+    declarations = {}
+    for name in seeder_names:
+        module = load_seeder(name)
+        if hasattr(module, 'TABLES') and hasattr(module, 'DEPENDS_ON'):
+            declarations[name] = (set(module.TABLES), set(module.DEPENDS_ON))
+        else:
+            declarations[name] = None
+
+    graph = {}
+    for name in seeder_names:
+        dependencies = set()
+        for other in seeder_names:
+            if seeder_number(other) >= seeder_number(name):
+                continue
+            if declarations[name] is None or declarations[other] is None:
+                dependencies.add(other)
+                continue
+            tables, reads = declarations[name]
+            other_tables, _ = declarations[other]
+            if other_tables & (tables | reads):
+                dependencies.add(other)
+        graph[name] = dependencies
+    return graph
+
+
+def reverse_graph(graph):
+    """
+    Reverses the edges of the graph (used to delete dependents before their dependencies).
+    """
+    reversed_graph = {name: set() for name in graph}
+    for name, dependencies in graph.items():
+        for dependency in dependencies:
+            reversed_graph[dependency].add(name)
+    return reversed_graph
+
+
+def run_seeder_task(seeder_name, method, args):
+    """
+    Runs a seeder method in a worker process, with its own database connection.
+    """
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    from django.db import connection
+    from api.utils.mongo_client import close_mongo_client
+
+    try:
+        return getattr(load_seeder(seeder_name), method)(*args)
+    finally:
+        connection.close()
+        close_mongo_client()
+
+
+def run_graph(graph, method, args, workers, on_start=None, on_finish=None):
+    """
+    Runs a method (seed, seed_bulk, delete) of every seeder in the graph on a process pool,
+    starting each seeder as soon as all its dependencies finished.
+    Seeders without the method count as finished; dependents of a failed seeder are skipped.
+
+    Args:
+        graph (dict): seeder name -> set of seeder names that must finish first.
+        method (str | callable): Method name, or a function (seeder name, module) -> (method name, args) or None.
+        args (tuple): Arguments for the method when method is a name.
+        workers (int): Maximum number of seeders running at the same time.
+        on_start (callable, optional): Called with the seeder name when it starts.
+        on_finish (callable, optional): Called with (seeder name, result, error) when it finishes or is skipped.
+
+    Returns:
+        tuple: (set of finished seeders, set of failed or skipped seeders).
+    """
+    def resolve(name):
+        module = load_seeder(name)
+        if callable(method):
+            return method(name, module)
+        return (method, args) if hasattr(module, method) else None
+
+    # Forked/spawned workers must open their own connections
+    connections.close_all()
+
+    pending = {name: set(dependencies) for name, dependencies in graph.items()}
+    finished, failed = set(), set()
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for name in sorted(pending, key=seeder_number):
+                dependencies = pending[name]
+                if dependencies & failed:
+                    del pending[name]
+                    failed.add(name)
+                    if on_finish:
+                        on_finish(name, None, 'skipped (a dependency failed)')
+                elif dependencies <= finished:
+                    del pending[name]
+                    task = resolve(name)
+                    if task is None:
+                        finished.add(name)
+                        continue
+                    if on_start:
+                        on_start(name)
+                    running[executor.submit(run_seeder_task, name, *task)] = name
+
+            if not running:
+                # Everything left is waiting on a failed seeder
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed.add(name)
+                    if on_finish:
+                        on_finish(name, None, str(e))
+                else:
+                    finished.add(name)
+                    if on_finish:
+                        on_finish(name, result, None)
+
+    return finished, failed
@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.db import connection
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+STREAM_FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+class NDJSONRenderer(JSONRenderer):
+    """
+    Renders a list as one JSON document per line (any other data as a single line).
+
+    Registered on the streaming viewsets so that content negotiation accepts
+    'Accept: application/x-ndjson' instead of answering 406 before the view runs.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(_encoder.encode(row).encode('utf-8') + b'\n' for row in rows)
+
+
+# Renderers of the viewsets that support streaming: the defaults plus NDJSON
+STREAM_RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+
+def get_stream_format(request):
+    """
+    Returns the requested streaming format ('json' or 'ndjson'), or None for a normal response.
+    Streaming is enabled with ?stream=json|ndjson or with an 'Accept: application/x-ndjson' header
+    (the viewset must use STREAM_RENDERER_CLASSES).
+    """
+    stream = request.query_params.get('stream')
+    if stream in STREAM_FORMATS:
+        return stream
+    renderer = getattr(request, 'accepted_renderer', None)
+    if isinstance(renderer, NDJSONRenderer):
+        return 'ndjson'
+    return None
+
+
+def _encode(rows, stream_format):
+    """
+    Encodes rows one by one, as a JSON array or as one JSON document per line.
+    """
+    if stream_format == 'ndjson':
+        for row in rows:
+            yield _encoder.encode(row) + '\n'
+        return
+
+    yield '['
+    first = True
+    for row in rows:
+        yield _encoder.encode(row) if first else ',' + _encoder.encode(row)
+        first = False
+    yield ']'
+
+
+def _query_rows(query, params, chunk_size):
+    # chunked_cursor() is a PostgreSQL named (server-side) cursor: rows arrive chunk_size at a time
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(query, params)
+        columns = [col[0] for col in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+
+
+def stream_query(query, params, stream_format, chunk_size=None):
+    """
+    Streams the result of a SQL query, keeping at most chunk_size rows in memory.
+
+    Args:
+        query (str): SQL query.
+        params (list): Query parameters.
+        stream_format (str): 'json' or 'ndjson'.
+        chunk_size (int, optional): Rows fetched per round trip (STREAM_CHUNK_SIZE by default).
+
+    Returns:
+        StreamingHttpResponse: The encoded rows.
+    """
+    chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+    return StreamingHttpResponse(
+        _encode(_query_rows(query, params, chunk_size), stream_format),
+        content_type=STREAM_FORMATS[stream_format]
+    )
+
+
+def stream_documents(mongo_cursor, stream_format, chunk_size=None):
+    """
+    Streams the documents of a Mongo cursor, fetched in batches of chunk_size.
+    """
+    chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+    return StreamingHttpResponse(
+        _encode(mongo_cursor.batch_size(chunk_size), stream_format),
+        content_type=STREAM_FORMATS[stream_format]
+    )
+
+
+def stream_rows(rows, stream_format):
+    """
+    Streams rows (dicts) produced by an iterator, e.g. a generator that reads its source in batches.
+    """
+    return StreamingHttpResponse(_encode(rows, stream_format), content_type=STREAM_FORMATS[stream_format])